@@ -1,8 +1,10 @@
 from .article import Article
-from .constr import parse_html, parse_xml
+from .constr import parse_html, parse_xml, parse_many, sniff_article
 
 __all__ = [
     "Article",
     "parse_html",
     "parse_xml",
+    "parse_many",
+    "sniff_article",
 ]
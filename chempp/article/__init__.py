@@ -1,7 +1,14 @@
-from .article import Article, ArticleElement, ArticleElementType, ArticleComponentCheck
-from .paragraph import Sentence, Paragraph
+from .article import Article, ArticleElement, ArticleElementType, ArticleComponentCheck, tokenize_articles
+from .paragraph import Sentence, Paragraph, tokenize_paragraphs
+from .tokenizer import Tokenizer, CachedTokenizer, register_tokenizer, get_tokenizer, set_default_tokenizer
+from .anno_index import AnnotationIndex
+from .flat_tokens import FlatTokens, flatten_sentences
+from .shard import ShardWriter, ShardReader
+from .jsonl_writer import ArticleJsonlWriter
+from .columnar import ArticleColumnarWriter
+from .html_render import highlight_spans, render_article_html, save_html_report
 from .figure import Figure
-from .table import Table, TableCell, TableRow
+from .table import Table, TableCell, TableRow, TableGrid
 
 __all__ = [
     "Article",
@@ -10,8 +17,26 @@ __all__ = [
     "ArticleComponentCheck",
     "Sentence",
     "Paragraph",
+    "AnnotationIndex",
+    "FlatTokens",
+    "flatten_sentences",
+    "ShardWriter",
+    "ShardReader",
+    "ArticleJsonlWriter",
+    "ArticleColumnarWriter",
+    "highlight_spans",
+    "render_article_html",
+    "save_html_report",
     "Figure",
     "Table",
     "TableCell",
     "TableRow",
+    "TableGrid",
+    "tokenize_articles",
+    "tokenize_paragraphs",
+    "Tokenizer",
+    "CachedTokenizer",
+    "register_tokenizer",
+    "get_tokenizer",
+    "set_default_tokenizer",
 ]
@@ -0,0 +1,102 @@
+"""
+# Author: Yinghao Li
+# Modified: June 15th, 2024
+# ---------------------------------------
+# Description: Sorted-array index of annotation spans for range, overlap and label queries
+"""
+
+import bisect
+import itertools
+from array import array
+
+__all__ = ["AnnotationIndex"]
+
+# the max end of the empty leaves of the segment tree
+MIN_OFFSET = -(2**63)
+
+
+class AnnotationIndex:
+    """
+    Read-only index of annotation spans built from a `dict[(start, end)] -> label`.
+
+    Spans are sorted by their start offsets, which are kept in a compact array for binary search,
+    so range queries take O(log n + k) for k spans starting in the range.
+    Overlap queries descend a max-end segment tree over the sorted spans, pruning the subtrees whose spans
+    all end before the range, so they take O((k + 1) log n) for k overlapping spans regardless of the span lengths.
+    Labels are indexed by the positions of their spans in the original dict,
+    so label queries return spans in the original order.
+    """
+
+    __slots__ = ("_spans", "_labels", "_order", "_starts", "_size", "_max_ends", "_label_to_ranks")
+
+    def __init__(self, anno: dict[tuple[int, int], str]):
+        self._spans = list(anno.keys())
+        self._labels = list(anno.values())
+        self._order = array("q", sorted(range(len(self._spans)), key=self._spans.__getitem__))
+        self._starts = array("q", [self._spans[i][0] for i in self._order])
+
+        # segment tree of the maximum end offsets; the leaves `_size + j` hold the end of the j-th sorted span
+        self._size = 1
+        while self._size < len(self._spans):
+            self._size *= 2
+        self._max_ends = array("q", [MIN_OFFSET]) * (2 * self._size)
+        self._max_ends[self._size : self._size + len(self._spans)] = array(
+            "q", [self._spans[i][1] for i in self._order]
+        )
+        for node in range(self._size - 1, 0, -1):
+            self._max_ends[node] = max(self._max_ends[2 * node], self._max_ends[2 * node + 1])
+
+        self._label_to_ranks = dict()
+        for rank, label in enumerate(self._labels):
+            self._label_to_ranks.setdefault(label, array("q")).append(rank)
+
+    def __len__(self):
+        return len(self._spans)
+
+    @property
+    def labels(self):
+        return list(self._label_to_ranks.keys())
+
+    def _candidates(self, lower_start: int, upper_start: int):
+        lo = bisect.bisect_left(self._starts, lower_start)
+        hi = bisect.bisect_left(self._starts, upper_start)
+        return (self._order[j] for j in range(lo, hi))
+
+    def with_label(self, labels: list[str] | str) -> dict[tuple[int, int], str]:
+        """
+        Spans annotated with any of the labels, in the original order
+        """
+        if isinstance(labels, str):
+            labels = [labels]
+        ranks = [self._label_to_ranks[lb] for lb in dict.fromkeys(labels) if lb in self._label_to_ranks]
+        ranks = ranks[0] if len(ranks) == 1 else sorted(itertools.chain(*ranks))
+        return {self._spans[i]: self._labels[i] for i in ranks}
+
+    def in_range(self, start: int, end: int) -> dict[tuple[int, int], str]:
+        """
+        Spans within the character range [start, end), sorted by their positions
+        """
+        return {self._spans[i]: self._labels[i] for i in self._candidates(start, end) if self._spans[i][1] <= end}
+
+    def overlapping(self, start: int, end: int) -> dict[tuple[int, int], str]:
+        """
+        Spans overlapping the character range [start, end), sorted by their positions
+        """
+        # the spans starting before `end` are the leaves before `hi`; find those ending after `start`
+        hi = bisect.bisect_left(self._starts, end)
+        max_ends = self._max_ends
+        overlaps = dict()
+        # (node, first leaf, number of leaves), visited from left to right
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, lo, width = stack.pop()
+            if lo >= hi or max_ends[node] <= start:
+                continue
+            if width == 1:
+                i = self._order[lo]
+                overlaps[self._spans[i]] = self._labels[i]
+                continue
+            half = width // 2
+            stack.append((2 * node + 1, lo + half, half))
+            stack.append((2 * node, lo, half))
+        return overlaps
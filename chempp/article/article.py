@@ -7,23 +7,43 @@
 
 import json
 import pickle
-import functools
-import itertools
 import logging
 from dataclasses import dataclass
-from bs4 import BeautifulSoup, Tag
-
-from seqlbtoolkit.data import sort_tuples_by_element_idx
 
 from .table import Table
 from .figure import Figure
-from .paragraph import Paragraph, Sentence
-
-from chempp.utils import DEFAULT_HTML_STYLE, StrEnum
+from .paragraph import Paragraph, Sentence, tokenize_paragraphs
+from .tokenizer import Tokenizer
+from .flat_tokens import FlatTokens, flatten_sentences
+from .html_render import render_article_html, render_html_page
+from .binary import (
+    ColumnWriter,
+    ColumnReader,
+    encode_blocks,
+    decode_blocks,
+    read_blocks,
+    write_sentences,
+    read_sentences,
+    write_paragraphs,
+    read_paragraphs,
+    write_tables,
+    read_tables,
+)
+
+from chempp.utils import StrEnum, SlotPickleMixin
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["Article", "ArticleElementType", "ArticleElement", "ArticleComponentCheck"]
+__all__ = [
+    "Article",
+    "ArticleElementType",
+    "ArticleElement",
+    "ArticleSections",
+    "ArticleComponentCheck",
+    "tokenize_articles",
+]
+
+BINARY_PARTS = ("title", "abstract", "sections")
 
 
 class ArticleElementType(StrEnum):
@@ -34,8 +54,8 @@ class ArticleElementType(StrEnum):
     FIGURE = "FIGURE"
 
 
-@dataclass
-class ArticleElement:
+@dataclass(slots=True)
+class ArticleElement(SlotPickleMixin):
     type: ArticleElementType
     content: Paragraph | Table | Figure | str
 
@@ -50,6 +70,70 @@ class ArticleElement:
         return f"{self.type}: {self.content}"
 
 
+class ArticleSections(list):
+    """
+    The sections of an article. Changes to the list keep the section ids and the typed views of the article in sync:
+    `append` and `extend` go through `Article.append_element`; the other changes rebuild them.
+    """
+
+    __slots__ = ("_article",)
+
+    def __init__(self, article: "Article", elements=()):
+        super().__init__(elements)
+        self._article = article
+
+    def __reduce__(self):
+        return ArticleSections, (self._article, list(self))
+
+    def append(self, element: ArticleElement):
+        self._article.append_element(element)
+
+    def extend(self, elements):
+        self._article.extend(elements)
+
+    def __iadd__(self, elements):
+        self._article.extend(elements)
+        return self
+
+    def insert(self, index, element: ArticleElement):
+        super().insert(index, element)
+        self._article._sections_changed()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._article._sections_changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._article._sections_changed()
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        self._article._sections_changed()
+        return self
+
+    def pop(self, index=-1):
+        element = super().pop(index)
+        self._article._sections_changed()
+        return element
+
+    def remove(self, element: ArticleElement):
+        super().remove(element)
+        self._article._sections_changed()
+
+    def clear(self):
+        super().clear()
+        self._article._sections_changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._article._sections_changed()
+
+    def reverse(self):
+        super().reverse()
+        self._article._sections_changed()
+
+
 @dataclass
 class ArticleComponentCheck:
     abstract: bool = True
@@ -70,8 +154,12 @@ class Article:
         self._publisher = publisher
         self._title = title
         self._abstract = abstract
-        self._sections = sections if sections else list()
+        self._sections = ArticleSections(self, sections if sections else ())
         self._sec_id_to_sec = dict()
+        self._type_to_contents = dict()
+        # read-only typed views, cached until the sections change
+        self._views = dict()
+        self._text_buffer = None
         self._post_init()
 
     def _post_init(self):
@@ -110,31 +198,46 @@ class Article:
     def sections(self):
         return self._sections
 
+    @property
+    def text_buffer(self) -> str | None:
+        """
+        The text buffer built by `build_text_buffer`; None if not built or if the article has changed since
+        """
+        if self._text_buffer is None:
+            return None
+        if any(
+            not isinstance(piece, str) and piece.text_buffer is not self._text_buffer for piece in self._text_layout()
+        ):
+            return None
+        return self._text_buffer
+
     @property
     def cont_sec_ids(self):
         return list(self._sec_id_to_sec.keys())
 
     @property
-    def paragraphs(self):
-        paras = list()
-        if self.abstract:
-            paras.append(self.abstract)
-        for sec in self.sections:
-            if sec.type == ArticleElementType.PARAGRAPH:
-                paras.append(sec.content)
-        return paras
+    def paragraphs(self) -> tuple[Paragraph, ...]:
+        if "paragraphs" not in self._views:
+            paras = (self.abstract,) if self.abstract else ()
+            self._views["paragraphs"] = paras + self._get_view(ArticleElementType.PARAGRAPH)
+        return self._views["paragraphs"]
 
     @property
-    def tables(self):
-        return [sec.content for sec in self.sections if sec.type == ArticleElementType.TABLE]
+    def tables(self) -> tuple[Table, ...]:
+        return self._get_view(ArticleElementType.TABLE)
 
     @property
-    def figures(self):
-        return [sec.content for sec in self.sections if sec.type == ArticleElementType.FIGURE]
+    def figures(self) -> tuple[Paragraph, ...]:
+        return self._get_view(ArticleElementType.FIGURE)
 
     @property
-    def section_titles(self):
-        return [sec.content for sec in self.sections if sec.type == ArticleElementType.SECTION_TITLE]
+    def section_titles(self) -> tuple[str, ...]:
+        return self._get_view(ArticleElementType.SECTION_TITLE)
+
+    def _get_view(self, element_type: ArticleElementType) -> tuple:
+        if element_type not in self._views:
+            self._views[element_type] = tuple(self._type_to_contents.get(element_type, ()))
+        return self._views[element_type]
 
     @doi.setter
     def doi(self, doi_: str):
@@ -147,7 +250,8 @@ class Article:
     @title.setter
     def title(self, title_: str | Sentence):
         self._title = title_ if isinstance(title_, Sentence) else Sentence(title_)
-        self._set_sec_id_to_sec()
+        self._text_buffer = None
+        self._sec_id_to_sec["title"] = self._title
 
     @abstract.setter
     def abstract(self, abstract_: Paragraph | str | list[str]):
@@ -163,24 +267,78 @@ class Article:
             self._abstract = Paragraph(" ".join(paras))
         else:
             self._abstract = abstract_
-        self._set_sec_id_to_sec()
-        self.get_sentences_and_tokens.cache_clear()
+        self._text_buffer = None
+        self._views.pop("paragraphs", None)
+        self._sec_id_to_sec["abs"] = self._abstract
 
     @sections.setter
-    def sections(self, sections_: ArticleElement):
-        self._sections = sections_
-        self._clear_empty_sections()
+    def sections(self, sections_: list[ArticleElement]):
+        self._sections = ArticleSections(self)
+        self._text_buffer = None
         self._set_sec_id_to_sec()
-        self.get_sentences_and_tokens.cache_clear()
+        self.extend(sections_)
 
-    def _clear_empty_sections(self):
-        new_sections = list()
-        for section in self.sections:
-            if section.type != ArticleElementType.PARAGRAPH:
-                new_sections.append(section)
-            elif section.content.text:
-                new_sections.append(section)
-        self._sections = new_sections
+    def append_element(self, element: ArticleElement | ArticleElementType, content=None):
+        """
+        Append an element to the sections, updating the section ids and the typed views in O(1).
+        Empty paragraphs are skipped, as in assigning to `sections`.
+
+        Parameters
+        ----------
+        element: the `ArticleElement` to append, or the type of the element if `content` is given
+        content: the content of the element
+
+        Returns
+        -------
+        self
+        """
+        if content is not None:
+            element = ArticleElement(type=element, content=content)
+        if element.type == ArticleElementType.PARAGRAPH and element.content.is_empty:
+            return self
+
+        if element.type == ArticleElementType.PARAGRAPH:
+            self._sec_id_to_sec[f"sec_{len(self._sections)}"] = element.content
+        self._type_to_contents.setdefault(element.type, list()).append(element.content)
+        list.append(self._sections, element)
+
+        self._views.pop(element.type, None)
+        if element.type == ArticleElementType.PARAGRAPH:
+            self._views.pop("paragraphs", None)
+        self._text_buffer = None
+        return self
+
+    def extend(self, elements: list[ArticleElement]):
+        """
+        Append elements to the sections. See `append_element`.
+
+        Parameters
+        ----------
+        elements: the `ArticleElement`s to append
+
+        Returns
+        -------
+        self
+        """
+        for element in elements:
+            self.append_element(element)
+        return self
+
+    def __getstate__(self):
+        # the cached views are rebuilt on access
+        state = self.__dict__.copy()
+        state["_views"] = dict()
+        return state
+
+    def __setstate__(self, state):
+        # articles pickled before the text buffer or the typed views were introduced
+        self._text_buffer = None
+        self._views = dict()
+        self.__dict__.update(state)
+        if not isinstance(self._sections, ArticleSections):
+            self._sections = ArticleSections(self, self._sections)
+        if "_type_to_contents" not in state:
+            self._set_sec_id_to_sec()
 
     def __repr__(self):
         return f"Article(doi: {self.doi}, title: {self.title.text})"
@@ -195,39 +353,144 @@ class Article:
                 return self._sec_id_to_sec[item[0]][item[1]]
 
     def _set_sec_id_to_sec(self):
-        self._sec_id_to_sec["title"] = self.title
-        self._sec_id_to_sec["abs"] = self.abstract
+        """
+        Rebuild the section-id map and the typed views from the sections
+        """
+        self._sec_id_to_sec = {"title": self.title, "abs": self.abstract}
+        self._type_to_contents = dict()
+        self._views = dict()
         for i, sec in enumerate(self.sections):
             if sec.type == ArticleElementType.PARAGRAPH:
                 self._sec_id_to_sec[f"sec_{i}"] = sec.content
+            self._type_to_contents.setdefault(sec.type, list()).append(sec.content)
         return self
 
-    @functools.lru_cache()
-    def get_sentences_and_tokens(self, include_title=False):
-        sent_list = list()
-        tokens_list = list()
+    def _sections_changed(self):
+        """
+        Called by `ArticleSections` after the sections are changed other than by appending
+        """
+        self._text_buffer = None
+        return self._set_sec_id_to_sec()
 
-        inst_ids = list()  # section id, sentence idx
+    def iter_sentences(self, include_title=False):
+        """
+        Iterate over the sentences of the title, abstract and paragraphs
+
+        Parameters
+        ----------
+        include_title: whether to include the title
+
+        Returns
+        -------
+        generator of (section id, sentence idx, sentence) tuples
+        """
         if include_title:
-            sent_list.append(self.title.text)
-            tokens_list.append(self.title.tokens)
-            inst_ids.append(("title", 0))
+            yield "title", 0, self.title
 
         if self.abstract:
             for sent_idx, sent in enumerate(self.abstract.sentences):
-                sent_list.append(sent.text)
-                tokens_list.append(sent.tokens)
-                inst_ids.append(("abs", sent_idx))
+                yield "abs", sent_idx, sent
 
         for sec_idx, section in enumerate(self._sections):
             if section.type != ArticleElementType.PARAGRAPH:
                 continue
             for sent_idx, sent in enumerate(section.content.sentences):
-                sent_list.append(sent.text)
-                tokens_list.append(sent.tokens)
-                inst_ids.append((f"sec_{sec_idx}", sent_idx))  # section id, sentence idx
+                yield f"sec_{sec_idx}", sent_idx, sent
+
+    def get_sentences_and_tokens(self, include_title=False):
+        sent_list = list()
+        tokens_list = list()
+        inst_ids = list()  # section id, sentence idx
+        for sec_id, sent_idx, sent in self.iter_sentences(include_title):
+            sent_list.append(sent.text)
+            tokens_list.append(sent.tokens)
+            inst_ids.append((sec_id, sent_idx))
         return sent_list, tokens_list, inst_ids
 
+    def to_flat_tokens(self, include_title=False) -> FlatTokens:
+        """
+        Export the tokens of the title, abstract and paragraphs as flat arrays for batching
+
+        Parameters
+        ----------
+        include_title: whether to include the title
+
+        Returns
+        -------
+        FlatTokens
+        """
+        return flatten_sentences(self.iter_sentences(include_title))
+
+    def _text_layout(self):
+        """
+        Yield the pieces of the article text in the `save_jsonl` layout:
+        the title `Sentence`, the abstract and paragraph `Paragraph`s, and the `str` separators between them
+        """
+        yield f"doi: {self.doi}\n"
+
+        if self.title:
+            yield "title: "
+            yield self.title
+            yield "\n\n"
+
+        if self.abstract:
+            yield "Abstract:\n\n"
+            yield self.abstract
+            yield "\n"
+
+        for section in self.sections:
+            if section.type == ArticleElementType.SECTION_TITLE:
+                yield f"\n{section.content}\n\n"
+
+            elif section.type in [ArticleElementType.PARAGRAPH, ArticleElementType.FIGURE]:
+                yield section.content
+                yield "\n\n"
+
+    def build_text_buffer(self):
+        """
+        Concatenate the article text into one buffer in the `save_jsonl` layout and turn the title, abstract,
+        paragraphs, figure captions and their sentences into views of the buffer,
+        so each character is stored once and `buffer_offset` gives the global character offsets.
+
+        Splits the sentences of all paragraphs. Changing the title, abstract or sections drops the buffer;
+        changing the text of a paragraph turns it back into a standalone string.
+        Notice that Python stores a string with the width of its widest character,
+        so one non-BMP character (e.g., a mathematical italic letter) makes the whole buffer 4 bytes per character.
+
+        Returns
+        -------
+        self
+        """
+        contents = list()
+        pieces = list()
+        offset = 0
+        for piece in self._text_layout():
+            if not isinstance(piece, str):
+                contents.append((piece, offset))
+                piece = piece.text
+            pieces.append(piece)
+            offset += len(piece)
+
+        self._text_buffer = "".join(pieces)
+        for content, offset in contents:
+            content.set_text_view(self._text_buffer, offset)
+        return self
+
+    def tokenize(self, tokenizer: Tokenizer | str = None, include_title: bool = True) -> int:
+        """
+        Split the sentences and tokenize the words of the abstract, paragraphs and figure captions in one batch
+
+        Parameters
+        ----------
+        tokenizer: `Tokenizer` instance or name of a registered backend. Defaults to the default backend
+        include_title: whether to tokenize the title
+
+        Returns
+        -------
+        the number of tokenized sentences
+        """
+        return tokenize_articles([self], tokenizer=tokenizer, include_title=include_title)
+
     def save_pt(self, save_path):
         """
         Save article as pt files so that it can be loaded later
@@ -266,6 +529,116 @@ class Article:
 
         return self
 
+    def save_binary(self, save_path, compress: bool = True):
+        """
+        Save article in the versioned binary format, which stores the text, sentence offsets, tokens, annotations
+        and tables in length-prefixed columns instead of pickling the object graph.
+        Derived states (e.g., annotation indices) are rebuilt on demand after loading;
+        `grouped_anno` and custom tokenizer callables are not stored.
+
+        Parameters
+        ----------
+        save_path: path to save file
+        compress: whether to compress the columns with zlib
+
+        Returns
+        -------
+        self
+        """
+        with open(save_path, "wb") as f:
+            f.write(self.to_binary(compress=compress))
+        return self
+
+    def to_binary(self, compress: bool = True) -> bytes:
+        """
+        Encode article in the binary format of `save_binary`
+
+        Parameters
+        ----------
+        compress: whether to compress the columns with zlib
+
+        Returns
+        -------
+        the encoded article
+        """
+        meta = {"doi": self.doi, "publisher": self.publisher, "n_sections": len(self.sections)}
+        blocks = dict()
+
+        blocks["title"] = write_sentences(ColumnWriter(), [self.title] if self.title else []).getvalue()
+        blocks["abstract"] = write_paragraphs(ColumnWriter(), [self.abstract] if self.abstract else []).getvalue()
+
+        writer = ColumnWriter()
+        writer.strings([sec.type.value for sec in self.sections])
+        writer.strings([sec.content for sec in self.sections if isinstance(sec.content, str)])
+        write_paragraphs(writer, [sec.content for sec in self.sections if isinstance(sec.content, Paragraph)])
+        write_tables(writer, [sec.content for sec in self.sections if isinstance(sec.content, Table)])
+        blocks["sections"] = writer.getvalue()
+
+        return encode_blocks(meta, blocks, compress=compress)
+
+    def load_binary(self, load_path, parts: list[str] = None):
+        """
+        Load article from a file saved by `save_binary`. The DOI and publisher are always loaded.
+
+        Parameters
+        ----------
+        load_path: path to the binary article file
+        parts: the parts to load among "title", "abstract" and "sections". Load all parts if None;
+            the other parts are skipped without being read
+
+        Returns
+        -------
+        self
+        """
+        return self._set_binary_blocks(*read_blocks(load_path, _check_binary_parts(parts)))
+
+    def from_binary(self, data: bytes | memoryview, parts: list[str] = None):
+        """
+        Load article from the bytes encoded by `to_binary`. The DOI and publisher are always loaded.
+
+        Parameters
+        ----------
+        data: the encoded article
+        parts: the parts to load among "title", "abstract" and "sections". Load all parts if None
+
+        Returns
+        -------
+        self
+        """
+        return self._set_binary_blocks(*decode_blocks(data, _check_binary_parts(parts)))
+
+    def _set_binary_blocks(self, meta: dict, blocks: dict[str, bytes]):
+        self.doi = meta["doi"]
+        self.publisher = meta["publisher"]
+
+        if "title" in blocks:
+            titles = read_sentences(ColumnReader(blocks["title"]))
+            if titles:
+                self.title = titles[0]
+        if "abstract" in blocks:
+            abstracts = read_paragraphs(ColumnReader(blocks["abstract"]))
+            self.abstract = abstracts[0] if abstracts else None
+
+        if "sections" in blocks:
+            reader = ColumnReader(blocks["sections"])
+            types = [ArticleElementType(t) for t in reader.strings()]
+            texts = iter(reader.strings())
+            paragraphs = iter(read_paragraphs(reader))
+            tables = iter(read_tables(reader))
+
+            sections = list()
+            for element_type in types:
+                if element_type in (ArticleElementType.PARAGRAPH, ArticleElementType.FIGURE):
+                    content = next(paragraphs)
+                elif element_type == ArticleElementType.TABLE:
+                    content = next(tables)
+                else:
+                    content = next(texts)
+                sections.append(ArticleElement(type=element_type, content=content))
+            self.sections = sections
+
+        return self
+
     def save_html(
         self,
         save_path,
@@ -288,121 +661,10 @@ class Article:
         self
         """
 
-        tags_to_highlight = list() if tags_to_highlight is None else tags_to_highlight
-        tags_to_present = list() if tags_to_present is None else tags_to_present
-
-        soup = BeautifulSoup()
-        head = soup.new_tag("head")
-        soup.insert(0, head)
-        title = soup.new_tag("title")
-        head.insert(0, title)
-        title.insert(0, self.title.text)
-
-        set_html_style(head, html_style)
-
-        viewport_meta = Tag(
-            builder=soup.builder,
-            name="meta",
-            attrs={"name": "viewport", "content": "width=device-width, initial-scale=1"},
-        )
-        head.insert(len(head), viewport_meta)
-
-        title = soup.new_tag("h1")
-        head.insert(len(head), title)
-        title.insert(0, self.title.text)
-        doi = soup.new_tag("p")
-        head.insert(len(head), doi)
-        doi.insert(0, f"doi:")
-        doi_link = soup.new_tag("a", href=f"https://www.doi.org/{self.doi}")
-        doi_link.insert(0, f"{self.doi}")
-        doi.insert(len(doi), doi_link)
-
-        body = soup.new_tag("body")
-        soup.insert(len(soup), body)
-
-        # save space for result sentences
-        result_div = soup.new_tag("div", id="results")
-        body.insert(len(body), result_div)
-
-        body.insert(len(body), soup.new_tag("hr"))
-        abs_div = soup.new_tag("div", id="abstract")
-        body.insert(len(body), abs_div)
-
-        inst_to_present = list()
-        inst_idx_list = list()
-        inst_idx = 0
-
-        if self.abstract:
-            abs_title = soup.new_tag("h2")
-            abs_div.insert(0, abs_title)
-            abs_title.insert(0, "Abstract")
-
-            abstract = soup.new_tag("p")
-            abs_div.insert(len(abs_div), abstract)
-            abs_para = self.abstract
-            abs_txt = abs_para.text
-
-            for tag in tags_to_highlight:
-                spans = list(abs_para.get_anno_by_value(tag).keys())
-                if spans:
-                    abs_txt, inst_ids = html_mark_spans(abs_txt, spans, abs_para.text, tag, f"$@${inst_idx}")
-                    inst_idx += 1
-
-                    if tag in tags_to_present:
-                        for s, e in spans:
-                            inst_to_present.append(abs_para.text[s:e])
-                        inst_idx_list += inst_ids
-            abstract.insert(len(abstract), abs_txt)
-
-        sec_div = soup.new_tag("div", id="sections")
-        body.insert(len(body), sec_div)
-        for section in self.sections:
-
-            if section.type == ArticleElementType.SECTION_TITLE:
-                section_title = soup.new_tag("h2")
-                sec_div.insert(len(sec_div), section_title)
-                section_title.insert(0, section.content)
-
-            elif section.type in [ArticleElementType.PARAGRAPH, ArticleElementType.FIGURE]:
-                paragraph = soup.new_tag("p")
-                sec_div.insert(len(sec_div), paragraph)
-                para = section.content
-                txt = para.text
-
-                for tag in tags_to_highlight:
-                    spans = list(para.get_anno_by_value(tag).keys())
-                    if spans:
-                        txt, inst_ids = html_mark_spans(txt, spans, para.text, tag, f"$@${inst_idx}")
-                        inst_idx += 1
-
-                        if tag in tags_to_present:
-                            for s, e in spans:
-                                inst_to_present.append(section.content.text[s:e])
-                            inst_idx_list += inst_ids
-                paragraph.insert(len(paragraph), txt)
-
-            elif section.type == ArticleElementType.TABLE:
-                section.content.write_html(sec_div)
-
-        if inst_to_present:
-            # save result sentences
-            result_title = soup.new_tag("h2")
-            result_div.insert(len(result_div), result_title)
-            result_title.insert(0, "results")
-            result_list = soup.new_tag("ol")
-            result_div.insert(len(result_div), result_list)
-
-            for inst, idx in zip(inst_to_present, inst_idx_list):
-                result_p = soup.new_tag("li")
-                result_list.insert(len(result_list), result_p)
-                result_p.insert(0, inst)
-                result_link = soup.new_tag("a", href=f"#{idx}")
-                result_p.insert(len(result_p), result_link)
-                result_link.insert(0, "[link]")
-
-        soup_str = soup.prettify().replace("&lt;", "<").replace("&gt;", ">")
+        body = render_article_html(self, tags_to_highlight, tags_to_present)
+        page = render_html_page(self.title.text if self.title else "", body, html_style)
         with open(save_path, "w", encoding="utf-8") as outfile:
-            outfile.write(soup_str)
+            outfile.write(page)
 
         return self
 
@@ -418,38 +680,40 @@ class Article:
         -------
         self
         """
-        txt_lines = ""
-        doi = self.doi
-
-        txt_lines += f"doi: {doi}\n"
-        global_spans = {}
-
-        if self.title:
-            txt_lines += f"title: {self.title.text}\n\n"
-
-        if self.abstract:
-            txt_lines += f"Abstract:\n\n"
-            abstract = self.abstract.text
-
-            for (s, e), v in self.abstract.base_anno.items():
-                if v not in global_spans:
-                    global_spans[v] = list()
-                global_spans[v].append((s + len(txt_lines), e + len(txt_lines)))
-            txt_lines += f"{abstract}\n"
+        with open(save_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_jsonl_record(), f, ensure_ascii=False)
+        return self
 
-        if self.sections:
-            for section in self.sections:
+    def to_jsonl_record(self) -> dict:
+        """
+        The Doccano-compatible record saved by `save_jsonl`
 
-                if section.type == ArticleElementType.SECTION_TITLE:
-                    txt_lines += f"\n{section.content}\n\n"
+        Returns
+        -------
+        dict with the article text, the annotation labels as [start, end, label] and the DOI
+        """
+        doi = self.doi
+        global_spans = {}
 
-                elif section.type in [ArticleElementType.PARAGRAPH, ArticleElementType.FIGURE]:
-                    para = section.content
-                    for (s, e), v in para.base_anno.items():
-                        if v not in global_spans:
-                            global_spans[v] = list()
-                        global_spans[v].append((s + len(txt_lines), e + len(txt_lines)))
-                    txt_lines += f"{section.content.text}\n\n"
+        # the global offsets of the abstract and paragraphs come with the text buffer if it is built
+        txt_lines = self.text_buffer
+        if txt_lines is None:
+            pieces = list()
+            offset = 0
+            for piece in self._text_layout():
+                if isinstance(piece, Paragraph):
+                    for (s, e), v in piece.base_anno.items():
+                        global_spans.setdefault(v, list()).append((s + offset, e + offset))
+                text = piece if isinstance(piece, str) else piece.text
+                pieces.append(text)
+                offset += len(text)
+            txt_lines = "".join(pieces)
+        else:
+            for piece in self._text_layout():
+                if isinstance(piece, Paragraph):
+                    offset = piece.buffer_offset
+                    for (s, e), v in piece.base_anno.items():
+                        global_spans.setdefault(v, list()).append((s + offset, e + offset))
 
         txt_lines = txt_lines.rstrip()
         labels_list = list()
@@ -457,57 +721,37 @@ class Article:
             for span in spans:
                 labels_list.append([span[0], span[1], k])
 
-        result_dict = {"text": txt_lines, "label": labels_list, "doi": doi}
-        with open(save_path, "w", encoding="utf-8") as f:
-            json.dump(result_dict, f, ensure_ascii=False)
-        return self
+        return {"text": txt_lines, "label": labels_list, "doi": doi}
 
 
-def set_html_style(root: Tag, html_style: str = None):
-    soup = BeautifulSoup()
-    style = soup.new_tag("style")
-    root.insert(len(root), style)
-    html_style = DEFAULT_HTML_STYLE if not html_style else html_style
-    style.insert(0, html_style)
-    return root
+def _check_binary_parts(parts: list[str] = None) -> tuple[str, ...] | list[str]:
+    parts = BINARY_PARTS if parts is None else parts
+    for part in parts:
+        if part not in BINARY_PARTS:
+            raise ValueError(f"Unknown article part {part}! Choose from {BINARY_PARTS}")
+    return parts
 
 
-def html_mark_spans(
-    text: str,
-    spans: list[tuple[int, int]],
-    ori_text: str = None,
-    mark_class: str = "",
-    mark_id: str = "",
-):
+def tokenize_articles(articles: list[Article], tokenizer: Tokenizer | str = None, include_title: bool = True) -> int:
     """
-    Wrap entity spans with HTML marker
+    Split the sentences and tokenize the words of a batch of articles with one tokenizer call each
 
     Parameters
     ----------
-    text: input text string
-    spans: input spans
-    ori_text: original text where the span is based
-    mark_class: the class of mark tag
-    mark_id: the id of the mark tag
+    articles: articles to tokenize
+    tokenizer: `Tokenizer` instance or name of a registered backend. Defaults to the default backend
+    include_title: whether to tokenize the titles
 
     Returns
     -------
-    Marked text
+    the number of tokenized sentences
     """
-    if ori_text:
-        import textspan
-
-        spans = [(s[0][0], s[-1][-1]) for s in textspan.align_spans(spans, ori_text, text)]
-    spans = sort_tuples_by_element_idx(spans)
-
-    merged_spans = list(itertools.chain(*spans))
-    merged_spans = [0] + merged_spans + [len(text)]
-    splitted_str = [text[x:y] for x, y in zip(merged_spans, merged_spans[1:])]
-    i = 1
-    ids = list()
-    while i < len(splitted_str):
-        id_str = f"{mark_id}-{i}"
-        splitted_str[i] = f"<mark class={mark_class.lower()} id={id_str}>{splitted_str[i]}</mark>"
-        i += 2
-        ids.append(id_str)
-    return "".join(splitted_str), ids
+    paragraphs = list()
+    titles = list()
+    for article in articles:
+        if include_title and article.title:
+            titles.append(article.title)
+        if article.abstract:
+            paragraphs.append(article.abstract)
+        paragraphs += [sec.content for sec in article.sections if isinstance(sec.content, Paragraph)]
+    return tokenize_paragraphs(paragraphs, sentences=titles, tokenizer=tokenizer)
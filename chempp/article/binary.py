@@ -0,0 +1,438 @@
+"""
+# Author: Yinghao Li
+# Modified: June 15th, 2024
+# ---------------------------------------
+# Description: Versioned binary format of length-prefixed columns for articles
+"""
+
+import json
+import zlib
+import struct
+import numpy as np
+
+from .paragraph import Sentence, Paragraph
+from .table import Table, TableRow, TableCell
+
+__all__ = [
+    "BINARY_MAGIC",
+    "BINARY_VERSION",
+    "ColumnWriter",
+    "ColumnReader",
+    "encode_blocks",
+    "decode_blocks",
+    "write_blocks",
+    "read_blocks",
+    "write_sentences",
+    "read_sentences",
+    "write_paragraphs",
+    "read_paragraphs",
+    "write_tables",
+    "read_tables",
+]
+
+BINARY_MAGIC = b"CHEMPPB\x00"
+BINARY_VERSION = 1
+
+# magic, version, flags, length of the table of contents
+HEADER = struct.Struct("<8sHHI")
+FLAG_ZLIB = 1
+COUNT = struct.Struct("<Q")
+INT_DTYPE = np.dtype("<i4")
+
+
+class ColumnWriter:
+    """
+    Serialize columns of integers and strings, each prefixed by its length
+    """
+
+    def __init__(self):
+        self._chunks = list()
+
+    def ints(self, values):
+        """
+        Write a column of 32-bit integers
+        """
+        arr = np.asarray(values, dtype=INT_DTYPE).ravel()
+        self._chunks.append(COUNT.pack(len(arr)))
+        self._chunks.append(arr.tobytes())
+        return self
+
+    def strings(self, values: list[str | None]):
+        """
+        Write a column of strings as their lengths in characters (-1 for None) followed by their concatenated text
+        """
+        self.ints([-1 if v is None else len(v) for v in values])
+        data = "".join([v for v in values if v is not None]).encode("utf-8")
+        self._chunks.append(COUNT.pack(len(data)))
+        self._chunks.append(data)
+        return self
+
+    def getvalue(self) -> bytes:
+        return b"".join(self._chunks)
+
+
+class ColumnReader:
+    """
+    Read the columns written by `ColumnWriter` in the same order
+    """
+
+    def __init__(self, data: bytes):
+        self._data = memoryview(data)
+        self._pos = 0
+
+    def _count(self) -> int:
+        (n,) = COUNT.unpack_from(self._data, self._pos)
+        self._pos += COUNT.size
+        return n
+
+    def ints(self) -> np.ndarray:
+        n = self._count()
+        arr = np.frombuffer(self._data, dtype=INT_DTYPE, count=n, offset=self._pos)
+        self._pos += n * INT_DTYPE.itemsize
+        return arr
+
+    def strings(self) -> list[str | None]:
+        lengths = self.ints().tolist()
+        n_bytes = self._count()
+        text = str(self._data[self._pos : self._pos + n_bytes], "utf-8")
+        self._pos += n_bytes
+
+        values = list()
+        start = 0
+        for length in lengths:
+            if length < 0:
+                values.append(None)
+            else:
+                values.append(text[start : start + length])
+                start += length
+        return values
+
+
+def encode_blocks(meta: dict, blocks: dict[str, bytes], compress: bool = True) -> bytes:
+    """
+    Encode a binary article: a header, a JSON table of contents with the metadata, and the named blocks
+
+    Parameters
+    ----------
+    meta: JSON-serializable metadata
+    blocks: serialized blocks by their names
+    compress: whether to compress the blocks with zlib
+
+    Returns
+    -------
+    the encoded article
+    """
+    toc = list()
+    payloads = list()
+    offset = 0
+    for name, payload in blocks.items():
+        if compress:
+            payload = zlib.compress(payload)
+        toc.append([name, offset, len(payload)])
+        payloads.append(payload)
+        offset += len(payload)
+
+    toc_bytes = json.dumps({"meta": meta, "blocks": toc}, ensure_ascii=False).encode("utf-8")
+    flags = FLAG_ZLIB if compress else 0
+    return b"".join([HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags, len(toc_bytes)), toc_bytes] + payloads)
+
+
+def _check_header(magic: bytes, version: int, source):
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"{source} is not a binary article!")
+    if version > BINARY_VERSION:
+        raise ValueError(f"Unsupported binary article version {version}; the latest supported is {BINARY_VERSION}")
+
+
+def decode_blocks(data: bytes | memoryview, names: list[str] = None) -> tuple[dict, dict[str, bytes]]:
+    """
+    Decode the metadata and the requested blocks of an encoded binary article; the other blocks are skipped
+
+    Parameters
+    ----------
+    data: the encoded article, e.g., a slice of a memory-mapped file
+    names: names of the blocks to decode. Decode all blocks if None
+
+    Returns
+    -------
+    the metadata and the blocks by their names
+    """
+    data = memoryview(data)
+    magic, version, flags, toc_len = HEADER.unpack_from(data)
+    _check_header(magic, version, "The data")
+    toc = json.loads(str(data[HEADER.size : HEADER.size + toc_len], "utf-8"))
+
+    blocks = dict()
+    base = HEADER.size + toc_len
+    for name, offset, length in toc["blocks"]:
+        if names is not None and name not in names:
+            continue
+        payload = data[base + offset : base + offset + length]
+        blocks[name] = zlib.decompress(payload) if flags & FLAG_ZLIB else bytes(payload)
+    return toc["meta"], blocks
+
+
+def write_blocks(save_path, meta: dict, blocks: dict[str, bytes], compress: bool = True):
+    """
+    Write a binary article file. See `encode_blocks`.
+
+    Parameters
+    ----------
+    save_path: path to save the file
+    meta: JSON-serializable metadata
+    blocks: serialized blocks by their names
+    compress: whether to compress the blocks with zlib
+
+    Returns
+    -------
+    None
+    """
+    with open(save_path, "wb") as f:
+        f.write(encode_blocks(meta, blocks, compress=compress))
+
+
+def read_blocks(load_path, names: list[str] = None) -> tuple[dict, dict[str, bytes]]:
+    """
+    Read the metadata and the requested blocks of a binary article file; the other blocks are skipped
+
+    Parameters
+    ----------
+    load_path: path to the file
+    names: names of the blocks to read. Read all blocks if None
+
+    Returns
+    -------
+    the metadata and the blocks by their names
+    """
+    with open(load_path, "rb") as f:
+        magic, version, flags, toc_len = HEADER.unpack(f.read(HEADER.size))
+        _check_header(magic, version, load_path)
+        toc = json.loads(f.read(toc_len).decode("utf-8"))
+
+        blocks = dict()
+        base = HEADER.size + toc_len
+        for name, offset, length in toc["blocks"]:
+            if names is not None and name not in names:
+                continue
+            f.seek(base + offset)
+            payload = f.read(length)
+            blocks[name] = zlib.decompress(payload) if flags & FLAG_ZLIB else payload
+    return toc["meta"], blocks
+
+
+class StringTable:
+    """
+    Map repeated strings (labels, annotation sources, tokens) to integer ids
+    """
+
+    def __init__(self):
+        self.ids = dict()
+
+    def __call__(self, value: str) -> int:
+        return self.ids.setdefault(value, len(self.ids))
+
+    @property
+    def values(self):
+        return list(self.ids.keys())
+
+
+def _write_annos(writer: ColumnWriter, annos: list[dict[str, dict[tuple[int, int], str]]]):
+    sources = StringTable()
+    labels = StringTable()
+    n_sources = list()
+    source_ids = list()
+    n_spans = list()
+    spans = list()
+    for anno in annos:
+        n_sources.append(len(anno))
+        for src, src_anno in anno.items():
+            source_ids.append(sources(src))
+            n_spans.append(len(src_anno))
+            for (s, e), v in src_anno.items():
+                spans += [s, e, labels(v)]
+    writer.strings(sources.values).strings(labels.values)
+    writer.ints(n_sources).ints(source_ids).ints(n_spans).ints(spans)
+
+
+def _read_annos(reader: ColumnReader) -> list[dict[str, dict[tuple[int, int], str]] | None]:
+    sources = reader.strings()
+    labels = reader.strings()
+    n_sources = reader.ints().tolist()
+    source_ids = reader.ints().tolist()
+    n_spans = reader.ints().tolist()
+    spans = reader.ints().tolist()
+
+    annos = list()
+    src_idx = 0
+    span_idx = 0
+    for n_src in n_sources:
+        anno = dict()
+        for _ in range(n_src):
+            n = n_spans[src_idx]
+            if n:
+                anno[sources[source_ids[src_idx]]] = {
+                    (spans[i], spans[i + 1]): labels[spans[i + 2]] for i in range(span_idx, span_idx + 3 * n, 3)
+                }
+                span_idx += 3 * n
+            else:
+                anno[sources[source_ids[src_idx]]] = dict()
+            src_idx += 1
+        # an empty dict is not a valid annotation input
+        annos.append(anno if anno else None)
+    return annos
+
+
+def _write_tokens(writer: ColumnWriter, sentences: list[Sentence]):
+    tokens = StringTable()
+    n_tokens = list()
+    token_ids = list()
+    for sent in sentences:
+        # tokens are not computed for serialization
+        sent_tokens = sent._tokens
+        if sent_tokens is None:
+            n_tokens.append(-1)
+            continue
+        n_tokens.append(len(sent_tokens))
+        token_ids += [tokens(t) for t in sent_tokens]
+    writer.strings(tokens.values).ints(n_tokens).ints(token_ids)
+
+
+def _read_tokens(reader: ColumnReader) -> list[list[str] | None]:
+    tokens = reader.strings()
+    n_tokens = reader.ints().tolist()
+    token_ids = reader.ints().tolist()
+
+    sent_tokens = list()
+    idx = 0
+    for n in n_tokens:
+        if n < 0:
+            sent_tokens.append(None)
+            continue
+        sent_tokens.append([tokens[i] for i in token_ids[idx : idx + n]])
+        idx += n
+    return sent_tokens
+
+
+def write_sentences(writer: ColumnWriter, sentences: list[Sentence]):
+    """
+    Write the text, offsets, tokens and annotations of standalone sentences (e.g., titles)
+    """
+    writer.strings([sent.text for sent in sentences])
+    writer.ints([idx for sent in sentences for idx in (sent.start_idx, sent.end_idx)])
+    _write_tokens(writer, sentences)
+    _write_annos(writer, [sent.anno for sent in sentences])
+    return writer
+
+
+def read_sentences(reader: ColumnReader) -> list[Sentence]:
+    texts = reader.strings()
+    offsets = reader.ints().tolist()
+    tokens = _read_tokens(reader)
+    annos = _read_annos(reader)
+
+    return [
+        Sentence.from_columns(text, offsets[2 * i], sent_tokens, anno)
+        for i, (text, sent_tokens, anno) in enumerate(zip(texts, tokens, annos))
+    ]
+
+
+def write_paragraphs(writer: ColumnWriter, paragraphs: list[Paragraph]):
+    """
+    Write the text, annotations and, if they are split, the sentences of paragraphs.
+    Paragraphs that are not split yet are stored as text only and split on demand after loading.
+    """
+    n_sents = list()
+    sentences = list()
+    for para in paragraphs:
+        # sentences are not split for serialization
+        if para._sentences is None:
+            n_sents.append(-1)
+        else:
+            n_sents.append(len(para._sentences))
+            sentences += para._sentences
+
+    writer.strings([para.text if para._sentences is not None else para._text for para in paragraphs])
+    _write_annos(writer, [para.anno for para in paragraphs])
+    writer.ints(n_sents)
+    writer.ints([idx for sent in sentences for idx in (sent.start_idx, sent.end_idx)])
+    _write_tokens(writer, sentences)
+    _write_annos(writer, [sent.anno for sent in sentences])
+    return writer
+
+
+def read_paragraphs(reader: ColumnReader) -> list[Paragraph]:
+    texts = reader.strings()
+    annos = _read_annos(reader)
+    n_sents = reader.ints().tolist()
+    offsets = reader.ints().tolist()
+    tokens = _read_tokens(reader)
+    sent_annos = _read_annos(reader)
+
+    paragraphs = list()
+    sent_idx = 0
+    for text, anno, n in zip(texts, annos, n_sents):
+        para = Paragraph(text=text, anno=anno)
+        if n >= 0:
+            para.sentences = [
+                Sentence.from_columns(
+                    text[offsets[2 * i] : offsets[2 * i + 1]], offsets[2 * i], tokens[i], sent_annos[i]
+                )
+                for i in range(sent_idx, sent_idx + n)
+            ]
+            sent_idx += n
+        paragraphs.append(para)
+    return paragraphs
+
+
+def write_tables(writer: ColumnWriter, tables: list[Table]):
+    """
+    Write the captions, footnotes and cells of tables
+    """
+    writer.strings([tbl._label for tbl in tables])
+    writer.strings([tbl._id for tbl in tables])
+    writer.strings([tbl._caption for tbl in tables])
+    writer.ints([-1 if tbl._footnotes is None else len(tbl._footnotes) for tbl in tables])
+    writer.strings([fn for tbl in tables for fn in (tbl._footnotes or [])])
+
+    rows = [row for tbl in tables for row in (tbl._rows or [])]
+    cells = [cell for row in rows for cell in row.cells]
+    writer.ints([-1 if tbl._rows is None else len(tbl._rows) for tbl in tables])
+    writer.ints([len(row.cells) for row in rows])
+    writer.strings([cell.text for cell in cells])
+    writer.ints(
+        [v for cell in cells for v in (cell.width, cell.height, int(cell.linked_top) | int(cell.linked_left) << 1)]
+    )
+    return writer
+
+
+def read_tables(reader: ColumnReader) -> list[Table]:
+    labels = reader.strings()
+    ids = reader.strings()
+    captions = reader.strings()
+    n_footnotes = reader.ints().tolist()
+    footnotes = reader.strings()
+    n_rows = reader.ints().tolist()
+    n_cells = reader.ints().tolist()
+    texts = reader.strings()
+    attrs = reader.ints().tolist()
+
+    cells = [
+        TableCell(text, attrs[3 * i], attrs[3 * i + 1], bool(attrs[3 * i + 2] & 1), bool(attrs[3 * i + 2] & 2))
+        for i, text in enumerate(texts)
+    ]
+    rows = list()
+    cell_idx = 0
+    for n in n_cells:
+        rows.append(TableRow(cells[cell_idx : cell_idx + n]))
+        cell_idx += n
+
+    tables = list()
+    row_idx = 0
+    fn_idx = 0
+    for label, idx, caption, n_fn, n_row in zip(labels, ids, captions, n_footnotes, n_rows):
+        tbl_footnotes = None if n_fn < 0 else footnotes[fn_idx : fn_idx + n_fn]
+        fn_idx += max(n_fn, 0)
+        tbl_rows = None if n_row < 0 else rows[row_idx : row_idx + n_row]
+        row_idx += max(n_row, 0)
+        tables.append(Table(label=label, idx=idx, caption=caption, rows=tbl_rows, footnotes=tbl_footnotes))
+    return tables
@@ -0,0 +1,284 @@
+"""
+# Author: Yinghao Li
+# Modified: June 15th, 2024
+# ---------------------------------------
+# Description: Columnar Parquet/Arrow export of the sentences, annotations and table cells of many articles
+"""
+
+import os
+import logging
+import numpy as np
+import os.path as osp
+
+from .article import Article, ArticleElementType
+from .paragraph import Paragraph
+from .flat_tokens import flatten_sentences
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ArticleColumnarWriter", "COLUMNAR_TABLES"]
+
+COLUMNAR_TABLES = ("sentences", "annotations", "table_cells")
+COLUMNAR_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _columnar_schemas() -> dict:
+    import pyarrow as pa
+
+    return {
+        "sentences": pa.schema(
+            [
+                ("doi", pa.string()),
+                ("section_id", pa.string()),
+                ("sentence_idx", pa.int32()),
+                ("start_idx", pa.int32()),
+                ("text", pa.string()),
+                ("token_starts", pa.list_(pa.int32())),
+                ("token_ends", pa.list_(pa.int32())),
+            ]
+        ),
+        "annotations": pa.schema(
+            [
+                ("doi", pa.string()),
+                ("section_id", pa.string()),
+                ("start", pa.int32()),
+                ("end", pa.int32()),
+                ("label", pa.string()),
+                ("source", pa.string()),
+            ]
+        ),
+        "table_cells": pa.schema(
+            [
+                ("doi", pa.string()),
+                ("section_id", pa.string()),
+                ("row", pa.int32()),
+                ("column", pa.int32()),
+                ("row_span", pa.int32()),
+                ("col_span", pa.int32()),
+                ("text", pa.string()),
+            ]
+        ),
+    }
+
+
+class ArticleColumnarWriter:
+    """
+    Write the sentences, annotations and table cells of articles into three columnar files in a directory:
+
+    - `sentences`: doi, section id, sentence idx, character start of the sentence in its paragraph, text,
+      and the character (start, end) offsets of the tokens in the sentence, -1 for tokens not found verbatim;
+    - `annotations`: doi, section id, character (start, end) in the paragraph, label and annotation source;
+    - `table_cells`: doi, section id, row, column, row and column spans and text of each table cell.
+
+    Section ids are those of `Article.get_sentences_and_tokens`. The rows are buffered per table and written
+    as record batches (Parquet row groups) of exactly `batch_size` rows, except the last one written on `close`.
+    The buffers are flushed after each article, so they hold fewer than `batch_size` rows plus the rows of
+    one article, regardless of the number of articles. Requires `pyarrow`.
+
+    Parameters
+    ----------
+    save_dir: the output directory
+    file_format: "parquet" or "arrow" (Arrow IPC file)
+    batch_size: number of rows per record batch (Parquet row group)
+    include_title: whether to include the title in the sentences
+    compression: compression codec of Parquet files; Arrow files are not compressed
+    """
+
+    def __init__(
+        self,
+        save_dir: str,
+        file_format: str = "parquet",
+        batch_size: int = 2**16,
+        include_title: bool = False,
+        compression: str = "snappy",
+    ):
+        import pyarrow as pa
+
+        if file_format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown file format {file_format}! Choose from {list(COLUMNAR_FORMATS.keys())}")
+        os.makedirs(save_dir, exist_ok=True)
+
+        self._batch_size = batch_size
+        self._file_format = file_format
+        self._include_title = include_title
+        self._schemas = _columnar_schemas()
+        self._writers = dict()
+        for name, schema in self._schemas.items():
+            path = osp.join(save_dir, f"{name}{COLUMNAR_FORMATS[file_format]}")
+            if file_format == "parquet":
+                import pyarrow.parquet as pq
+
+                self._writers[name] = pq.ParquetWriter(path, schema, compression=compression)
+            else:
+                self._writers[name] = pa.ipc.new_file(path, schema)
+
+        self._columns = {name: {field: list() for field in schema.names} for name, schema in self._schemas.items()}
+        self._n_rows = dict.fromkeys(COLUMNAR_TABLES, 0)
+        # rows left over from the last flush, fewer than `batch_size`
+        self._pending = dict.fromkeys(COLUMNAR_TABLES)
+        # token offsets are buffered as numpy arrays per article, with the number of tokens of each sentence
+        self._token_offsets = list()
+        self._n_tokens = list()
+        self._n_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def n_written(self):
+        return self._n_written
+
+    def write(self, article: Article):
+        """
+        Append the sentences, annotations and table cells of an article
+
+        Parameters
+        ----------
+        article: the article to write
+
+        Returns
+        -------
+        self
+        """
+        doi = article.doi
+        self._add_sentences(doi, article)
+
+        paragraphs = [("abs", article.abstract)] if article.abstract else list()
+        paragraphs += [
+            (f"sec_{sec_idx}", section.content)
+            for sec_idx, section in enumerate(article.sections)
+            if isinstance(section.content, Paragraph)
+        ]
+        cols = self._columns["annotations"]
+        for sec_id, para in paragraphs:
+            for source, anno in para.anno.items():
+                for (s, e), label in anno.items():
+                    cols["doi"].append(doi)
+                    cols["section_id"].append(sec_id)
+                    cols["start"].append(s)
+                    cols["end"].append(e)
+                    cols["label"].append(label)
+                    cols["source"].append(source)
+        self._n_rows["annotations"] = len(cols["doi"])
+
+        cols = self._columns["table_cells"]
+        for sec_idx, section in enumerate(article.sections):
+            if section.type != ArticleElementType.TABLE:
+                continue
+            grid = section.content.grid
+            cell_ids = grid.cell_ids
+            for i, j in zip(*np.nonzero(grid.origins)):
+                cell_id = cell_ids[i, j]
+                row_span = col_span = 1
+                while i + row_span < cell_ids.shape[0] and cell_ids[i + row_span, j] == cell_id:
+                    row_span += 1
+                while j + col_span < cell_ids.shape[1] and cell_ids[i, j + col_span] == cell_id:
+                    col_span += 1
+                cols["doi"].append(doi)
+                cols["section_id"].append(f"sec_{sec_idx}")
+                cols["row"].append(int(i))
+                cols["column"].append(int(j))
+                cols["row_span"].append(row_span)
+                cols["col_span"].append(col_span)
+                cols["text"].append(grid.cells[cell_id].text)
+        self._n_rows["table_cells"] = len(cols["doi"])
+
+        for name in COLUMNAR_TABLES:
+            if self._n_buffered(name) >= self._batch_size:
+                self._flush(name)
+        self._n_written += 1
+        return self
+
+    def write_many(self, articles):
+        """
+        Append the sentences, annotations and table cells of articles
+
+        Parameters
+        ----------
+        articles: iterable of articles
+
+        Returns
+        -------
+        self
+        """
+        for article in articles:
+            self.write(article)
+        return self
+
+    def _add_sentences(self, doi: str, article: Article):
+        sentences = list(article.iter_sentences(self._include_title))
+        if not sentences:
+            return
+        flat_tokens = flatten_sentences(sentences)
+
+        cols = self._columns["sentences"]
+        for sec_id, sent_idx, sent in sentences:
+            cols["doi"].append(doi)
+            cols["section_id"].append(sec_id)
+            cols["sentence_idx"].append(sent_idx)
+            cols["start_idx"].append(sent.start_idx)
+            cols["text"].append(sent.text)
+        self._token_offsets.append(flat_tokens.token_offsets)
+        self._n_tokens.append(np.diff(flat_tokens.sent_bounds))
+        self._n_rows["sentences"] = len(cols["doi"])
+
+    def _build_batch(self, name: str):
+        import pyarrow as pa
+
+        schema = self._schemas[name]
+        cols = self._columns[name]
+
+        arrays = dict()
+        if name == "sentences":
+            offsets = np.concatenate(self._token_offsets).astype(np.int32).reshape(-1, 2)
+            bounds = np.zeros(self._n_rows[name] + 1, dtype=np.int32)
+            np.cumsum(np.concatenate(self._n_tokens), out=bounds[1:])
+            arrays["token_starts"] = pa.ListArray.from_arrays(pa.array(bounds), pa.array(offsets[:, 0]))
+            arrays["token_ends"] = pa.ListArray.from_arrays(pa.array(bounds), pa.array(offsets[:, 1]))
+            self._token_offsets = list()
+            self._n_tokens = list()
+
+        batch = pa.record_batch(
+            [arrays[f.name] if f.name in arrays else pa.array(cols[f.name], type=f.type) for f in schema],
+            schema=schema,
+        )
+        self._columns[name] = {field: list() for field in schema.names}
+        self._n_rows[name] = 0
+        return batch
+
+    def _n_buffered(self, name: str) -> int:
+        pending = self._pending[name]
+        return self._n_rows[name] + (len(pending) if pending is not None else 0)
+
+    def _flush(self, name: str, final: bool = False):
+        """
+        Write the buffered rows as record batches of exactly `batch_size` rows and keep the remainder buffered,
+        unless this is the final flush
+        """
+        import pyarrow as pa
+
+        batches = [self._pending[name]] if self._pending[name] is not None else list()
+        if self._n_rows[name]:
+            batches.append(self._build_batch(name))
+        if not batches:
+            return
+
+        table = pa.Table.from_batches(batches, schema=self._schemas[name])
+        n_flushed = len(table) if final else len(table) - len(table) % self._batch_size
+        for offset in range(0, n_flushed, self._batch_size):
+            batch = table.slice(offset, self._batch_size).combine_chunks().to_batches()[0]
+            if self._file_format == "parquet":
+                self._writers[name].write_batch(batch, row_group_size=self._batch_size)
+            else:
+                self._writers[name].write_batch(batch)
+
+        rest = table.slice(n_flushed).combine_chunks()
+        self._pending[name] = rest.to_batches()[0] if len(rest) else None
+
+    def close(self):
+        for name in COLUMNAR_TABLES:
+            self._flush(name, final=True)
+            self._writers[name].close()
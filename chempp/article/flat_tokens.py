@@ -0,0 +1,97 @@
+"""
+# Author: Yinghao Li
+# Modified: June 15th, 2024
+# ---------------------------------------
+# Description: Flat token and offset arrays of article sentences for batching
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Iterable
+
+from .paragraph import Sentence
+
+__all__ = ["FlatTokens", "flatten_sentences"]
+
+
+@dataclass
+class FlatTokens:
+    """
+    Tokens of a sequence of sentences in flat arrays.
+
+    The tokens of sentence i are `token_ids[sent_bounds[i]:sent_bounds[i + 1]]`,
+    which index into the table of distinct token strings `token_table`.
+    `token_offsets` holds the character (start, end) of each token in its sentence, or (-1, -1)
+    if the token does not appear verbatim in the sentence (e.g., quotes normalized by the tokenizer).
+    Sentence i belongs to the section `section_table[section_ids[i]]` at the sentence index `sent_idxs[i]`.
+    """
+
+    token_table: list[str]
+    token_ids: np.ndarray
+    token_offsets: np.ndarray
+    sent_bounds: np.ndarray
+    section_table: list[str]
+    section_ids: np.ndarray
+    sent_idxs: np.ndarray
+
+    def __len__(self):
+        return len(self.section_ids)
+
+    @property
+    def n_tokens(self):
+        return len(self.token_ids)
+
+    def sentence_tokens(self, idx: int) -> list[str]:
+        """
+        The tokens of the idx-th sentence
+        """
+        return [self.token_table[i] for i in self.token_ids[self.sent_bounds[idx] : self.sent_bounds[idx + 1]]]
+
+    def inst_id(self, idx: int) -> tuple[str, int]:
+        """
+        The (section id, sentence idx) of the idx-th sentence, as in `Article.get_sentences_and_tokens`
+        """
+        return self.section_table[self.section_ids[idx]], int(self.sent_idxs[idx])
+
+
+def flatten_sentences(sentences: Iterable[tuple[str, int, Sentence]]) -> FlatTokens:
+    """
+    Collect the tokens of sentences into flat arrays
+
+    Parameters
+    ----------
+    sentences: (section id, sentence idx, sentence) tuples, as yielded by `Article.iter_sentences`
+
+    Returns
+    -------
+    FlatTokens
+    """
+    import textspan
+
+    token_to_id = dict()
+    token_ids = list()
+    token_offsets = list()
+    sent_bounds = [0]
+    section_to_id = dict()
+    section_ids = list()
+    sent_idxs = list()
+
+    for sec_id, sent_idx, sent in sentences:
+        tokens = sent.tokens
+        for token in tokens:
+            token_ids.append(token_to_id.setdefault(token, len(token_to_id)))
+        for spans in textspan.get_original_spans(tokens, sent.text):
+            token_offsets.append((spans[0][0], spans[-1][-1]) if spans else (-1, -1))
+        sent_bounds.append(len(token_ids))
+        section_ids.append(section_to_id.setdefault(sec_id, len(section_to_id)))
+        sent_idxs.append(sent_idx)
+
+    return FlatTokens(
+        token_table=list(token_to_id),
+        token_ids=np.array(token_ids, dtype=np.int32),
+        token_offsets=np.array(token_offsets, dtype=np.int32).reshape(-1, 2),
+        sent_bounds=np.array(sent_bounds, dtype=np.int32),
+        section_table=list(section_to_id),
+        section_ids=np.array(section_ids, dtype=np.int32),
+        sent_idxs=np.array(sent_idxs, dtype=np.int32),
+    )
@@ -0,0 +1,273 @@
+"""
+# Author: Yinghao Li
+# Modified: June 15th, 2024
+# ---------------------------------------
+# Description: String-builder HTML rendering of articles and paginated multi-article reports
+"""
+
+import os
+import html
+import os.path as osp
+
+from chempp.utils import DEFAULT_HTML_STYLE
+
+__all__ = ["highlight_spans", "render_paragraph_html", "render_article_html", "save_html_report"]
+
+
+def render_paragraph_html(
+    para,
+    tags_to_highlight: list[str] = None,
+    tags_to_present: list[str] = None,
+    mark_id_prefix: str = "",
+    inst_idx: int = 0,
+) -> tuple[str, list[tuple[str, str]], int]:
+    """
+    Render the escaped text of a paragraph with the annotated spans of the highlighted tags marked
+
+    Parameters
+    ----------
+    para: the paragraph
+    tags_to_highlight: annotation tags to be highlighted
+    tags_to_present: highlighted tags whose spans are listed in the results
+    mark_id_prefix: prefix of the mark ids, to keep them unique among articles on one page
+    inst_idx: index of the next group of marks
+
+    Returns
+    -------
+    the marked HTML, the (span text, mark id) pairs to present, and the index of the next group of marks
+    """
+    text = para.text
+    marks = list()
+    presented = list()
+    for tag in tags_to_highlight or []:
+        spans = sorted(para.get_anno_by_value(tag).keys())
+        if not spans:
+            continue
+        for i, (s, e) in enumerate(spans):
+            mark_id = f"{mark_id_prefix}$@${inst_idx}-{2 * i + 1}"
+            marks.append((s, e, tag, mark_id))
+            if tags_to_present and tag in tags_to_present:
+                presented.append((text[s:e], mark_id))
+        inst_idx += 1
+
+    return highlight_spans(text, marks), presented, inst_idx
+
+
+def highlight_spans(text: str, marks: list[tuple[int, int, str, str]]) -> str:
+    """
+    Escape the text and wrap the spans of all tags with HTML mark tags in one sweep over the span boundaries.
+
+    Nested spans become nested marks, with the longer span outside. A span crossing the end of another span
+    is split there: the inner marks are closed with the outer one and reopened after it. Only the first
+    fragment of a split span carries its id.
+
+    Parameters
+    ----------
+    text: the original text
+    marks: (start, end, tag, mark id) of the spans in the original text. The tag is used as the class
+
+    Returns
+    -------
+    Marked HTML
+    """
+    marks = [m for m in marks if m[0] < m[1]]
+    if not marks:
+        return html.escape(text, quote=False)
+
+    open_tags = [
+        f'<mark class="{html.escape(tag.lower())}" id="{html.escape(mark_id)}">' for _, _, tag, mark_id in marks
+    ]
+    reopen_tags = [f'<mark class="{html.escape(tag.lower())}">' for _, _, tag, _ in marks]
+    # at the same position, the longer span opens first and encloses the shorter ones
+    starts = sorted(range(len(marks)), key=lambda k: (marks[k][0], -marks[k][1], k))
+    ends = sorted(range(len(marks)), key=lambda k: marks[k][1])
+    boundaries = sorted({pos for s, e, _, _ in marks for pos in (s, e)})
+
+    pieces = list()
+    stack = list()
+    prev = si = ei = 0
+    for pos in boundaries:
+        if pos > prev:
+            pieces.append(html.escape(text[prev:pos], quote=False))
+            prev = pos
+
+        # close the spans ending here, together with the marks opened inside them
+        closing = set()
+        while ei < len(ends) and marks[ends[ei]][1] == pos:
+            closing.add(ends[ei])
+            ei += 1
+        reopen = list()
+        while closing:
+            k = stack.pop()
+            pieces.append("</mark>")
+            if k in closing:
+                closing.remove(k)
+            else:
+                reopen.append(k)
+        for k in reversed(reopen):
+            stack.append(k)
+            pieces.append(reopen_tags[k])
+
+        while si < len(starts) and marks[starts[si]][0] == pos:
+            stack.append(starts[si])
+            pieces.append(open_tags[starts[si]])
+            si += 1
+
+    pieces.append(html.escape(text[prev:], quote=False))
+    return "".join(pieces)
+
+
+def render_article_html(
+    article,
+    tags_to_highlight: list[str] = None,
+    tags_to_present: list[str] = None,
+    mark_id_prefix: str = "",
+) -> str:
+    """
+    Render the body of an article: the title, DOI, presented results, abstract and sections
+
+    Parameters
+    ----------
+    article: the article
+    tags_to_highlight: annotation tags to be highlighted
+    tags_to_present: highlighted tags whose spans are listed in the results
+    mark_id_prefix: prefix of the mark ids, to keep them unique among articles on one page
+
+    Returns
+    -------
+    HTML string
+    """
+    from .article import ArticleElementType
+
+    esc = html.escape
+    presented = list()
+    inst_idx = 0
+
+    abs_html = list()
+    if article.abstract:
+        txt, inst, inst_idx = render_paragraph_html(
+            article.abstract, tags_to_highlight, tags_to_present, mark_id_prefix, inst_idx
+        )
+        presented += inst
+        abs_html += ["<h2>Abstract</h2>", f"<p>{txt}</p>"]
+
+    sec_html = list()
+    for section in article.sections:
+        if section.type == ArticleElementType.SECTION_TITLE:
+            sec_html.append(f"<h2>{esc(section.content, quote=False)}</h2>")
+
+        elif section.type in [ArticleElementType.PARAGRAPH, ArticleElementType.FIGURE]:
+            txt, inst, inst_idx = render_paragraph_html(
+                section.content, tags_to_highlight, tags_to_present, mark_id_prefix, inst_idx
+            )
+            presented += inst
+            sec_html.append(f"<p>{txt}</p>")
+
+        elif section.type == ArticleElementType.TABLE:
+            sec_html.append(section.content.to_html())
+
+    result_html = list()
+    if presented:
+        result_html += ["<h2>results</h2>", "<ol>"]
+        result_html += [
+            f'<li>{esc(inst, quote=False)} <a href="#{esc(mark_id)}">[link]</a></li>' for inst, mark_id in presented
+        ]
+        result_html.append("</ol>")
+
+    title = esc(article.title.text, quote=False) if article.title else ""
+    doi = esc(str(article.doi))
+    return "\n".join(
+        [
+            f"<h1>{title}</h1>",
+            f'<p>doi:<a href="https://www.doi.org/{doi}">{doi}</a></p>',
+            '<div id="results">',
+            *result_html,
+            "</div>",
+            "<hr>",
+            '<div id="abstract">',
+            *abs_html,
+            "</div>",
+            '<div id="sections">',
+            *sec_html,
+            "</div>",
+        ]
+    )
+
+
+def render_html_page(title: str, body: str, html_style: str = None) -> str:
+    """
+    Wrap the rendered body into an HTML document
+    """
+    html_style = DEFAULT_HTML_STYLE if not html_style else html_style
+    return "\n".join(
+        [
+            "<!DOCTYPE html>",
+            "<html>",
+            "<head>",
+            '<meta charset="utf-8">',
+            f"<title>{html.escape(title, quote=False)}</title>",
+            f"<style>{html_style}</style>",
+            '<meta name="viewport" content="width=device-width, initial-scale=1">',
+            "</head>",
+            "<body>",
+            body,
+            "</body>",
+            "</html>",
+        ]
+    )
+
+
+def save_html_report(
+    articles,
+    save_dir: str,
+    page_size: int = 20,
+    html_style: str = None,
+    tags_to_highlight: list[str] = None,
+    tags_to_present: list[str] = None,
+) -> list[str]:
+    """
+    Render articles into a paginated HTML report with navigation links between the pages
+
+    Parameters
+    ----------
+    articles: iterable of articles. Only one page of articles is rendered at a time
+    save_dir: the directory of the report pages
+    page_size: number of articles per page
+    html_style: html style
+    tags_to_highlight: annotation tags to be highlighted
+    tags_to_present: highlighted tags whose spans are listed in the results of each article
+
+    Returns
+    -------
+    paths to the report pages
+    """
+    os.makedirs(save_dir, exist_ok=True)
+    page_name = "report-{:04d}.html"
+
+    def write_page(page_idx: int, bodies: list[str], is_last: bool):
+        nav = list()
+        if page_idx > 0:
+            nav.append(f'<a href="{page_name.format(page_idx - 1)}">previous</a>')
+        nav.append(f"page {page_idx + 1}")
+        if not is_last:
+            nav.append(f'<a href="{page_name.format(page_idx + 1)}">next</a>')
+        nav_html = f'<nav>{" | ".join(nav)}</nav>'
+
+        body = "\n".join([nav_html] + [f"<article>\n{b}\n</article>\n<hr>" for b in bodies] + [nav_html])
+        path = osp.join(save_dir, page_name.format(page_idx))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(render_html_page(f"Report page {page_idx + 1}", body, html_style))
+        return path
+
+    paths = list()
+    bodies = list()
+    article_idx = 0
+    for article in articles:
+        if len(bodies) == page_size:
+            paths.append(write_page(len(paths), bodies, is_last=False))
+            bodies = list()
+        bodies.append(render_article_html(article, tags_to_highlight, tags_to_present, f"a{article_idx}"))
+        article_idx += 1
+    if bodies or not paths:
+        paths.append(write_page(len(paths), bodies, is_last=True))
+    return paths
@@ -0,0 +1,110 @@
+"""
+# Author: Yinghao Li
+# Modified: June 15th, 2024
+# ---------------------------------------
+# Description: Streaming writer of many articles into one JSONL file
+"""
+
+import io
+import json
+import logging
+
+from .article import Article
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ArticleJsonlWriter"]
+
+# file extension -> compression
+JSONL_COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+
+def open_compressed(file_path: str, mode: str, compression: str):
+    """
+    Open a binary file compressed with `compression` ("gzip", "bz2" or "xz")
+    """
+    if compression == "gzip":
+        import gzip
+
+        return gzip.open(file_path, mode)
+    elif compression == "bz2":
+        import bz2
+
+        return bz2.open(file_path, mode)
+    elif compression == "xz":
+        import lzma
+
+        return lzma.open(file_path, mode)
+    raise ValueError(f"Unknown compression {compression}! Choose from {list(JSONL_COMPRESSIONS.values())}")
+
+
+class ArticleJsonlWriter:
+    """
+    Write articles to one JSONL file, one record per line.
+    Each line is byte-identical to the content of the file written by `Article.save_jsonl`.
+
+    Parameters
+    ----------
+    save_path: path to the JSONL file
+    compression: "gzip", "bz2" or "xz". Inferred from the extension of `save_path` if "infer"; None to disable
+    append: whether to append to an existing file. Compressed files are appended as new streams
+    buffer_size: size of the write buffer in bytes
+    """
+
+    def __init__(self, save_path: str, compression: str = "infer", append: bool = False, buffer_size: int = 2**20):
+        if compression == "infer":
+            compression = next((c for ext, c in JSONL_COMPRESSIONS.items() if save_path.endswith(ext)), None)
+        mode = "ab" if append else "wb"
+        if compression is None:
+            self._stream = open(save_path, mode, buffering=buffer_size)
+        else:
+            self._stream = io.BufferedWriter(open_compressed(save_path, mode, compression), buffer_size=buffer_size)
+        self._n_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def n_written(self):
+        return self._n_written
+
+    def write(self, article: Article):
+        """
+        Append an article record to the file
+
+        Parameters
+        ----------
+        article: the article to write
+
+        Returns
+        -------
+        self
+        """
+        line = json.dumps(article.to_jsonl_record(), ensure_ascii=False)
+        self._stream.write(line.encode("utf-8"))
+        self._stream.write(b"\n")
+        self._n_written += 1
+        return self
+
+    def write_many(self, articles):
+        """
+        Append the records of articles to the file
+
+        Parameters
+        ----------
+        articles: iterable of articles
+
+        Returns
+        -------
+        self
+        """
+        for article in articles:
+            self.write(article)
+        return self
+
+    def close(self):
+        # closing the buffered stream flushes it and closes the underlying file
+        self._stream.close()
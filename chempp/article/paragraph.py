@@ -6,20 +6,131 @@
 """
 
 import copy
+import bisect
 import logging
-import functools
+import operator
+from array import array
+from collections.abc import Mapping
 from typing import Callable
 
 from seqlbtoolkit.training.eval import Metric
 
+from .tokenizer import Tokenizer, get_tokenizer
+from .anno_index import AnnotationIndex
+from chempp.utils import SlotPickleMixin
+
 logger = logging.getLogger(__name__)
 
-__all__ = ["Sentence", "Paragraph", "DEFAULT_ANNO_SOURCE"]
+__all__ = ["Sentence", "Paragraph", "DEFAULT_ANNO_SOURCE", "tokenize_paragraphs"]
 
 DEFAULT_ANNO_SOURCE = "<DEFAULT>"
 
 
-class Sentence:
+def merge_anno_sources(annos: dict[str, dict[tuple[int, int], str]]) -> dict[tuple[int, int], str]:
+    merged = dict()
+    for src, anno in annos.items():
+        for span, v in anno.items():
+            if span not in merged:
+                merged[span] = v
+    return merged
+
+
+def merge_overlapping_spans(anno: dict[tuple[int, int], str]) -> dict[tuple[int, int], str]:
+    """
+    Merge overlapping spans with the same label with a sort-and-sweep pass.
+    Adjacent spans are not merged. If spans with different labels are merged into the same span,
+    the label whose first span comes later wins.
+
+    Parameters
+    ----------
+    anno: span -> label
+
+    Returns
+    -------
+    merged span -> label, sorted by spans
+    """
+    lb_to_spans = dict()
+    for (s, e), lb in sorted(anno.items()):
+        if e <= s:
+            raise ValueError(f"Empty annotation span: {(s, e)}")
+        spans = lb_to_spans.setdefault(lb, list())
+        # spans are sorted by their starts, so the last merged span of the label is the only one to check
+        if spans and s < spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], e)
+        else:
+            spans.append([s, e])
+
+    merged = dict()
+    for lb, spans in lb_to_spans.items():
+        for s, e in spans:
+            merged[s, e] = lb
+    return dict(sorted(merged.items()))
+
+
+class CharToSentenceMap(Mapping):
+    """
+    Read-only mapping from character indices to sentence indices, backed by arrays of sentence offsets.
+    Takes O(#sentences) memory and O(log #sentences) per lookup.
+
+    Characters at the end offset of a sentence (e.g., the whitespace between sentences) are not mapped,
+    same as the per-character dict it replaces.
+    """
+
+    __slots__ = ("_starts", "_ends", "_sent_ids")
+
+    def __init__(self, sentences: list["Sentence"], text_len: int):
+        self._starts = array("q")
+        self._ends = array("q")
+        self._sent_ids = array("q")
+
+        # the first character that may belong to the current sentence;
+        # the character at the end offset of the previous sentence is skipped
+        first_char_idx = 0
+        for sent_idx, sent in enumerate(sentences):
+            if sent.end_idx < first_char_idx:
+                # no later character is mapped after a degenerate sentence
+                break
+            start_idx = max(sent.start_idx, first_char_idx)
+            end_idx = min(sent.end_idx, text_len)
+            if start_idx < end_idx:
+                self._starts.append(start_idx)
+                self._ends.append(end_idx)
+                self._sent_ids.append(sent_idx)
+            first_char_idx = sent.end_idx + 1
+
+    def __getitem__(self, char_idx: int) -> int:
+        try:
+            char_idx = operator.index(char_idx)
+        except TypeError:
+            raise KeyError(char_idx)
+        i = bisect.bisect_right(self._starts, char_idx) - 1
+        if i < 0 or char_idx >= self._ends[i]:
+            raise KeyError(char_idx)
+        return self._sent_ids[i]
+
+    def __iter__(self):
+        for start_idx, end_idx in zip(self._starts, self._ends):
+            yield from range(start_idx, end_idx)
+
+    def __len__(self):
+        return sum(end_idx - start_idx for start_idx, end_idx in zip(self._starts, self._ends))
+
+
+class Sentence(SlotPickleMixin):
+    __slots__ = (
+        "_text",
+        "_buffer",
+        "_buffer_start",
+        "_buffer_end",
+        "_tokens",
+        "_anno",
+        "_all_anno",
+        "_anno_index",
+        "start_idx",
+        "end_idx",
+        "grouped_anno",
+        "_word_tokenizer",
+    )
 
     def __init__(
         self,
@@ -31,8 +142,13 @@ class Sentence:
         word_tokenizer: Callable = None,
     ):
         self._text = text
+        self._buffer: str | None = None
+        self._buffer_start: int | None = None
+        self._buffer_end: int | None = None
         self._tokens: list[str] | None = None
         self._anno = anno
+        self._all_anno = None
+        self._anno_index = None
         self.start_idx = start_idx
         self.end_idx = end_idx
         self.grouped_anno = grouped_anno
@@ -49,32 +165,96 @@ class Sentence:
             self._anno = {DEFAULT_ANNO_SOURCE: self._anno}
         if self.grouped_anno is None:
             self.grouped_anno = list()
-        self._tokens = self.word_tokenizer() if not self._word_tokenizer else self._word_tokenizer(self._text)
+        # tokens are computed on first access
+        self._tokens = None
+
+    @classmethod
+    def from_columns(
+        cls,
+        text: str,
+        start_idx: int,
+        tokens: list[str] | None,
+        anno: dict[str, dict[tuple[int, int], str]] | None,
+    ) -> "Sentence":
+        """
+        Create a sentence from deserialized columns, skipping the input normalization of `__init__`
+        """
+        sent = cls.__new__(cls)
+        sent._text = text
+        sent._buffer = sent._buffer_start = sent._buffer_end = None
+        sent._tokens = tokens
+        sent._anno = anno if anno is not None else {DEFAULT_ANNO_SOURCE: dict()}
+        sent._all_anno = None
+        sent._anno_index = None
+        sent.start_idx = start_idx
+        sent.end_idx = start_idx + len(text)
+        sent.grouped_anno = list()
+        sent._word_tokenizer = None
+        return sent
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # annotation indices are rebuilt on demand
+        state.pop("_all_anno", None)
+        state.pop("_anno_index", None)
+        return state
+
+    def __setstate__(self, state):
+        self._buffer = self._buffer_start = self._buffer_end = None
+        self.reset_anno_index()
+        super().__setstate__(state)
+
+    def set_text_view(self, buffer: str, start: int):
+        """
+        Replace the text with a view of `buffer` from `start`, which must hold the same text.
+        The text is sliced from the buffer when it is accessed.
+        """
+        end = start + len(self.text)
+        self._buffer = buffer
+        self._buffer_start = start
+        self._buffer_end = end
+        self._text = None
+        return self
+
+    @property
+    def text_buffer(self) -> str | None:
+        """
+        The text buffer the sentence is a view of; None if the sentence keeps its own text
+        """
+        return self._buffer
+
+    @property
+    def buffer_offset(self) -> int | None:
+        """
+        The offset of the sentence in its text buffer; None if the sentence keeps its own text
+        """
+        return self._buffer_start
 
     def word_tokenizer(self, text=None) -> list[str]:
         if text is None:
-            text = self._text
-        # from chemdataextractor.nlp.tokenize import ChemWordTokenizer
-        import nltk
-
-        # cwt = ChemWordTokenizer()
-        # tokens = cwt.tokenize(text)
-        tokens = nltk.word_tokenize(text)
+            text = self.text
+        # other backends (e.g., ChemWordTokenizer of chemdataextractor) can be registered with `register_tokenizer`
+        tokens = get_tokenizer().word_tokenize(text)
 
         return tokens
 
     @property
     def text(self):
+        if self._buffer is not None:
+            return self._buffer[self._buffer_start : self._buffer_end]
         return self._text
 
     @text.setter
     def text(self, text_: str):
         self._text = text_
+        self._buffer = self._buffer_start = self._buffer_end = None
         self._post_init()
         logger.warning("Text has been changed! Annotations may no longer be valid")
 
     @property
     def tokens(self):
+        if self._tokens is None:
+            self._tokens = self.word_tokenizer() if not self._word_tokenizer else self._word_tokenizer(self.text)
         return self._tokens
 
     @tokens.setter
@@ -91,14 +271,39 @@ class Sentence:
         return self.anno[DEFAULT_ANNO_SOURCE]
 
     @property
-    @functools.lru_cache(maxsize=None)
     def all_anno(self):
-        annos = dict()
-        for src, anno in self.anno.items():
-            for span, v in anno.items():
-                if span not in annos.keys():
-                    annos[span] = v
-        return annos
+        """
+        Annotations of all sources; for spans annotated by multiple sources, the first source wins.
+        The index is kept in sync by the `anno` setter and the annotation update methods;
+        call `reset_anno_index` after modifying the `anno` dicts in place.
+        """
+        if self._all_anno is None:
+            self._all_anno = merge_anno_sources(self._anno)
+        return self._all_anno
+
+    @property
+    def anno_index(self) -> AnnotationIndex:
+        """
+        Index of `all_anno` for label, range and overlap queries
+        """
+        if self._anno_index is None:
+            self._anno_index = AnnotationIndex(self.all_anno)
+        return self._anno_index
+
+    def reset_anno_index(self):
+        self._all_anno = None
+        self._anno_index = None
+        return self
+
+    def _add_anno_span(self, src: str, span: tuple[int, int], value: str):
+        self._anno[src][span] = value
+        self._anno_index = None
+        if self._all_anno is not None:
+            if span not in self._all_anno:
+                self._all_anno[span] = value
+            else:
+                # another source may have a higher priority
+                self._all_anno = None
 
     @anno.setter
     def anno(self, anno_: dict[str, dict] | dict[tuple[int, int], str]):
@@ -111,10 +316,7 @@ class Sentence:
                 raise ValueError("Unknown annotation type!")
         else:
             logger.warning("Input annotation is emtpy!")
-        try:
-            delattr(self, "all_anno")
-        except Exception:
-            pass
+        self.reset_anno_index()
 
     def __str__(self):
         return self.text
@@ -126,39 +328,39 @@ class Sentence:
         return self.tokens[item]
 
     def get_anno_with_value(self, value: list[str] | str):
-        if isinstance(value, str):
-            value = [value]
-        filtered_dict = dict(filter(lambda item: item[1] in value, self.all_anno.items()))
-        return filtered_dict
+        return self.anno_index.with_label(value)
+
+    def get_anno_in_range(self, start: int, end: int):
+        return self.anno_index.in_range(start, end)
+
+    def get_anno_overlapping(self, start: int, end: int):
+        return self.anno_index.overlapping(start, end)
 
     def remove_anno_overlaps(self):
         updated_dict = dict()
         for src in self.anno.keys():
-            sorted_dict = dict(sorted(self.anno[src].items()))
-            lb_span_dict = dict()
-            for span, lb in sorted_dict.items():
-
-                span_set = set(range(span[0], span[1]))
-                if lb not in lb_span_dict:
-                    lb_span_dict[lb] = [span_set]
-                elif lb_span_dict[lb][-1] & span_set:
-                    if span_set - lb_span_dict[lb][-1]:
-                        lb_span_dict[lb][-1] = lb_span_dict[lb][-1] | span_set
-                else:
-                    lb_span_dict[lb].append(span_set)
-
-            tmp_dict = dict()
-            for lb, span_sets in lb_span_dict.items():
-                for span_set in span_sets:
-                    tmp_dict[min(span_set), max(span_set) + 1] = lb
-
-            updated_dict[src] = dict(sorted(tmp_dict.items()))
+            updated_dict[src] = merge_overlapping_spans(self.anno[src])
 
         self.anno = updated_dict
         return self
 
 
-class Paragraph:
+class Paragraph(SlotPickleMixin):
+    __slots__ = (
+        "_text",
+        "_buffer",
+        "_buffer_start",
+        "_buffer_end",
+        "_tokens",
+        "_anno",
+        "_all_anno",
+        "_anno_index",
+        "_sentences",
+        "grouped_anno",
+        "_char_idx_to_sent_idx",
+        "_sent_tokenizer",
+    )
+
     def __init__(
         self,
         text: str = None,
@@ -168,6 +370,9 @@ class Paragraph:
         sent_tokenizer: Callable = None,
     ):
         self._text = text
+        self._buffer: str | None = None
+        self._buffer_start: int | None = None
+        self._buffer_end: int | None = None
         self._tokens: list[str] | None = None
 
         if anno is None:
@@ -176,28 +381,21 @@ class Paragraph:
             self._anno = {DEFAULT_ANNO_SOURCE: anno}
         else:
             self._anno = anno
+        self._all_anno = None
+        self._anno_index = None
 
-        self.sentences = sentences
+        self._sentences = sentences
         self.grouped_anno = grouped_anno if grouped_anno is not None else list()
-        self.char_idx_to_sent_idx = dict()
+        self._char_idx_to_sent_idx = None
         self._sent_tokenizer = sent_tokenizer
         self._post_init()
 
     def _post_init(self):
-        if self.sentences is None:
-            sents = self.sentence_tokenizer() if self._sent_tokenizer is None else self._sent_tokenizer(self._text)
-            self.sentences = list()
-
-            s_idx = 0
-            for sent in sents:
-                self.sentences.append(Sentence(sent, s_idx, s_idx + len(sent)))
-                s_idx += len(sent) + 1
-
-            self._text = " ".join(sents)
-
-            self.update_sentence_anno()
+        self._tokens = None
+        self._char_idx_to_sent_idx = None
 
-        else:
+        # otherwise, sentences are split on first access to `text`, `sentences` or `tokens`
+        if self._sentences is not None:
             assert len(self.sentences) > 0, AttributeError("Assigning empty list to `sentences` is not allowed")
 
             start_idx = 0
@@ -209,18 +407,97 @@ class Paragraph:
 
             self.update_paragraph_anno()
 
-        self._tokens = [s.tokens for s in self.sentences]
+    def _split_sentences(self, sents: list[str] = None):
+        if sents is None:
+            sents = self.sentence_tokenizer() if self._sent_tokenizer is None else self._sent_tokenizer(self._text)
+        self._sentences = list()
 
-        if not self.char_idx_to_sent_idx:
-            self._set_char_idx_to_sent_idx()
+        s_idx = 0
+        for sent in sents:
+            self._sentences.append(Sentence(sent, s_idx, s_idx + len(sent)))
+            s_idx += len(sent) + 1
+
+        self._text = " ".join(sents)
+
+        self.update_sentence_anno()
 
     def _set_char_idx_to_sent_idx(self):
-        sent_idx = 0
-        for char_idx in range(len(self.text)):
-            if self.sentences[sent_idx].start_idx <= char_idx < self.sentences[sent_idx].end_idx:
-                self.char_idx_to_sent_idx[char_idx] = sent_idx
-            elif char_idx == self.sentences[sent_idx].end_idx:
-                sent_idx += 1
+        self._char_idx_to_sent_idx = CharToSentenceMap(self.sentences, len(self.text))
+
+    def __setstate__(self, state):
+        # paragraphs pickled before sentences were split lazily
+        if "sentences" in state:
+            state["_sentences"] = state.pop("sentences")
+        # the per-character dicts of paragraphs pickled before `CharToSentenceMap` are rebuilt on demand
+        state.pop("char_idx_to_sent_idx", None)
+        state.pop("_char_idx_to_sent_idx", None)
+        self._char_idx_to_sent_idx = None
+        self._buffer = self._buffer_start = self._buffer_end = None
+        self.reset_anno_index()
+        super().__setstate__(state)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # annotation indices are rebuilt on demand
+        state.pop("_all_anno", None)
+        state.pop("_anno_index", None)
+        state.pop("_char_idx_to_sent_idx", None)
+        return state
+
+    @property
+    def sentences(self):
+        if self._sentences is None:
+            self._split_sentences()
+        return self._sentences
+
+    @sentences.setter
+    def sentences(self, sentences_: list[Sentence]):
+        self._sentences = sentences_
+        self._char_idx_to_sent_idx = None
+
+    @property
+    def char_idx_to_sent_idx(self) -> "CharToSentenceMap":
+        if self._char_idx_to_sent_idx is None:
+            self._set_char_idx_to_sent_idx()
+        return self._char_idx_to_sent_idx
+
+    @property
+    def is_empty(self):
+        """
+        Whether the paragraph has no text. Does not split the sentences if they are not split yet.
+        """
+        if self._sentences is None:
+            # the sentence tokenizer returns no sentence only for blank text
+            return not self._text or self._text.isspace()
+        return not self.text
+
+    def set_text_view(self, buffer: str, start: int):
+        """
+        Replace the text of the paragraph and its sentences with views of `buffer` from `start`,
+        which must hold the same text. The texts are sliced from the buffer when they are accessed.
+        """
+        end = start + len(self.text)
+        for sent in self.sentences:
+            sent.set_text_view(buffer, start + sent.start_idx)
+        self._buffer = buffer
+        self._buffer_start = start
+        self._buffer_end = end
+        self._text = None
+        return self
+
+    @property
+    def text_buffer(self) -> str | None:
+        """
+        The text buffer the paragraph is a view of; None if the paragraph keeps its own text
+        """
+        return self._buffer
+
+    @property
+    def buffer_offset(self) -> int | None:
+        """
+        The offset of the paragraph in its text buffer; None if the paragraph keeps its own text
+        """
+        return self._buffer_start
 
     def get_sentence_by_char_idx(self, char_idx: int):
         sent_idx = self.char_idx_to_sent_idx[char_idx]
@@ -230,31 +507,29 @@ class Paragraph:
     def sentence_tokenizer(self, text=None):
         if text is None:
             text = self._text
-        # from chemdataextractor.doc import Paragraph as CDEParagraph
-
-        # para = CDEParagraph(text)
-
-        # sents = list()
-        # for sent in para.sentences:
-        #     sents.append(sent.text)
-        import nltk
-
-        sents = nltk.sent_tokenize(text)
+        sents = get_tokenizer().sent_tokenize(text)
 
         return sents
 
     @property
     def text(self):
+        if self._buffer is not None:
+            return self._buffer[self._buffer_start : self._buffer_end]
+        if self._sentences is None:
+            self._split_sentences()
         return self._text
 
     @text.setter
     def text(self, text_: str):
         self._text = text_
+        self._buffer = self._buffer_start = self._buffer_end = None
         self._post_init()
         logger.warning("Text has been changed! Annotations may no longer be valid")
 
     @property
     def tokens(self):
+        if self._tokens is None:
+            self._tokens = [s.tokens for s in self.sentences]
         return self._tokens
 
     @tokens.setter
@@ -271,14 +546,39 @@ class Paragraph:
         return self.anno[DEFAULT_ANNO_SOURCE]
 
     @property
-    @functools.lru_cache(maxsize=None)
     def all_anno(self):
-        annos = dict()
-        for src, anno in self.anno.items():
-            for span, v in anno.items():
-                if span not in annos.keys():
-                    annos[span] = v
-        return annos
+        """
+        Annotations of all sources; for spans annotated by multiple sources, the first source wins.
+        The index is kept in sync by the `anno` setter and the annotation update methods;
+        call `reset_anno_index` after modifying the `anno` dicts in place.
+        """
+        if self._all_anno is None:
+            self._all_anno = merge_anno_sources(self._anno)
+        return self._all_anno
+
+    @property
+    def anno_index(self) -> AnnotationIndex:
+        """
+        Index of `all_anno` for label, range and overlap queries
+        """
+        if self._anno_index is None:
+            self._anno_index = AnnotationIndex(self.all_anno)
+        return self._anno_index
+
+    def reset_anno_index(self):
+        self._all_anno = None
+        self._anno_index = None
+        return self
+
+    def _add_anno_span(self, src: str, span: tuple[int, int], value: str):
+        self._anno[src][span] = value
+        self._anno_index = None
+        if self._all_anno is not None:
+            if span not in self._all_anno:
+                self._all_anno[span] = value
+            else:
+                # another source may have a higher priority
+                self._all_anno = None
 
     @anno.setter
     def anno(self, anno_: dict[str, dict] | dict[tuple[int, int], str]):
@@ -291,10 +591,7 @@ class Paragraph:
                 raise ValueError("Unknown annotation type!")
         else:
             logger.warning("Input annotation is emtpy!")
-        try:
-            delattr(self, "all_anno")
-        except Exception:
-            pass
+        self.reset_anno_index()
 
     def align_anno(self):
         """
@@ -312,7 +609,7 @@ class Paragraph:
                         self.anno[src] = dict()
                     for (s, e), v in anno.items():
                         if (s + sent.start_idx, e + sent.start_idx) not in self.anno[src]:
-                            self.anno[src][(s + sent.start_idx, e + sent.start_idx)] = v
+                            self._add_anno_span(src, (s + sent.start_idx, e + sent.start_idx), v)
         elif isinstance(sent_idx, int):
             sent = self.sentences[sent_idx]
             for src, anno in sent.anno.items():
@@ -320,32 +617,30 @@ class Paragraph:
                     self.anno[src] = dict()
                 for (s, e), v in anno.items():
                     if (s + sent.start_idx, e + sent.start_idx) not in self.anno[src]:
-                        self.anno[src][(s + sent.start_idx, e + sent.start_idx)] = v
+                        self._add_anno_span(src, (s + sent.start_idx, e + sent.start_idx), v)
         else:
             raise ValueError(f"Unsupported index type: {type(sent_idx)}")
 
         return self
 
     def update_sentence_anno(self):
-        if not self.char_idx_to_sent_idx:
-            self._set_char_idx_to_sent_idx()
-
         for src, anno in self.anno.items():
             for (s, e), v in anno.items():
                 sent_idx = self.char_idx_to_sent_idx[s]
                 sent_s = s - self[sent_idx].start_idx
                 sent_e = e - self[sent_idx].start_idx
 
-                if src not in self[sent_idx]:
+                if src not in self[sent_idx].anno:
                     self[sent_idx].anno[src] = dict()
+                    self[sent_idx].reset_anno_index()
 
                 if sent_e > self[sent_idx].end_idx:
                     logger.warning("Encountered multi-sentence annotation span. Will split.")
-                    self[sent_idx].anno[src][(sent_s, self[sent_idx].end_idx)] = v
-                    self[sent_idx + 1].anno[src][(0, e - self[sent_idx + 1].start_idx)] = v
+                    self[sent_idx]._add_anno_span(src, (sent_s, self[sent_idx].end_idx), v)
+                    self[sent_idx + 1]._add_anno_span(src, (0, e - self[sent_idx + 1].start_idx), v)
 
                 elif (sent_s, sent_e) not in self[sent_idx].anno[src]:
-                    self[sent_idx].anno[src][(sent_s, sent_e)] = v
+                    self[sent_idx]._add_anno_span(src, (sent_s, sent_e), v)
         return self
 
     def update_paragraph_anno_group(self, sent_idx: int = None):
@@ -407,33 +702,52 @@ class Paragraph:
         return self.sentences[item]
 
     def get_anno_by_value(self, value: list[str] | str):
-        if isinstance(value, str):
-            value = [value]
-        filtered_dict = dict(filter(lambda item: item[1] in value, self.all_anno.items()))
-        return filtered_dict
+        return self.anno_index.with_label(value)
+
+    def get_anno_in_range(self, start: int, end: int):
+        return self.anno_index.in_range(start, end)
+
+    def get_anno_overlapping(self, start: int, end: int):
+        return self.anno_index.overlapping(start, end)
 
     def remove_anno_overlaps(self):
         updated_dict = dict()
         for src in self.anno.keys():
-            sorted_dict = dict(sorted(self.anno[src].items()))
-            lb_span_dict = dict()
-            for span, lb in sorted_dict.items():
-
-                span_set = set(range(span[0], span[1]))
-                if lb not in lb_span_dict:
-                    lb_span_dict[lb] = [span_set]
-                elif lb_span_dict[lb][-1] & span_set:
-                    if span_set - lb_span_dict[lb][-1]:
-                        lb_span_dict[lb][-1] = lb_span_dict[lb][-1] | span_set
-                else:
-                    lb_span_dict[lb].append(span_set)
-
-            tmp_dict = dict()
-            for lb, span_sets in lb_span_dict.items():
-                for span_set in span_sets:
-                    tmp_dict[min(span_set), max(span_set) + 1] = lb
-
-            updated_dict[src] = dict(sorted(tmp_dict.items()))
+            updated_dict[src] = merge_overlapping_spans(self.anno[src])
 
         self.anno = updated_dict
         return self
+
+
+def tokenize_paragraphs(
+    paragraphs: list[Paragraph], sentences: list[Sentence] = None, tokenizer: Tokenizer | str = None
+) -> int:
+    """
+    Split the sentences and tokenize the words of multiple paragraphs and sentences with one tokenizer call each.
+    Paragraphs and sentences that are already tokenized or have their own tokenizer functions are left as they are.
+
+    Parameters
+    ----------
+    paragraphs: paragraphs to tokenize
+    sentences: stand-alone sentences (e.g., article titles) to tokenize
+    tokenizer: `Tokenizer` instance or name of a registered backend. Defaults to the default backend
+
+    Returns
+    -------
+    the number of sentences in the paragraphs and stand-alone sentences
+    """
+    if not isinstance(tokenizer, Tokenizer):
+        tokenizer = get_tokenizer(tokenizer)
+
+    untokenized_paras = [p for p in paragraphs if p._sentences is None and p._sent_tokenizer is None]
+    sents_list = tokenizer.sent_tokenize_batch([p._text for p in untokenized_paras])
+    for para, sents in zip(untokenized_paras, sents_list):
+        para._split_sentences(sents)
+
+    sentences = [s for p in paragraphs for s in p.sentences] + (list(sentences) if sentences else list())
+    untokenized_sents = [s for s in sentences if s._tokens is None and s._word_tokenizer is None]
+    tokens_list = tokenizer.word_tokenize_batch([s.text for s in untokenized_sents])
+    for sent, tokens in zip(untokenized_sents, tokens_list):
+        sent._tokens = tokens
+
+    return len(sentences)
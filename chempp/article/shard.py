@@ -0,0 +1,277 @@
+"""
+# Author: Yinghao Li
+# Modified: June 15th, 2024
+# ---------------------------------------
+# Description: Append-only shard store of binary articles with a DOI index
+"""
+
+import os
+import mmap
+import struct
+import logging
+import os.path as osp
+
+from .article import Article
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ShardWriter", "ShardReader", "SHARD_INDEX_NAME"]
+
+SHARD_INDEX_NAME = "index.tsv"
+SHARD_NAME = "shard-{:05d}.bin"
+# the length of the record that follows
+RECORD_HEADER = struct.Struct("<Q")
+
+
+def _read_index(store_dir: str) -> dict[str, tuple[int, int, int]]:
+    index = dict()
+    index_path = osp.join(store_dir, SHARD_INDEX_NAME)
+    if not osp.exists(index_path):
+        return index
+    with open(index_path, "r", encoding="utf-8") as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            # skip the partial line of an interrupted write
+            if len(fields) != 4:
+                continue
+            doi, shard_idx, offset, length = fields
+            # later records of the same DOI replace the earlier ones
+            index[doi] = (int(shard_idx), int(offset), int(length))
+    return index
+
+
+def _truncate_index(store_dir: str):
+    """
+    Drop the partial last line of an index file left by an interrupted write, so that new lines are not appended to it
+    """
+    index_path = osp.join(store_dir, SHARD_INDEX_NAME)
+    if not osp.exists(index_path):
+        return
+    with open(index_path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        # walk back in chunks to the last line break
+        while pos > 0:
+            chunk_start = max(pos - 4096, 0)
+            f.seek(chunk_start)
+            chunk = f.read(pos - chunk_start)
+            if pos == end and chunk.endswith(b"\n"):
+                return
+            line_break = chunk.rfind(b"\n")
+            if line_break >= 0:
+                pos = chunk_start + line_break + 1
+                break
+            pos = chunk_start
+        f.truncate(pos)
+
+
+def _recover_shard(
+    store_dir: str, shard_idx: int, index: dict[str, tuple[int, int, int]]
+) -> list[tuple[str, int, int]]:
+    """
+    Truncate a shard back to the end of its last complete record, dropping the partial record of an interrupted write.
+
+    The records up to the end of the last indexed one are complete. The records after it are checked by decoding them;
+    complete ones are kept, as their index lines are lost.
+
+    Returns
+    -------
+    (DOI, offset, length) of the kept records that are not in the index
+    """
+    shard_path = osp.join(store_dir, SHARD_NAME.format(shard_idx))
+    if not osp.exists(shard_path):
+        return list()
+    size = osp.getsize(shard_path)
+    pos = max((offset + length for idx, offset, length in index.values() if idx == shard_idx), default=0)
+
+    recovered = list()
+    with open(shard_path, "rb+") as f:
+        f.seek(pos)
+        while pos + RECORD_HEADER.size <= size:
+            (length,) = RECORD_HEADER.unpack(f.read(RECORD_HEADER.size))
+            if pos + RECORD_HEADER.size + length > size:
+                break
+            try:
+                doi = Article().from_binary(f.read(length)).doi
+            except Exception:
+                break
+            recovered.append((doi, pos + RECORD_HEADER.size, length))
+            pos += RECORD_HEADER.size + length
+
+        if pos < size:
+            logger.warning(f"Truncating the incomplete record at the end of shard {shard_idx} ({size - pos} bytes).")
+            f.truncate(pos)
+    return recovered
+
+
+class ShardWriter:
+    """
+    Append binary-encoded articles (see `Article.to_binary`) to large shard files in a directory,
+    instead of writing one small file per article.
+
+    Each record is its length followed by the encoded article. A shard is closed once it exceeds `shard_size`
+    bytes and the next record starts a new shard. After each record, a line of `DOI, shard, offset, length`
+    is appended to the tab-separated index file `index.tsv`; opening an existing store appends to it,
+    after truncating the partial record and index line left by an interrupted write.
+    """
+
+    def __init__(self, store_dir: str, shard_size: int = 2**30, compress: bool = True):
+        self._store_dir = store_dir
+        self._shard_size = shard_size
+        self._compress = compress
+        os.makedirs(store_dir, exist_ok=True)
+
+        shard_idx = 0
+        while osp.exists(osp.join(store_dir, SHARD_NAME.format(shard_idx + 1))):
+            shard_idx += 1
+        self._shard_idx = shard_idx
+
+        _truncate_index(store_dir)
+        recovered = _recover_shard(store_dir, shard_idx, _read_index(store_dir))
+        self._shard = open(osp.join(store_dir, SHARD_NAME.format(shard_idx)), "ab")
+        self._index = open(osp.join(store_dir, SHARD_INDEX_NAME), "a", encoding="utf-8")
+        for doi, offset, length in recovered:
+            self._index.write(f"{doi}\t{shard_idx}\t{offset}\t{length}\n")
+        self._index.flush()
+        self._n_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def n_written(self):
+        return self._n_written
+
+    def write(self, article: Article) -> tuple[int, int]:
+        """
+        Append an article to the store
+
+        Parameters
+        ----------
+        article: the article to append. Its DOI is the key in the index
+
+        Returns
+        -------
+        the shard index and the offset of the encoded article in the shard
+        """
+        if not article.doi or "\t" in article.doi or "\n" in article.doi:
+            raise ValueError(f"Invalid DOI {article.doi!r} for the shard index!")
+
+        data = article.to_binary(compress=self._compress)
+        if self._shard.tell() > 0 and self._shard.tell() + RECORD_HEADER.size + len(data) > self._shard_size:
+            self._shard.close()
+            self._shard_idx += 1
+            self._shard = open(osp.join(self._store_dir, SHARD_NAME.format(self._shard_idx)), "ab")
+
+        offset = self._shard.tell() + RECORD_HEADER.size
+        self._shard.write(RECORD_HEADER.pack(len(data)))
+        self._shard.write(data)
+        # the index line is written after the record so that every indexed record is complete
+        self._shard.flush()
+        self._index.write(f"{article.doi}\t{self._shard_idx}\t{offset}\t{len(data)}\n")
+        self._index.flush()
+        self._n_written += 1
+        return self._shard_idx, offset
+
+    def close(self):
+        self._shard.close()
+        self._index.close()
+
+
+class ShardReader:
+    """
+    Read a store written by `ShardWriter`. The shards are memory-mapped on first access,
+    so looking up an article by DOI reads only its own record.
+    """
+
+    def __init__(self, store_dir: str):
+        self._store_dir = store_dir
+        self._index = _read_index(store_dir)
+        self._maps = dict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, doi: str):
+        return doi in self._index
+
+    def __getitem__(self, doi: str) -> Article:
+        return self.get(doi)
+
+    def __iter__(self):
+        return self.scan()
+
+    @property
+    def dois(self):
+        return list(self._index.keys())
+
+    def _map(self, shard_idx: int) -> memoryview:
+        if shard_idx not in self._maps:
+            with open(osp.join(self._store_dir, SHARD_NAME.format(shard_idx)), "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[shard_idx] = (mm, memoryview(mm))
+        return self._maps[shard_idx][1]
+
+    def get(self, doi: str, parts: list[str] = None) -> Article:
+        """
+        Load an article by its DOI
+
+        Parameters
+        ----------
+        doi: the DOI of the article
+        parts: the parts to load among "title", "abstract" and "sections". Load all parts if None
+
+        Returns
+        -------
+        the article
+        """
+        shard_idx, offset, length = self._index[doi]
+        return Article().from_binary(self._map(shard_idx)[offset : offset + length], parts=parts)
+
+    def scan(self, parts: list[str] = None):
+        """
+        Iterate over all records shard by shard in the order they were written, including the replaced ones
+
+        Parameters
+        ----------
+        parts: the parts to load among "title", "abstract" and "sections". Load all parts if None
+
+        Returns
+        -------
+        generator of articles
+        """
+        shard_idx = 0
+        while osp.exists(osp.join(self._store_dir, SHARD_NAME.format(shard_idx))):
+            if osp.getsize(osp.join(self._store_dir, SHARD_NAME.format(shard_idx))) == 0:
+                break
+            data = self._map(shard_idx)
+            pos = 0
+            while pos + RECORD_HEADER.size <= len(data):
+                (length,) = RECORD_HEADER.unpack_from(data, pos)
+                pos += RECORD_HEADER.size
+                if pos + length > len(data):
+                    logger.warning(f"Shard {shard_idx} ends with an incomplete record.")
+                    break
+                try:
+                    article = Article().from_binary(data[pos : pos + length], parts=parts)
+                except Exception as e:
+                    logger.warning(f"Shard {shard_idx} has an undecodable record at offset {pos}. Error: {e}")
+                    break
+                yield article
+                pos += length
+            shard_idx += 1
+
+    def close(self):
+        for mm, view in self._maps.values():
+            view.release()
+            mm.close()
+        self._maps = dict()
@@ -6,18 +6,20 @@
 """
 
 import bs4
-import copy
+import html
 import json
 import numpy as np
 
 from dataclasses import dataclass
 from bs4 import BeautifulSoup
 
-__all__ = ["TableCell", "TableRow", "Table"]
+from chempp.utils import SlotPickleMixin
 
+__all__ = ["TableCell", "TableRow", "TableGrid", "Table"]
 
-@dataclass
-class TableCell:
+
+@dataclass(slots=True)
+class TableCell(SlotPickleMixin):
     text: str
     width: int = 1
     height: int = 1
@@ -25,11 +27,14 @@ class TableCell:
     linked_left: bool = False  # judge if the current cell belongs to the left multi-column cell
 
 
-class TableRow:
+class TableRow(SlotPickleMixin):
+    __slots__ = ("_cells", "_width", "_expanded_cells")
+
     def __init__(self, cells: list[TableCell]):
         self._cells = cells
         self._width = self._get_width()
-        self._expanded_cells = self._expand_cells()
+        # expanded on first access, as `Table.format_rows` replaces most rows right after they are created
+        self._expanded_cells = None
 
     def __getitem__(self, i):
         return self.expanded_cells[i]
@@ -51,6 +56,8 @@ class TableRow:
 
     @property
     def expanded_cells(self):
+        if self._expanded_cells is None:
+            self._expanded_cells = self._expand_cells()
         return self._expanded_cells
 
     @cells.setter
@@ -58,7 +65,7 @@ class TableRow:
         new_widths = [cell.width for cell in cells]
         assert self._width == new_widths, ValueError("The width must equal to the old one!")
         self._cells = cells
-        self._expanded_cells = self._expand_cells()
+        self._expanded_cells = None
 
     @expanded_cells.setter
     def expanded_cells(self, cells):
@@ -75,28 +82,95 @@ class TableRow:
         return self.__str__()
 
     def _expand_cells(self):
+        """
+        Append a unit-width copy linked to the left for each extra column of multi-column cells
+        """
         expanded_cells = list()
-        multicolumn_cache = list()
-        cell_idx = 0
-        while True:
-            if multicolumn_cache:
-                cached_cell = copy.deepcopy(multicolumn_cache[0])
-                cached_cell.width = 1
-                cached_cell.linked_left = True
-                expanded_cells.append(cached_cell)
-                multicolumn_cache[1] -= 1
-                if multicolumn_cache[1] == 0:
-                    multicolumn_cache = list()
-            else:
-                expanded_cells.append(self._cells[cell_idx])
-                if self._cells[cell_idx].width > 1:
-                    multicolumn_cache = [self._cells[cell_idx], self._cells[cell_idx].width - 1]
-                cell_idx += 1
-            if cell_idx == len(self._cells) and not multicolumn_cache:
-                break
+        for cell in self._cells:
+            expanded_cells.append(cell)
+            for _ in range(int(cell.width) - 1):
+                expanded_cells.append(TableCell(cell.text, 1, cell.height, cell.linked_top, True))
         return expanded_cells
 
 
+class TableGrid:
+    """
+    Grid layout of a table, built in one pass from its (formatted) rows.
+
+    `cell_ids[i, j]` is the index in `cells` of the cell covering row i and column j, or -1 if no cell covers it.
+    Cells spanning several columns, or several rows through the dummy cells appended by `Table.format_rows`,
+    share the same index over their areas. `origins` marks the top-left position of each cell;
+    `row_spans` and `col_spans` mark the positions covered by a cell from the row above or the column to the left.
+    """
+
+    __slots__ = ("cells", "cell_ids", "origins", "row_spans", "col_spans")
+
+    def __init__(self, rows: list[TableRow], n_columns: int = None):
+        if n_columns is None:
+            n_columns = int(rows[0].width) if rows else 0
+        n_rows = len(rows)
+
+        self.cells = list()
+        self.cell_ids = np.full((n_rows, n_columns), -1, dtype=np.int64)
+        self.row_spans = np.zeros((n_rows, n_columns), dtype=bool)
+        self.col_spans = np.zeros((n_rows, n_columns), dtype=bool)
+
+        for i, row in enumerate(rows):
+            cells = row.cells
+            n_cells = len(cells)
+            widths = np.fromiter((cell.width for cell in cells), dtype=np.int64, count=n_cells)
+            # a cell occupies at least one column, as in `TableRow.expanded_cells`
+            widths = np.maximum(widths, 1)
+            starts = np.cumsum(widths) - widths
+            linked_top = np.fromiter((cell.linked_top for cell in cells), dtype=bool, count=n_cells)
+
+            row_ids = np.repeat(np.arange(len(self.cells), len(self.cells) + n_cells), widths)[:n_columns]
+            col_spans = np.ones(len(row_ids), dtype=bool)
+            col_spans[starts[starts < n_columns]] = False
+
+            n = len(row_ids)
+            self.cell_ids[i, :n] = row_ids
+            self.col_spans[i, :n] = col_spans
+            self.row_spans[i, :n] = np.repeat(linked_top, widths)[:n_columns]
+
+            # the dummy cells of multi-row cells point to the cells above with the same text
+            if i > 0:
+                for k in np.flatnonzero(linked_top & (starts < n_columns)):
+                    s, e = starts[k], min(starts[k] + widths[k], n_columns)
+                    above = self.cell_ids[i - 1, s]
+                    if above >= 0 and self.cells[above].text == cells[k].text:
+                        self.cell_ids[i, s:e] = self.cell_ids[i - 1, s:e]
+
+            self.cells += cells
+
+        self.origins = (self.cell_ids >= 0) & ~self.row_spans & ~self.col_spans
+
+    @property
+    def shape(self):
+        return self.cell_ids.shape
+
+    def texts(self, fill: str = "") -> list[str]:
+        """
+        Texts of `cells` followed by `fill`, so that the index -1 of empty positions maps to `fill`
+        """
+        return [cell.text for cell in self.cells] + [fill]
+
+    def to_lists(self, fill: str = "") -> list[list[str]]:
+        """
+        Cell texts as a list of rows; positions not covered by any cell are filled with `fill`
+        """
+        texts = self.texts(fill)
+        return [[texts[idx] for idx in row_ids] for row_ids in self.cell_ids.tolist()]
+
+    def to_numpy(self, fill: str = "") -> np.ndarray:
+        """
+        Cell texts as a 2-D numpy array of objects; positions not covered by any cell are filled with `fill`
+        """
+        texts = np.empty(len(self.cells) + 1, dtype=object)
+        texts[:] = self.texts(fill)
+        return texts[self.cell_ids]
+
+
 class Table:
     def __init__(
         self,
@@ -112,6 +186,17 @@ class Table:
         self._caption = caption
         self._rows = rows
         self._footnotes = footnotes
+        self._grid = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the grid is rebuilt on demand
+        state.pop("_grid", None)
+        return state
+
+    def __setstate__(self, state):
+        self._grid = None
+        self.__dict__.update(state)
 
     @property
     def label(self):
@@ -133,6 +218,12 @@ class Table:
     def footnotes(self):
         return self._footnotes if self._footnotes is not None else []
 
+    @property
+    def grid(self) -> TableGrid:
+        if self._grid is None:
+            self._grid = TableGrid(self.rows)
+        return self._grid
+
     @property
     def shape(self):
         return len(self), len(self._rows[0]) if self._rows else 0
@@ -168,6 +259,7 @@ class Table:
     @rows.setter
     def rows(self, x):
         self._rows = x
+        self._grid = None
 
     @footnotes.setter
     def footnotes(self, x):
@@ -195,7 +287,7 @@ class Table:
         return self.__str__()
 
     def _repr_html_(self):
-        return self.write_html().prettify()
+        return self.to_html()
 
     def text(self):
         return self.__str__()
@@ -237,16 +329,98 @@ class Table:
                 cells.append(cell)
             formatted_rows.append(TableRow(cells))
         self._rows = formatted_rows
+        self._grid = None
         return self
 
     def body_to_lists(self):
-        element_list = list()
-        for i in range(self.height):
-            row_elements = list()
-            for j in range(self.width):
-                row_elements.append(self[i, j].text)
-            element_list.append(row_elements)
-        return element_list
+        return self.to_lists()
+
+    def to_lists(self, fill: str = "") -> list[list[str]]:
+        """
+        Convert the table body to a list of rows of cell texts.
+        Multi-row and multi-column cells are repeated over their areas.
+
+        Parameters
+        ----------
+        fill: the text of positions not covered by any cell in ragged tables
+
+        Returns
+        -------
+        list of rows of cell texts
+        """
+        return self.grid.to_lists(fill)
+
+    def to_numpy(self, fill: str = "") -> np.ndarray:
+        """
+        Convert the table body to a 2-D numpy array of cell texts with `dtype=object`.
+        Multi-row and multi-column cells are repeated over their areas.
+
+        Parameters
+        ----------
+        fill: the text of positions not covered by any cell in ragged tables
+
+        Returns
+        -------
+        numpy array of cell texts
+        """
+        return self.grid.to_numpy(fill)
+
+    def to_dataframe(self, n_header_rows: int = 0, fill: str = ""):
+        """
+        Convert the table body to a pandas DataFrame. Requires `pandas`.
+
+        Parameters
+        ----------
+        n_header_rows: the number of top rows used as the column header; multiple rows make a MultiIndex
+        fill: the text of positions not covered by any cell in ragged tables
+
+        Returns
+        -------
+        pandas DataFrame of cell texts
+        """
+        import pandas as pd
+
+        body = self.to_numpy(fill)
+        if n_header_rows <= 0:
+            return pd.DataFrame(body)
+        if n_header_rows == 1:
+            columns = pd.Index(body[0])
+        else:
+            columns = pd.MultiIndex.from_arrays(list(body[:n_header_rows]))
+        return pd.DataFrame(body[n_header_rows:], columns=columns)
+
+    def to_html(self) -> str:
+        """
+        Render the table as an HTML string with escaped text
+        """
+        esc = html.escape
+        lines = ["<table>"]
+        if self.caption:
+            if self.label and self.label != "<EMPTY>":
+                cap_txt = f"{self.label} {self.caption}"
+            else:
+                cap_txt = self.caption
+            lines.append(f"<caption>{esc(cap_txt, quote=False)}</caption>")
+
+        lines.append("<tbody>")
+        for row in self.rows:
+            cells = "".join(
+                f'<td colspan="{entry.width}" rowspan="{entry.height}">{esc(entry.text, quote=False)}</td>'
+                for entry in row.cells
+                if not entry.linked_top
+            )
+            lines.append(f"<tr>{cells}</tr>")
+        lines.append("</tbody>")
+
+        if self.footnotes:
+            colspan = self.rows[0].width if self.rows else 1
+            lines.append("<tfoot>")
+            lines += [
+                f'<tr><td colspan="{colspan}">{esc(footnote, quote=False)}</td></tr>' for footnote in self.footnotes
+            ]
+            lines.append("</tfoot>")
+        lines.append("</table>")
+        return "\n".join(lines)
 
     def write_html(self, root: bs4.element.Tag = None):
         soup = BeautifulSoup()
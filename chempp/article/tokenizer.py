@@ -0,0 +1,313 @@
+"""
+# Author: Yinghao Li
+# Modified: June 15th, 2024
+# ---------------------------------------
+# Description: Tokenizer registry with pluggable sentence and word tokenization backends
+"""
+
+import os
+import re
+import pickle
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "Tokenizer",
+    "NltkTokenizer",
+    "RegexTokenizer",
+    "CallableTokenizer",
+    "CachedTokenizer",
+    "register_tokenizer",
+    "get_tokenizer",
+    "set_default_tokenizer",
+]
+
+
+class Tokenizer:
+    """
+    Base class of the tokenizer backends.
+    Subclasses implement `sent_tokenize` and `word_tokenize`;
+    the batch methods can be overridden by backends that process several texts at once more efficiently.
+    """
+
+    def sent_tokenize(self, text: str) -> list[str]:
+        raise NotImplementedError
+
+    def word_tokenize(self, text: str) -> list[str]:
+        raise NotImplementedError
+
+    def sent_tokenize_batch(self, texts: list[str]) -> list[list[str]]:
+        return [self.sent_tokenize(text) for text in texts]
+
+    def word_tokenize_batch(self, texts: list[str]) -> list[list[str]]:
+        return [self.word_tokenize(text) for text in texts]
+
+
+class NltkTokenizer(Tokenizer):
+    """
+    Punkt sentence tokenizer and the improved Treebank word tokenizer of NLTK.
+    Gives the same results as `nltk.sent_tokenize` and `nltk.word_tokenize`,
+    but the Punkt model is loaded only once, on first use.
+    """
+
+    def __init__(self, language: str = "english"):
+        self.language = language
+        self._punkt = None
+        self._word_tokenizer = None
+
+    @property
+    def punkt(self):
+        if self._punkt is None:
+            try:
+                from nltk.tokenize import PunktTokenizer
+
+                self._punkt = PunktTokenizer(self.language)
+            except ImportError:  # nltk < 3.8.2
+                import nltk
+
+                self._punkt = nltk.data.load(f"tokenizers/punkt/{self.language}.pickle")
+        return self._punkt
+
+    @property
+    def word_tokenizer(self):
+        if self._word_tokenizer is None:
+            from nltk.tokenize import NLTKWordTokenizer
+
+            self._word_tokenizer = NLTKWordTokenizer()
+        return self._word_tokenizer
+
+    def sent_tokenize(self, text: str) -> list[str]:
+        return self.punkt.tokenize(text)
+
+    def word_tokenize(self, text: str) -> list[str]:
+        # `nltk.word_tokenize` splits the sentences again before tokenizing the words
+        return [token for sent in self.sent_tokenize(text) for token in self.word_tokenizer.tokenize(sent)]
+
+
+class RegexTokenizer(Tokenizer):
+    """
+    Fast rule-based tokenizer without model loading.
+    Sentences end with `.`, `!` or `?` followed by a space and an upper-case letter, digit or opening bracket,
+    unless the period belongs to a common abbreviation. Results differ from NLTK in corner cases.
+    """
+
+    SENT_BOUNDARY = re.compile(r"[.!?][\"')\]]*\s+(?=[A-Z0-9(\[\"'])")
+    ABBREVIATIONS = {"e.g", "i.e", "fig", "figs", "eq", "eqs", "ref", "refs", "al", "vs", "ca", "approx", "no", "dr"}
+    WORD = re.compile(r"\w+(?:[-.]\w+)*|\S")
+
+    def sent_tokenize(self, text: str) -> list[str]:
+        sents = list()
+        start = 0
+        for match in self.SENT_BOUNDARY.finditer(text):
+            last_word = text[start : match.start()].rsplit(maxsplit=1)[-1:]
+            if last_word and last_word[0].lower() in self.ABBREVIATIONS:
+                continue
+            end = match.end()
+            sents.append(text[start:end].strip())
+            start = end
+        if text[start:].strip():
+            sents.append(text[start:].strip())
+        return sents
+
+    def word_tokenize(self, text: str) -> list[str]:
+        return self.WORD.findall(text)
+
+
+class CallableTokenizer(Tokenizer):
+    """
+    Wrap user-defined sentence and word tokenization functions
+    """
+
+    def __init__(self, sent_tokenize: Callable[[str], list[str]], word_tokenize: Callable[[str], list[str]]):
+        self._sent_tokenize = sent_tokenize
+        self._word_tokenize = word_tokenize
+
+    def sent_tokenize(self, text: str) -> list[str]:
+        return self._sent_tokenize(text)
+
+    def word_tokenize(self, text: str) -> list[str]:
+        return self._word_tokenize(text)
+
+
+class CachedTokenizer(Tokenizer):
+    """
+    Memoize the results of another tokenizer in a bounded LRU cache keyed by the hash of the input text.
+    Sentence splits are cached per paragraph text and word tokens per sentence text,
+    so boilerplate paragraphs (funding statements, licences, etc.) and repeated sentences are tokenized only once.
+    The cache can be saved to and loaded from disk to be reused between runs.
+    """
+
+    def __init__(self, tokenizer: Tokenizer | str = None, maxsize: int = 100000, cache_path: str = None):
+        """
+        Parameters
+        ----------
+        tokenizer: the memoized `Tokenizer` instance or name of a registered backend. Defaults to the default backend
+        maxsize: maximum number of cached sentence splits and token lists
+        cache_path: the file from which the cache is loaded, if it exists, and to which `save` writes
+        """
+        self.tokenizer = tokenizer if isinstance(tokenizer, Tokenizer) else get_tokenizer(tokenizer)
+        self.maxsize = maxsize
+        self.cache_path = cache_path
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[tuple[str, bytes], tuple[str, ...]] = OrderedDict()
+
+        if cache_path is not None and os.path.exists(cache_path):
+            self.load(cache_path)
+
+    @property
+    def tokenizer_name(self):
+        return type(self.tokenizer).__name__
+
+    @staticmethod
+    def text_hash(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _lookup(self, key: tuple[str, bytes]):
+        value = self._cache.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return list(value)
+
+    def _store(self, key: tuple[str, bytes], value: list[str]):
+        self._cache[key] = tuple(value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def _tokenize_batch(self, op: str, texts: list[str], tokenize_func: Callable) -> list[list[str]]:
+        keys = [(op, self.text_hash(text)) for text in texts]
+        results = [self._lookup(key) for key in keys]
+
+        # texts repeated within the batch are tokenized once
+        missed = dict()
+        for key, text, result in zip(keys, texts, results):
+            if result is None:
+                missed.setdefault(key, text)
+        if missed:
+            n_repeated = sum(result is None for result in results) - len(missed)
+            self.misses -= n_repeated
+            self.hits += n_repeated
+
+            missed_results = dict(zip(missed.keys(), tokenize_func(list(missed.values()))))
+            for key, result in missed_results.items():
+                self._store(key, result)
+            results = [list(missed_results[key]) if result is None else result for key, result in zip(keys, results)]
+        return results
+
+    def sent_tokenize(self, text: str) -> list[str]:
+        return self.sent_tokenize_batch([text])[0]
+
+    def word_tokenize(self, text: str) -> list[str]:
+        return self.word_tokenize_batch([text])[0]
+
+    def sent_tokenize_batch(self, texts: list[str]) -> list[list[str]]:
+        return self._tokenize_batch("sent", texts, self.tokenizer.sent_tokenize_batch)
+
+    def word_tokenize_batch(self, texts: list[str]) -> list[list[str]]:
+        return self._tokenize_batch("word", texts, self.tokenizer.word_tokenize_batch)
+
+    def cache_info(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "maxsize": self.maxsize, "currsize": len(self._cache)}
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+        return self
+
+    def save(self, cache_path: str = None):
+        """
+        Save the cached results to disk. The counters are not saved.
+        """
+        cache_path = self.cache_path if cache_path is None else cache_path
+        assert cache_path is not None, ValueError("`cache_path` is not specified!")
+
+        cache_dir = os.path.dirname(os.path.abspath(cache_path))
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, "wb") as f:
+            pickle.dump({"tokenizer": self.tokenizer_name, "cache": self._cache}, f)
+        return self
+
+    def load(self, cache_path: str = None):
+        """
+        Load cached results from disk. Results of a different tokenizer are ignored.
+        """
+        cache_path = self.cache_path if cache_path is None else cache_path
+        with open(cache_path, "rb") as f:
+            saved = pickle.load(f)
+
+        if saved["tokenizer"] != self.tokenizer_name:
+            logger.warning(
+                f"Tokenization cache {cache_path} is created by {saved['tokenizer']} "
+                f"instead of {self.tokenizer_name}. Ignored."
+            )
+            return self
+
+        for key, value in saved["cache"].items():
+            self._store(key, value)
+        return self
+
+
+TOKENIZERS: dict[str, Tokenizer] = {
+    "nltk": NltkTokenizer(),
+    "regex": RegexTokenizer(),
+}
+DEFAULT_TOKENIZER = "nltk"
+
+
+def register_tokenizer(
+    name: str, tokenizer: Tokenizer = None, sent_tokenize: Callable = None, word_tokenize: Callable = None
+) -> Tokenizer:
+    """
+    Register a tokenizer backend
+
+    Parameters
+    ----------
+    name: name of the backend
+    tokenizer: a `Tokenizer` instance. Cannot be used together with `sent_tokenize` and `word_tokenize`
+    sent_tokenize: function that splits a text into sentences. Falls back to the NLTK backend if not provided
+    word_tokenize: function that splits a text into words. Falls back to the NLTK backend if not provided
+
+    Returns
+    -------
+    the registered tokenizer
+    """
+    if tokenizer is None:
+        assert sent_tokenize is not None or word_tokenize is not None, ValueError("No tokenizer is provided!")
+        tokenizer = CallableTokenizer(
+            sent_tokenize=sent_tokenize or TOKENIZERS["nltk"].sent_tokenize,
+            word_tokenize=word_tokenize or TOKENIZERS["nltk"].word_tokenize,
+        )
+    else:
+        assert sent_tokenize is None and word_tokenize is None, ValueError(
+            "Cannot pass values to both `tokenizer` and the tokenization functions"
+        )
+    TOKENIZERS[name] = tokenizer
+    return tokenizer
+
+
+def get_tokenizer(name: str = None) -> Tokenizer:
+    """
+    Get a registered tokenizer backend. Returns the default backend if `name` is not provided.
+    """
+    name = DEFAULT_TOKENIZER if name is None else name
+    if name not in TOKENIZERS:
+        raise ValueError(f"Unknown tokenizer: {name}. Registered tokenizers: {list(TOKENIZERS.keys())}")
+    return TOKENIZERS[name]
+
+
+def set_default_tokenizer(name: str):
+    """
+    Set the backend used by `Sentence` and `Paragraph` when no tokenizer function is specified
+    """
+    global DEFAULT_TOKENIZER
+    get_tokenizer(name)
+    DEFAULT_TOKENIZER = name
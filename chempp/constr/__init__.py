@@ -1,6 +1,12 @@
-from .article_constr import parse_html, parse_xml
+from .article_constr import parse_html, parse_xml, HtmlParseStats
+from .sniffer import ArticleSniff, sniff_article
+from .batch import parse_many
 
 __all__ = [
     "parse_html",
     "parse_xml",
+    "parse_many",
+    "HtmlParseStats",
+    "ArticleSniff",
+    "sniff_article",
 ]
@@ -13,7 +13,9 @@
 """
 
 import os
-from bs4 import BeautifulSoup
+import time
+from dataclasses import dataclass
+from bs4 import BeautifulSoup, SoupStrainer
 
 try:
     import xml.etree.cElementTree as ET
@@ -22,6 +24,9 @@ except ImportError:
 
 from seqlbtoolkit.text import format_text
 
+from .sniffer import sniff_html_publisher
+from .html_clean import preclean_html
+from .xml_stream import ElsevierXmlStream
 from .section_extr import (
     html_section_extract_nature,
     html_section_extract_wiley,
@@ -35,10 +40,141 @@ from .section_extr import (
     xml_section_extract_elsevier,
     xml_table_extract_elsevier,
     xml_figure_extract,
+    combine_section_ids,
 )
 from chempp.article import Article, ArticleElement, ArticleElementType, ArticleComponentCheck
 
-__all__ = ["parse_html", "parse_xml"]
+__all__ = ["parse_html", "parse_xml", "HtmlParseStats"]
+
+# publishers whose pages need the lenient html5lib builder (illegal nested <p> and <span>)
+HTML5LIB_PUBLISHERS = ["elsevier", "rsc"]
+
+
+@dataclass
+class HtmlParseStats:
+    """
+    Count how `parse_html` built the trees of many documents, from the per-document statistics it records.
+    `double_parses_avoided` counts html5lib documents that were parsed only once;
+    `double_parses` counts documents whose builder was mis-guessed and had to be parsed again;
+    `strained_parses` counts documents constructed from the strained subtrees only;
+    `strain_fallbacks` counts strained documents that had to be parsed again in full;
+    `precleaned_chars` and `preclean_time` accumulate the characters removed by `preclean_html`
+    and the seconds spent removing them.
+    """
+
+    single_parses: int = 0
+    double_parses_avoided: int = 0
+    double_parses: int = 0
+    strained_parses: int = 0
+    strain_fallbacks: int = 0
+    precleaned_chars: int = 0
+    preclean_time: float = 0.0
+
+    def update(self, stats: dict):
+        """
+        Add the statistics `parse_html` recorded for a document, e.g., the timings returned by `parse_many`
+        """
+        tree = stats.get("tree")
+        if tree is not None:
+            setattr(self, HTML_PARSE_OUTCOMES[tree], getattr(self, HTML_PARSE_OUTCOMES[tree]) + 1)
+        self.strain_fallbacks += stats.get("strain_fallback", 0)
+        self.precleaned_chars += stats.get("preclean_chars", 0)
+        self.preclean_time += stats.get("preclean", 0.0)
+        return self
+
+    def reset(self):
+        self.single_parses = 0
+        self.double_parses_avoided = 0
+        self.double_parses = 0
+        self.strained_parses = 0
+        self.strain_fallbacks = 0
+        self.precleaned_chars = 0
+        self.preclean_time = 0.0
+        return self
+
+
+# how `parse_html` built the tree of a document -> the counter of `HtmlParseStats`
+HTML_PARSE_OUTCOMES = {
+    "single": "single_parses",
+    "double_avoided": "double_parses_avoided",
+    "double": "double_parses",
+    "strained": "strained_parses",
+}
+
+
+class ElementStrainer(SoupStrainer):
+    """
+    Only build the top-level elements for which `rule(tag_name, attrs)` is true, together with their subtrees.
+    Works with the lxml and html.parser builders; html5lib does not support strained parsing.
+    """
+
+    def __init__(self, rule):
+        super().__init__()
+        self.rule = rule
+
+    # beautifulsoup4 < 4.13
+    def search_tag(self, markup_name=None, markup_attrs=None):
+        return self.rule(markup_name, markup_attrs or dict())
+
+    # beautifulsoup4 >= 4.13
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self.rule(name, attrs or dict())
+
+    def allow_string_creation(self, string):
+        return False
+
+
+def has_attr_class(attrs: dict, *classes: str) -> bool:
+    attr_classes = attrs.get("class", "")
+    attr_classes = attr_classes.split() if isinstance(attr_classes, str) else attr_classes
+    return any(cls in attr_classes for cls in classes)
+
+
+# The following functions define the subtrees each publisher's constructor and DOI search read.
+# The strained soup has no <head> or <body>, so the constructors fall back to searching the whole soup.
+def strain_html_acs(name: str, attrs: dict) -> bool:
+    if name == "div":
+        return has_attr_class(attrs, "article_abstract", "article_content", "article_header-doiurl")
+    elif name == "p":
+        return has_attr_class(attrs, "articleBody_abstractText")
+    return name == "title"
+
+
+def strain_html_wiley(name: str, attrs: dict) -> bool:
+    if name == "section":
+        return has_attr_class(attrs, "article-section__abstract", "article-section__full")
+    elif name == "a":
+        return has_attr_class(attrs, "epub-doi")
+    return name == "title"
+
+
+def strain_html_nature(name: str, attrs: dict) -> bool:
+    if name == "a":
+        return attrs.get("data-track-action") == "view doi"
+    return name in ("title", "section")
+
+
+def strain_html_springer(name: str, attrs: dict) -> bool:
+    if name == "span":
+        span_class = attrs.get("class", "")
+        span_class = " ".join(span_class) if isinstance(span_class, list) else span_class
+        return "bibliographic-information__value" in span_class
+    return name in ("title", "section")
+
+
+def strain_html_aip(name: str, attrs: dict) -> bool:
+    if name == "div":
+        return has_attr_class(attrs, "NLM_paragraph", "publicationContentCitation")
+    return name == "title"
+
+
+HTML_STRAINER_RULES = {
+    "acs": strain_html_acs,
+    "wiley": strain_html_wiley,
+    "nature": strain_html_nature,
+    "springer": strain_html_springer,
+    "aip": strain_html_aip,
+}
 
 
 class ArticleFunctions:
@@ -53,12 +189,12 @@ class ArticleFunctions:
         article.publisher = "nature"
 
         # --- get title ---
-        head = soup.head
+        head = soup.head or soup
         title = head.find_all("title")
         title = title[0].text.split("|")[0].strip()
         article.title = title
 
-        body = soup.body
+        body = soup.body or soup
         sections = body.find_all("section")
 
         # --- get abstract ---
@@ -113,7 +249,7 @@ class ArticleFunctions:
         title = title[0].text.split(" - ")[0].strip()
         article.title = title
 
-        body = soup.body
+        body = soup.body or soup
         sections = body.find_all("section")
 
         # --- get abstract ---
@@ -203,12 +339,12 @@ class ArticleFunctions:
         article.publisher = "springer"
 
         # --- get title ---
-        head = soup.head
+        head = soup.head or soup
         title = head.find_all("title")
         title = title[0].text.split("|")[0].strip()
         article.title = title
 
-        body = soup.body
+        body = soup.body or soup
         sections = body.find_all("section")
 
         # --- get abstract ---
@@ -272,7 +408,7 @@ class ArticleFunctions:
         article.publisher = "aip"
 
         # --- get title ---
-        head = soup.head
+        head = soup.head or soup
         title = head.find_all("title")
         title = title[0].text.split(":")[0].strip()
         article.title = title
@@ -293,13 +429,13 @@ class ArticleFunctions:
         article.publisher = "acs"
 
         # --- get title ---
-        head = soup.head
+        head = soup.head or soup
         title = head.find_all("title")
         title = title[0].text.split(" | ")[0].strip()
         article.title = title
 
         # --- get abstract ---
-        body = soup.body
+        body = soup.body or soup
         h2s = body.find_all("h2")
         abs_h2 = None
         for h2 in h2s:
@@ -495,22 +631,7 @@ class ArticleFunctions:
         except Exception:
             article_component_check.sections = False
 
-        new_section_list = list()
-        for i in range(len(section_list)):
-            if section_list[i].type == ArticleElementType.SECTION_ID:
-                continue
-            elif section_list[i].type == ArticleElementType.SECTION_TITLE:
-                if i > 0 and section_list[i - 1].type == ArticleElementType.SECTION_ID:
-                    combined_section_title = section_list[i - 1].content + " " + section_list[i].content
-                    new_section_list.append(
-                        ArticleElement(type=ArticleElementType.SECTION_TITLE, content=combined_section_title)
-                    )
-                else:
-                    new_section_list.append(section_list[i])
-            else:
-                new_section_list.append(section_list[i])
-
-        article.sections = new_section_list
+        article.sections = combine_section_ids(section_list)
 
         return article, article_component_check
 
@@ -545,22 +666,7 @@ class ArticleFunctions:
         if not section_list:
             article_component_check.sections = False
 
-        new_section_list = list()
-        for i in range(len(section_list)):
-            if section_list[i].type == ArticleElementType.SECTION_ID:
-                continue
-            elif section_list[i].type == ArticleElementType.SECTION_TITLE:
-                if i > 0 and section_list[i - 1].type == ArticleElementType.SECTION_ID:
-                    combined_section_title = section_list[i - 1].content + " " + section_list[i].content
-                    new_section_list.append(
-                        ArticleElement(type=ArticleElementType.SECTION_TITLE, content=combined_section_title)
-                    )
-                else:
-                    new_section_list.append(section_list[i])
-            else:
-                new_section_list.append(section_list[i])
-
-        article.sections = new_section_list
+        article.sections = combine_section_ids(section_list)
 
         return article, article_component_check
 
@@ -705,7 +811,13 @@ def search_xml_doi_publisher(root, publisher=None):
     return doi, publisher
 
 
-def parse_html(file_path: str = None, html_content: str = None) -> tuple[Article, ArticleComponentCheck]:
+def parse_html(
+    file_path: str = None,
+    html_content: str = None,
+    strain: bool = True,
+    preclean: bool = True,
+    stats: dict = None,
+) -> tuple[Article, ArticleComponentCheck]:
     """
     Parse html files
 
@@ -713,12 +825,21 @@ def parse_html(file_path: str = None, html_content: str = None) -> tuple[Article
     ----------
     file_path: File name
     html_content: html content. Cannot pass values to both file_path and html_content
+    strain: Only build the subtrees the publisher's constructor needs (see `HTML_STRAINER_RULES`).
+        Falls back to parsing the full document if the strained article misses its abstract or sections.
+    preclean: Remove script, style and other blocks the constructors never read from the raw html
+        before building the tree (see `preclean_html`).
+    stats: If given, the statistics of this document are recorded in it: `tree`, how the tree was built
+        ("single", "double_avoided", "double" or "strained", see `HtmlParseStats`); `strain_fallback`, 1 if the
+        strained tree had to be rebuilt in full; `preclean_chars` and `preclean`, the number of characters removed
+        by `preclean_html` and the seconds spent removing them. Aggregate them with `HtmlParseStats.update`.
 
     Returns
     -------
     article: Article, component check: ArticleComponentCheck
     """
     assert (file_path is None) != (html_content is None)
+    stats = dict() if stats is None else stats
 
     if file_path is not None:
         file_path = os.path.normpath(file_path)
@@ -727,16 +848,43 @@ def parse_html(file_path: str = None, html_content: str = None) -> tuple[Article
     else:
         contents = html_content
 
-    soup = BeautifulSoup(contents, "lxml")
+    publisher = sniff_html_publisher(contents)[0]
+
+    if preclean:
+        start = time.perf_counter()
+        contents, n_removed = preclean_html(contents, publisher)
+        stats["preclean"] = time.perf_counter() - start
+        stats["preclean_chars"] = n_removed
+
+    if strain and publisher in HTML_STRAINER_RULES:
+        soup = BeautifulSoup(contents, "lxml", parse_only=ElementStrainer(HTML_STRAINER_RULES[publisher]))
+        try:
+            doi, publisher = search_html_doi_publisher(soup, publisher)
+            article_construct_func = getattr(ArticleFunctions, f"article_construct_html_{publisher}")
+            article, component_check = article_construct_func(soup=soup, doi=doi)
+            if component_check.abstract and component_check.sections:
+                stats["tree"] = "strained"
+                return article, component_check
+        except Exception:
+            pass
+        stats["strain_fallback"] = 1
+
+    # decide the tree builder before parsing so that each document is parsed only once
+    # html5lib allows illegal nested <p> and nested <span>
+    builder = "html5lib" if publisher in HTML5LIB_PUBLISHERS else "lxml"
+    soup = BeautifulSoup(contents, builder)
 
     # get publisher and doi
     doi, publisher = search_html_doi_publisher(soup)
 
-    if publisher in ["elsevier", "rsc"]:
-        # allow illegal nested <p>
-        # soup = BeautifulSoup(contents, 'html.parser')
-        # allow nested <span>
-        soup = BeautifulSoup(contents, "html5lib")
+    expected_builder = "html5lib" if publisher in HTML5LIB_PUBLISHERS else "lxml"
+    if builder != expected_builder:
+        stats["tree"] = "double"
+        soup = BeautifulSoup(contents, expected_builder)
+    elif builder == "html5lib":
+        stats["tree"] = "double_avoided"
+    else:
+        stats["tree"] = "single"
 
     article_construct_func = getattr(ArticleFunctions, f"article_construct_html_{publisher}")
     article, component_check = article_construct_func(soup=soup, doi=doi)
@@ -744,22 +892,44 @@ def parse_html(file_path: str = None, html_content: str = None) -> tuple[Article
     return article, component_check
 
 
-def parse_xml(file_path: str) -> tuple[Article, ArticleComponentCheck]:
+def parse_xml(file_path: str, streaming: bool = False, backend: str = "etree") -> tuple[Article, ArticleComponentCheck]:
     """
     Parse xml files
 
     Parameters
     ----------
     file_path: File name
+    streaming: Construct Elsevier articles from `iterparse` events and discard the finished elements on the fly,
+        so that the peak memory is bounded by the largest single element rather than the whole document.
+        Articles from other publishers are parsed as usual. Streaming always uses the `etree` backend.
+    backend: "etree" (standard library ElementTree) or "lxml" (lxml.etree with precompiled XPath expressions).
+        Both backends construct identical articles.
 
     Returns
     -------
     article: Article, component check: ArticleComponentCheck
     """
+    if backend not in ("etree", "lxml"):
+        raise ValueError(f"Unknown XML backend: {backend}")
+
     file_path = os.path.normpath(file_path)
 
-    tree = ET.parse(file_path)
-    root = tree.getroot()
+    if backend == "lxml" and not streaming:
+        from .xml_lxml import parse_xml_lxml
+
+        return parse_xml_lxml(file_path)
+
+    if streaming:
+        events = ET.iterparse(file_path, events=("start", "end"))
+        _, root = next(events)
+        if "elsevier" in root.tag:
+            return ElsevierXmlStream(root).consume(events)
+        # build the whole tree for other publishers
+        for _ in events:
+            pass
+    else:
+        tree = ET.parse(file_path)
+        root = tree.getroot()
 
     # get the publisher
     doi, publisher = search_xml_doi_publisher(root)
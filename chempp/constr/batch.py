@@ -0,0 +1,71 @@
+"""
+# Author: Yinghao Li
+# Modified: June 15th, 2024
+# ---------------------------------------
+# Description: Parse batches of articles with a process pool
+"""
+
+import os
+import time
+from multiprocessing import Pool
+from typing import Iterable, Iterator
+
+from chempp.article import Article, ArticleComponentCheck
+from .article_constr import parse_html, parse_xml
+
+__all__ = ["parse_many"]
+
+
+def parse_file(file_path: str) -> tuple[str, Article | Exception, ArticleComponentCheck | None, dict[str, float]]:
+    """
+    Parse a single html or xml file according to its suffix. Exceptions are returned instead of raised.
+
+    Returns
+    -------
+    file path, article or exception, component check (None if failed),
+    timings in seconds (`parse`) together with the statistics recorded by `parse_html` for html files
+    """
+    start = time.perf_counter()
+    stats = dict()
+    try:
+        if file_path.lower().endswith("html"):
+            article, component_check = parse_html(file_path, stats=stats)
+        elif file_path.lower().endswith("xml"):
+            article, component_check = parse_xml(file_path)
+        else:
+            raise ValueError(f"Unsupported file type: {file_path}")
+    except Exception as e:
+        article, component_check = e, None
+    timings = {"parse": time.perf_counter() - start, **stats}
+    return file_path, article, component_check, timings
+
+
+def parse_many(
+    paths: Iterable[str], workers: int = None, ordered: bool = False, chunksize: int = 1
+) -> Iterator[tuple[str, Article | Exception, ArticleComponentCheck | None, dict[str, float]]]:
+    """
+    Parse html/xml files with a process pool
+
+    Parameters
+    ----------
+    paths: paths to the html/xml files. Files are dispatched to `parse_html` or `parse_xml` by their suffixes
+    workers: number of worker processes. Defaults to the number of CPUs; 1 parses in the current process
+    ordered: yield results in the order of `paths` instead of as soon as they complete
+    chunksize: number of files sent to a worker at a time. Larger chunks reduce the dispatching overhead
+
+    Yields
+    -------
+    file path, article or the exception raised while parsing it, component check (None if failed),
+    timings and statistics (see `parse_file`)
+    """
+    paths = (os.path.normpath(p) for p in paths)
+    workers = os.cpu_count() if workers is None else workers
+
+    if workers <= 1:
+        for file_path in paths:
+            yield parse_file(file_path)
+        return
+
+    with Pool(processes=workers) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        yield from imap(parse_file, paths, chunksize=chunksize)
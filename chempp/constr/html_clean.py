@@ -0,0 +1,116 @@
+"""
+# Author: Yinghao Li
+# Modified: June 15th, 2024
+# ---------------------------------------
+# Description: Remove blocks the article constructors never read from raw html before building the tree
+"""
+
+import re
+import functools
+
+__all__ = ["preclean_html", "DEFAULT_PRECLEAN_TAGS", "HTML_PRECLEAN_TAGS"]
+
+DEFAULT_PRECLEAN_TAGS = ("script", "style")
+
+# Publisher-specific tags to remove. Publishers not listed here use `DEFAULT_PRECLEAN_TAGS`.
+# The section extractors read the text of inline <svg> (e.g., <title> labels of equations) and <noscript> blocks,
+# so removing them is opt-in: add them for a publisher only after verifying that its articles are constructed
+# identically with and without them (see `examples/benchmark_html_preclean.py`).
+HTML_PRECLEAN_TAGS = {
+    # verified on `examples/Toland.et.al.2023.html`
+    "acs": ("script", "style", "noscript", "svg"),
+}
+
+# elements whose content is raw text, so the block ends at the first closing tag
+RAW_TEXT_TAGS = ("script", "style")
+
+# base64 payloads of `data:` URIs in attributes and inline css; the `data:<mime>;base64,` prefix is kept
+DATA_URI_PAYLOAD = re.compile(r"(data:[\w/+.-]*;base64,)[A-Za-z0-9+/=]+")
+# MathJax stores equations in <script type="math/..."> elements; their contents are article text
+MATH_SCRIPT_TYPE = re.compile(r"""\btype\s*=\s*["']?math/""", re.I)
+
+
+@functools.lru_cache()
+def get_block_pattern(tags: tuple[str, ...]) -> re.Pattern:
+    # comments are matched (and kept) so that tags in commented-out markup do not start a block;
+    # self-closing tags have no block to remove;
+    # the block content is matched with an unrolled loop, which is much faster than a lazy `.*?` on long blocks
+    return re.compile(
+        r"<(?:!--.*?-->|(" + "|".join(map(re.escape, tags)) + r")\b([^>]*)(?<!/)>[^<]*(?:<(?!/\1\s*>)[^<]*)*</\1\s*>)",
+        re.I | re.S,
+    )
+
+
+@functools.lru_cache()
+def get_nested_tag_pattern(tags: tuple[str, ...]) -> re.Pattern:
+    # comments are matched (and skipped) so that tags in commented-out markup are not counted
+    return re.compile(r"<(?:!--.*?-->|(/?)(" + "|".join(map(re.escape, tags)) + r")\b([^>]*)>)", re.I | re.S)
+
+
+def remove_nested_blocks(contents: str, tags: tuple[str, ...]) -> str:
+    """
+    Remove the blocks of tags that can nest (e.g., <svg> in <svg>), counting the depth of the opening tags
+    so that a block ends at its matching closing tag. An unclosed block is kept.
+    """
+    pieces = list()
+    prev = 0
+    depth = 0
+    block_start = block_tag = None
+    for match in get_nested_tag_pattern(tags).finditer(contents):
+        closing, tag, attrs = match.groups()
+        if tag is None:
+            continue
+        tag = tag.lower()
+        self_closing = not closing and attrs.rstrip().endswith("/")
+        if depth == 0:
+            if closing or self_closing:
+                continue
+            block_start, block_tag, depth = match.start(), tag, 1
+        elif tag == block_tag and not self_closing:
+            depth += -1 if closing else 1
+            if depth == 0:
+                pieces.append(contents[prev:block_start])
+                prev = match.end()
+    pieces.append(contents[prev:])
+    return "".join(pieces)
+
+
+def remove_block(match: re.Match) -> str:
+    tag = match.group(1)
+    if tag is None:
+        return match.group(0)
+    if tag.lower() == "script" and MATH_SCRIPT_TYPE.search(match.group(2)):
+        return match.group(0)
+    return ""
+
+
+def preclean_html(contents: str, publisher: str = None, remove_data_uris: bool = True) -> tuple[str, int]:
+    """
+    Remove <script> and <style> blocks (plus the publisher's opt-in tags in `HTML_PRECLEAN_TAGS`)
+    and base64 `data:` URI payloads from raw html so that the tree builder does not have to tokenize them.
+    None of them is read by the article constructors or the DOI search.
+
+    Parameters
+    ----------
+    contents: raw html content
+    publisher: the publisher of the article, which decides the removed tags (see `HTML_PRECLEAN_TAGS`)
+    remove_data_uris: whether to remove base64 payloads of `data:` URIs
+
+    Returns
+    -------
+    cleaned html content, number of removed characters
+    """
+    tags = HTML_PRECLEAN_TAGS.get(publisher, DEFAULT_PRECLEAN_TAGS)
+
+    raw_text_tags = tuple(tag for tag in tags if tag in RAW_TEXT_TAGS)
+    nested_tags = tuple(tag for tag in tags if tag not in RAW_TEXT_TAGS)
+
+    cleaned = contents
+    if raw_text_tags:
+        cleaned = get_block_pattern(raw_text_tags).sub(remove_block, cleaned)
+    if nested_tags:
+        cleaned = remove_nested_blocks(cleaned, nested_tags)
+    if remove_data_uris:
+        cleaned = DATA_URI_PAYLOAD.sub(r"\1", cleaned)
+
+    return cleaned, len(contents) - len(cleaned)
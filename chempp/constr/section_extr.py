@@ -19,13 +19,17 @@ from chempp.article import ArticleElement, ArticleElementType, Table, TableRow,
 def pop_xml_element_iter(root, del_tag: List[str], popped_items: Optional[list] = None):
     if popped_items is None:
         popped_items = list()
-    for child in root:
-
+    # index-based iteration: the sibling following a removed element is skipped,
+    # which is how `ElementTree` iterates while removing, for both the `ElementTree` and `lxml` backends
+    child_idx = 0
+    while child_idx < len(root):
+        child = root[child_idx]
         if child.tag in del_tag:
             popped_items.append(child)
             root.remove(child)
         else:
             pop_xml_element_iter(child, del_tag, popped_items)
+        child_idx += 1
     return popped_items
 
 
@@ -36,6 +40,27 @@ def get_xml_text_iter(element):
     return format_text("".join(txt))
 
 
+def combine_section_ids(section_list: List[ArticleElement]) -> List[ArticleElement]:
+    """
+    Merge section ids into the section titles that follow them
+    """
+    new_section_list = list()
+    for i in range(len(section_list)):
+        if section_list[i].type == ArticleElementType.SECTION_ID:
+            continue
+        elif section_list[i].type == ArticleElementType.SECTION_TITLE:
+            if i > 0 and section_list[i - 1].type == ArticleElementType.SECTION_ID:
+                combined_section_title = section_list[i - 1].content + " " + section_list[i].content
+                new_section_list.append(
+                    ArticleElement(type=ArticleElementType.SECTION_TITLE, content=combined_section_title)
+                )
+            else:
+                new_section_list.append(section_list[i])
+        else:
+            new_section_list.append(section_list[i])
+    return new_section_list
+
+
 def xml_section_extract_elsevier(section_root, element_list=None) -> List[ArticleElement]:
     """
     Depth-first search of the text in the sections
@@ -0,0 +1,324 @@
+"""
+# Author: Yinghao Li
+# Modified: June 15th, 2024
+# ---------------------------------------
+# Description: Detect the publisher and DOI of articles from raw HTML/XML bytes without building a tree
+"""
+
+import io
+import os
+import re
+import html
+import codecs
+from dataclasses import dataclass
+from typing import Optional
+
+from seqlbtoolkit.text import format_text
+
+from chempp.utils import SUPPORTED_HTML_PUBLISHERS, SUPPORTED_XML_PUBLISHERS
+
+__all__ = ["ArticleSniff", "sniff_article", "sniff_html_publisher"]
+
+DEFAULT_SNIFF_CHUNK_SIZE = 16384
+DOI_URL_PREFIX = "https://doi.org/"
+ELSEVIER_XOCS_NAMESPACE = "http://www.elsevier.com/xml/xocs/dtd"
+
+ROOT_TAG_PATTERN = re.compile(r"<(?:!--.*?-->|!([^>]*)>|\?.*?\?>|([A-Za-z_][\w:.-]*)([^>]*)>)", re.DOTALL)
+HTML_TAG_PATTERN = re.compile(r"<html\b[^>]*>", re.IGNORECASE)
+META_TAG_PATTERN = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+TITLE_TAG_PATTERN = re.compile(r"<title\b[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+HEAD_END_PATTERN = re.compile(r"</head\s*>", re.IGNORECASE)
+MARKUP_PATTERN = re.compile(r"<[^>]*>")
+TAG_ATTR_PATTERN = re.compile(r"""([^\s=/>"']+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+XML_PUBLISHER_NAME_PATTERN = re.compile(r"<publisher-name\b[^>]*>([^<]*)")
+XML_ARTICLE_ID_PATTERN = re.compile(r"<article-id\b[^>]*>([^<]*)<")
+
+
+@dataclass
+class ArticleSniff:
+    file_type: Optional[str] = None
+    publisher: Optional[str] = None
+    doi: Optional[str] = None
+
+    @property
+    def supported(self):
+        if self.file_type == "html":
+            return self.publisher in SUPPORTED_HTML_PUBLISHERS
+        elif self.file_type == "xml":
+            return self.publisher in SUPPORTED_XML_PUBLISHERS
+        return False
+
+
+def get_tag_attrs(tag_str: str) -> dict[str, str]:
+    """
+    Get the attributes of a raw start tag, such as `<meta name="x" content="y">`.
+    Attribute names are lower-cased; the first occurrence of an attribute wins.
+    """
+    attrs = dict()
+    for match in TAG_ATTR_PATTERN.finditer(tag_str):
+        value = next(v for v in match.groups()[1:] if v is not None)
+        attrs.setdefault(match.group(1).lower(), html.unescape(value))
+    return attrs
+
+
+def get_markup_text(markup: str) -> str:
+    return html.unescape(MARKUP_PATTERN.sub("", markup))
+
+
+def iter_html_elements(text: str, tag: str, attr_check=None):
+    """
+    Iterate through the inner markups of the closed html elements with name `tag` whose attributes pass `attr_check`
+    """
+    start_pattern = re.compile(rf"<{tag}\b[^>]*>", re.IGNORECASE)
+    boundary_pattern = re.compile(rf"<(/?){tag}\b[^>]*>", re.IGNORECASE)
+    for start in start_pattern.finditer(text):
+        if attr_check is not None and not attr_check(get_tag_attrs(start.group())):
+            continue
+        depth = 1
+        for boundary in boundary_pattern.finditer(text, start.end()):
+            depth += -1 if boundary.group(1) else 1
+            if depth == 0:
+                yield text[start.end() : boundary.start()]
+                break
+
+
+def has_class(*classes: str):
+    return lambda attrs: any(cls in attrs.get("class", "").split() for cls in classes)
+
+
+def sniff_html_publisher(text: str, complete: bool = True):
+    """
+    Detect the publisher from the raw html string. Follows the decisions of `check_html_publisher`.
+
+    Parameters
+    ----------
+    text: html content
+    complete: whether `text` contains the entire document (or at least the entire document head)
+
+    Returns
+    -------
+    publisher name or None, whether the decision is final
+    """
+    publisher = None
+    html_tag = HTML_TAG_PATTERN.search(text)
+    if html_tag and get_tag_attrs(html_tag.group()).get("xmlns:rsc") == "urn:rsc.org":
+        publisher = "rsc"
+
+    for meta_tag in META_TAG_PATTERN.finditer(text):
+        meta = get_tag_attrs(meta_tag.group())
+        if "name" not in meta:
+            continue
+        name = meta["name"].lower()
+        content = meta.get("content")
+        if content is None and name in ("dc.publisher", "citation_publisher"):
+            continue
+        if name == "dc.publisher" and content == "Springer":
+            return "springer", True
+        elif name == "dc.publisher" and content == "Nature Publishing Group":
+            return "nature", True
+        elif name == "citation_publisher" and "John Wiley & Sons, Ltd" in content:
+            return "wiley", True
+        elif name == "dc.publisher" and (content == "American Institute of PhysicsAIP" or "AIP Publishing" in content):
+            return "aip", True
+        elif name == "dc.publisher" and content.strip() == "American Chemical Society":
+            return "acs", True
+        elif name == "dc.publisher" and content.strip() == "The Royal Society of Chemistry":
+            return "rsc", True
+        elif name == "dc.publisher" and content.strip() == "American Association for the Advancement of Science":
+            return "aaas", True
+        elif name == "dc.publisher" and content.strip() == "World Scientific Publishing Company":
+            publisher = "cjps"
+        elif meta["name"] == "citation_springer_api_url":
+            return "springer", True
+
+    if not publisher:
+        title = TITLE_TAG_PATTERN.search(text)
+        if title and html.unescape(title.group(1)).strip().split(" - ")[-1].lower() == "sciencedirect":
+            publisher = "elsevier"
+
+    return publisher, complete
+
+
+def sniff_html_doi(text: str, publisher: str):
+    """
+    Find the DOI from the raw html string. Follows the decisions of `search_html_doi_publisher`.
+    """
+    doi_url = None
+    if publisher == "acs":
+        doi_url = next(iter_html_elements(text, "div", has_class("article_header-doiurl")), None)
+    elif publisher == "wiley":
+        doi_url = next(iter_html_elements(text, "a", has_class("epub-doi")), None)
+    elif publisher == "springer":
+        for span in iter_html_elements(
+            text, "span", lambda x: "bibliographic-information__value" in x.get("class", "")
+        ):
+            if "doi.org" in get_markup_text(span):
+                doi_url = span
+    elif publisher == "rsc":
+        doi_sec = next(iter_html_elements(text, "div", has_class("article_info")), None)
+        doi_url = next(iter_html_elements(doi_sec, "a"), None) if doi_sec is not None else None
+    elif publisher == "elsevier":
+        doi_url = next(iter_html_elements(text, "a", has_class("doi")), None)
+    elif publisher == "nature":
+        doi_url = next(iter_html_elements(text, "a", lambda x: x.get("data-track-action") == "view doi"), None)
+    elif publisher == "aip":
+        doi_url = next(iter_html_elements(text, "div", has_class("publicationContentCitation")), None)
+    elif publisher == "aaas":
+        doi_sec = next(iter_html_elements(text, "div", has_class("self-citation")), None)
+        doi_link = next(iter_html_elements(doi_sec, "a"), None) if doi_sec is not None else None
+        doi_url = get_markup_text(doi_link).strip().split()[-1] if doi_link else None
+
+    if doi_url is None:
+        return None
+    return strip_doi_url(get_markup_text(doi_url).strip().lower())
+
+
+def sniff_html_meta_doi(text: str):
+    """
+    Fallback DOI from the `citation_doi` or `dc.identifier` meta tags
+    """
+    for meta_tag in META_TAG_PATTERN.finditer(text):
+        meta = get_tag_attrs(meta_tag.group())
+        name = meta.get("name", "").lower()
+        if name == "citation_doi" or (name == "dc.identifier" and meta.get("scheme", "doi").lower() == "doi"):
+            doi = meta.get("content", "").strip().lower()
+            doi = doi[4:].strip() if doi.startswith("doi:") else doi
+            if doi:
+                return strip_doi_url(doi)
+    return None
+
+
+def strip_doi_url(doi_url: str):
+    try:
+        return doi_url[doi_url.index(DOI_URL_PREFIX) + len(DOI_URL_PREFIX) :].strip()
+    except ValueError:
+        return doi_url
+
+
+def sniff_xml_publisher(text: str, root_tag: str, root_attrs: dict[str, str]):
+    """
+    Detect the publisher from the raw xml string. Follows the decisions of `check_xml_publisher`.
+
+    Returns
+    -------
+    publisher name or None, whether the decision is final
+    """
+    prefix, _, local_name = root_tag.rpartition(":")
+    namespace = root_attrs.get(f"xmlns:{prefix}" if prefix else "xmlns")
+    tag = f"{{{namespace}}}{local_name}" if namespace else local_name
+    if "elsevier" in tag:
+        return "elsevier", True
+
+    publisher_name = XML_PUBLISHER_NAME_PATTERN.search(text)
+    if publisher_name:
+        if format_text(html.unescape(publisher_name.group(1))) == "American Chemical Society":
+            return "acs", True
+        return None, True
+    return None, False
+
+
+def sniff_xml_doi(text: str, publisher: str, root_attrs: dict[str, str]):
+    """
+    Find the DOI from the raw xml string. Follows the decisions of `search_xml_doi_publisher`.
+    """
+    doi = None
+    if publisher == "elsevier":
+        for attr, value in root_attrs.items():
+            if value != ELSEVIER_XOCS_NAMESPACE or not attr.startswith("xmlns"):
+                continue
+            tag = f"{attr[6:]}:doi" if attr.startswith("xmlns:") else "doi"
+            doi = re.search(rf"<{re.escape(tag)}\b[^>]*>([^<]*)<", text)
+            if doi:
+                break
+    elif publisher == "acs":
+        doi = XML_ARTICLE_ID_PATTERN.search(text)
+    return html.unescape(doi.group(1)).strip().lower() if doi else None
+
+
+def sniff_text(text: str, complete: bool = True):
+    """
+    Sniff the file type, publisher and DOI from (the first part of) an article
+
+    Parameters
+    ----------
+    text: decoded article content
+    complete: whether `text` contains the entire article
+
+    Returns
+    -------
+    ArticleSniff, whether no more content is needed
+    """
+    sniff = ArticleSniff()
+
+    root = None
+    for match in ROOT_TAG_PATTERN.finditer(text):
+        if match.group(1) and match.group(1).lower().startswith("doctype html"):
+            sniff.file_type = "html"
+            break
+        if match.group(2):
+            root = match
+            break
+    if sniff.file_type is None:
+        if root is None:
+            return sniff, complete
+        sniff.file_type = "html" if root.group(2).lower() == "html" else "xml"
+
+    if sniff.file_type == "html":
+        head_end = HEAD_END_PATTERN.search(text)
+        head = text[: head_end.start()] if head_end else text
+        sniff.publisher, decided = sniff_html_publisher(head, complete=complete or head_end is not None)
+        if not decided:
+            return sniff, complete
+        sniff.doi = sniff_html_doi(text, sniff.publisher)
+        if sniff.doi is None and (complete or sniff.publisher not in SUPPORTED_HTML_PUBLISHERS):
+            sniff.doi = sniff_html_meta_doi(head)
+    else:
+        root_attrs = get_tag_attrs(root.group(3))
+        sniff.publisher, decided = sniff_xml_publisher(text, root.group(2), root_attrs)
+        if not decided:
+            return sniff, complete
+        sniff.doi = sniff_xml_doi(text, sniff.publisher, root_attrs)
+
+    done = complete or sniff.doi is not None or sniff.publisher is None
+    if sniff.file_type == "html" and sniff.publisher not in SUPPORTED_HTML_PUBLISHERS:
+        done = True
+    return sniff, done
+
+
+def sniff_article(
+    path_or_bytes: str | os.PathLike | bytes, max_bytes: int = None, chunk_size: int = DEFAULT_SNIFF_CHUNK_SIZE
+) -> ArticleSniff:
+    """
+    Detect the file type, publisher and DOI of an article from its raw bytes without building a DOM tree.
+    The article is read in growing chunks until the publisher and DOI are found.
+
+    Parameters
+    ----------
+    path_or_bytes: path to the HTML/XML file or its content as bytes
+    max_bytes: stop reading after this many bytes. `None` reads the entire file if necessary
+    chunk_size: size of the first chunk to read; following chunks double in size
+
+    Returns
+    -------
+    ArticleSniff
+    """
+    if isinstance(path_or_bytes, (bytes, bytearray, memoryview)):
+        stream = io.BytesIO(path_or_bytes)
+    else:
+        stream = open(os.path.normpath(path_or_bytes), "rb")
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    text = ""
+    n_read = 0
+    with stream:
+        while True:
+            size = chunk_size if max_bytes is None else min(chunk_size, max_bytes - n_read)
+            chunk = stream.read(size) if size > 0 else b""
+            n_read += len(chunk)
+            complete = len(chunk) < size or (max_bytes is not None and n_read >= max_bytes)
+            text += decoder.decode(chunk, final=complete)
+
+            sniff, done = sniff_text(text, complete=complete)
+            if done or complete:
+                return sniff
+            chunk_size *= 2
@@ -0,0 +1,195 @@
+"""
+# Author: Yinghao Li
+# Modified: June 15th, 2024
+# ---------------------------------------
+# Description: lxml backend of the XML article constructors with precompiled XPath expressions
+"""
+
+from lxml import etree
+
+from seqlbtoolkit.text import format_text
+
+from .section_extr import (
+    xml_section_extract_acs,
+    xml_section_extract_elsevier,
+    xml_table_extract_elsevier,
+    xml_figure_extract,
+    combine_section_ids,
+)
+from chempp.article import Article, ArticleElement, ArticleElementType, ArticleComponentCheck
+
+__all__ = ["parse_xml_lxml", "LxmlArticleFunctions"]
+
+NAMESPACES = {
+    "svapi": "http://www.elsevier.com/xml/svapi/article/dtd",
+    "xocs": "http://www.elsevier.com/xml/xocs/dtd",
+    "ce": "http://www.elsevier.com/xml/common/dtd",
+}
+CE_NS = "{http://www.elsevier.com/xml/common/dtd}"
+
+# comments and processing instructions are dropped so that the tree matches the one built by `ElementTree`
+XML_PARSER = etree.XMLParser(remove_comments=True, remove_pis=True)
+
+ELSEVIER_DOC = etree.XPath("svapi:originalText[1]/xocs:doc[1]", namespaces=NAMESPACES)
+ELSEVIER_DOI = etree.XPath("(//xocs:doi)[1]", namespaces=NAMESPACES)
+# all components of an Elsevier document are collected in a single walk, in document order
+ELSEVIER_COMPONENTS = etree.XPath(
+    "descendant::ce:title | descendant::ce:abstract | descendant::ce:table "
+    "| descendant::ce:figure | descendant::ce:sections",
+    namespaces=NAMESPACES,
+)
+ELSEVIER_SIMPLE_PARAS = etree.XPath("descendant::ce:simple-para", namespaces=NAMESPACES)
+
+ACS_PUBLISHER_NAME = etree.XPath("(//publisher-name)[1]")
+ACS_DOI = etree.XPath("(//article-id)[1]")
+ACS_FRONT = etree.XPath("front[1]")
+ACS_BODY = etree.XPath("body[1]")
+ACS_TITLES = etree.XPath("descendant::article-title")
+ACS_ABSTRACTS = etree.XPath("descendant::abstract[not(@*)]")
+
+
+def get_stripped_text(element):
+    return "".join([txt for txt in element.itertext() if txt.strip()])
+
+
+class LxmlArticleFunctions:
+    """
+    `lxml` counterparts of `ArticleFunctions.article_construct_xml_*`. The constructed articles are identical.
+    """
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def article_construct_xml_elsevier(root: etree._Element, doi: str):
+        article = Article()
+        article_component_check = ArticleComponentCheck()
+        article.doi = doi
+        article.publisher = "elsevier"
+
+        doc = ELSEVIER_DOC(root)[0]
+
+        title_element = None
+        abs_element = None
+        sections_element = None
+        table_elements = list()
+        figure_elements = list()
+        for element in ELSEVIER_COMPONENTS(doc):
+            tag = element.tag
+            if tag == f"{CE_NS}title":
+                title_element = element
+            elif tag == f"{CE_NS}abstract":
+                if element.get("class") == "author":
+                    abs_element = element
+            elif tag == f"{CE_NS}table":
+                table_elements.append(element)
+            elif tag == f"{CE_NS}figure":
+                figure_elements.append(element)
+            else:
+                sections_element = element
+
+        # get title
+        if title_element is None:
+            raise ValueError("Title not found!")
+        article.title = get_stripped_text(title_element).strip()
+
+        # get abstract
+        abs_paras = list()
+        if abs_element is not None:
+            for abs_ele in ELSEVIER_SIMPLE_PARAS(abs_element):
+                abs_paras.append(get_stripped_text(abs_ele))
+        else:
+            article_component_check.abstract = False
+        article.abstract = abs_paras
+
+        # get tables and figures
+        try:
+            section_list = []
+            for table_element in table_elements:
+                tbl = xml_table_extract_elsevier(table_element)
+                section_list.append(ArticleElement(type=ArticleElementType.TABLE, content=tbl))
+            for figure_element in figure_elements:
+                fig = xml_figure_extract(figure_element)
+                if not fig.caption:
+                    continue
+                section_list.append(ArticleElement(type=ArticleElementType.FIGURE, content=fig))
+        except Exception:
+            section_list = []
+
+        # get article content
+        try:
+            section_list += xml_section_extract_elsevier(section_root=sections_element)
+        except Exception:
+            article_component_check.sections = False
+
+        article.sections = combine_section_ids(section_list)
+
+        return article, article_component_check
+
+    @staticmethod
+    def article_construct_xml_acs(root: etree._Element, doi: str):
+        article = Article()
+        article_component_check = ArticleComponentCheck()
+        article.doi = doi
+        article.publisher = "acs"
+
+        front = ACS_FRONT(root)[0]
+
+        title_text = list()
+        for element in ACS_TITLES(front):
+            title_text.append(element.text)
+        title = format_text("".join(title_text))
+        article.title = title
+
+        abs_text = list()
+        for element in ACS_ABSTRACTS(front):
+            for txt in element.itertext():
+                abs_text.append(txt)
+        abstract = format_text("".join(abs_text))
+        if not abstract:
+            article_component_check.abstract = False
+        article.abstract = abstract
+
+        # get article content
+        body = ACS_BODY(root)[0]
+        section_list = xml_section_extract_acs(body)
+        if not section_list:
+            article_component_check.sections = False
+
+        article.sections = combine_section_ids(section_list)
+
+        return article, article_component_check
+
+
+def search_xml_doi_publisher_lxml(root: etree._Element):
+    """
+    `lxml` counterpart of `check_xml_publisher` and `search_xml_doi_publisher`
+    """
+    if "elsevier" in root.tag:
+        return ELSEVIER_DOI(root)[0].text.strip().lower(), "elsevier"
+
+    publisher_names = ACS_PUBLISHER_NAME(root)
+    if publisher_names and format_text(publisher_names[0].text) == "American Chemical Society":
+        return ACS_DOI(root)[0].text.strip().lower(), "acs"
+
+    raise ValueError("Publisher not found!")
+
+
+def parse_xml_lxml(file_path: str):
+    """
+    Parse xml files with `lxml`
+
+    Parameters
+    ----------
+    file_path: File name
+
+    Returns
+    -------
+    article: Article, component check: ArticleComponentCheck
+    """
+    root = etree.parse(file_path, XML_PARSER).getroot()
+
+    doi, publisher = search_xml_doi_publisher_lxml(root)
+
+    article_construct_func = getattr(LxmlArticleFunctions, f"article_construct_xml_{publisher}")
+    return article_construct_func(root=root, doi=doi)
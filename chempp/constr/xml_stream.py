@@ -0,0 +1,187 @@
+"""
+# Author: Yinghao Li
+# Modified: June 15th, 2024
+# ---------------------------------------
+# Description: Construct articles from streamed XML parsing events with bounded memory
+"""
+
+try:
+    import xml.etree.cElementTree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+from .section_extr import (
+    get_xml_text_iter,
+    xml_table_extract_elsevier,
+    xml_figure_extract,
+    combine_section_ids,
+)
+from chempp.article import Article, ArticleElement, ArticleElementType, ArticleComponentCheck
+
+__all__ = ["ElsevierXmlStream"]
+
+SVAPI_NS = "{http://www.elsevier.com/xml/svapi/article/dtd}"
+XOCS_NS = "{http://www.elsevier.com/xml/xocs/dtd}"
+CE_NS = "{http://www.elsevier.com/xml/common/dtd}"
+
+# states of the elements within `ce:sections`, following `xml_section_extract_elsevier`
+SEC_RECURSE = "recurse"  # section containers whose children are visited
+SEC_EMIT = "emit"  # labels, section titles and paragraphs that become article elements
+SEC_INSIDE = "inside"  # descendants of emitted elements
+
+
+class ElsevierXmlStream:
+    """
+    Construct an Elsevier article from `ET.iterparse` start/end events.
+
+    Title, abstract, section elements, tables and figures are extracted when their end events arrive.
+    Elements are cleared and detached from their parents as soon as no open element needs them,
+    so the memory is bounded by the largest element that has to be kept as a whole (e.g., a paragraph or table)
+    instead of the whole document.
+    The result is identical to `ArticleFunctions.article_construct_xml_elsevier`.
+    """
+
+    def __init__(self, root: ET.Element):
+        self._stack = [root]
+        self._in_doc = [False]
+        self._sec_states = [None]
+        self._kept = [False]
+        self._n_kept = 0
+        self._original_text = None
+        self._doc_found = False
+
+        self.doi = None
+        self.title = None
+        self.abs_paras = None
+        self.tables = list()
+        self.figures = list()
+        self.floats_failed = False
+        self.section_elements = None
+        self.sections_failed = False
+
+    def consume(self, events) -> tuple[Article, ArticleComponentCheck]:
+        """
+        Consume the remaining `iterparse` events (after the root start event) and construct the article
+        """
+        for event, element in events:
+            if event == "start":
+                self.start(element)
+            else:
+                self.end(element)
+        return self.construct()
+
+    def start(self, element: ET.Element):
+        tag = element.tag
+        depth = len(self._stack)
+
+        # the first `xocs:doc` in the first `originalText`, as in `article_construct_xml_elsevier`
+        if depth == 1 and tag == f"{SVAPI_NS}originalText" and self._original_text is None:
+            self._original_text = element
+        if depth == 2 and tag == f"{XOCS_NS}doc" and not self._doc_found and self._stack[-1] is self._original_text:
+            in_doc = self._doc_found = True
+        else:
+            in_doc = self._in_doc[-1]
+
+        parent_state = self._sec_states[-1]
+        sec_state = None
+        if in_doc and tag == f"{CE_NS}sections":
+            # only the last `ce:sections` element is used
+            self.section_elements = list()
+            self.sections_failed = False
+            sec_state = SEC_RECURSE
+        elif parent_state == SEC_RECURSE:
+            if "label" in tag or "section-title" in tag or "para" in tag:
+                sec_state = SEC_EMIT
+            elif "section" in tag:
+                sec_state = SEC_RECURSE
+        elif parent_state in (SEC_EMIT, SEC_INSIDE):
+            sec_state = SEC_INSIDE
+
+        kept = tag == f"{XOCS_NS}doi" or sec_state == SEC_EMIT
+        kept = kept or (in_doc and tag in (f"{CE_NS}title", f"{CE_NS}abstract", f"{CE_NS}table", f"{CE_NS}figure"))
+
+        self._stack.append(element)
+        self._in_doc.append(in_doc)
+        self._sec_states.append(sec_state)
+        self._kept.append(kept)
+        self._n_kept += kept
+
+    def end(self, element: ET.Element):
+        self._stack.pop()
+        in_doc = self._in_doc.pop()
+        sec_state = self._sec_states.pop()
+        kept = self._kept.pop()
+        tag = element.tag
+
+        if tag == f"{XOCS_NS}doi" and self.doi is None:
+            self.doi = element.text.strip().lower()
+        if sec_state == SEC_EMIT and not self.sections_failed:
+            self.emit_section_element(element)
+        elif in_doc and tag == f"{CE_NS}title":
+            self.title = "".join([txt for txt in element.itertext() if txt.strip()]).strip()
+        elif in_doc and tag == f"{CE_NS}abstract" and element.attrib.get("class") == "author":
+            self.abs_paras = list()
+            for abs_ele in element.iter(tag=f"{CE_NS}simple-para"):
+                self.abs_paras.append("".join([txt for txt in abs_ele.itertext() if txt.strip()]))
+        elif in_doc and tag == f"{CE_NS}table" and not self.floats_failed:
+            try:
+                self.tables.append(xml_table_extract_elsevier(element))
+            except Exception:
+                self.floats_failed = True
+        elif in_doc and tag == f"{CE_NS}figure" and not self.floats_failed:
+            try:
+                fig = xml_figure_extract(element)
+                if fig.caption:
+                    self.figures.append(fig)
+            except Exception:
+                self.floats_failed = True
+
+        self._n_kept -= kept
+        if self._n_kept == 0 and self._stack:
+            # no open element needs the finished subtree anymore
+            element.clear()
+            parent = self._stack[-1]
+            if len(parent) and parent[-1] is element:
+                del parent[-1]
+
+    def emit_section_element(self, element: ET.Element):
+        tag = element.tag
+        try:
+            if "label" in tag:
+                element_type = ArticleElementType.SECTION_ID
+            elif "section-title" in tag:
+                element_type = ArticleElementType.SECTION_TITLE
+            else:
+                element_type = ArticleElementType.PARAGRAPH
+            self.section_elements.append(ArticleElement(type=element_type, content=get_xml_text_iter(element)))
+        except Exception:
+            self.sections_failed = True
+
+    def construct(self) -> tuple[Article, ArticleComponentCheck]:
+        if self.doi is None:
+            raise ValueError("DOI not found!")
+        if self.title is None:
+            raise ValueError("Title not found!")
+
+        article = Article()
+        article_component_check = ArticleComponentCheck()
+        article.doi = self.doi
+        article.publisher = "elsevier"
+        article.title = self.title
+
+        if self.abs_paras is None:
+            article_component_check.abstract = False
+        article.abstract = self.abs_paras if self.abs_paras is not None else list()
+
+        section_list = list()
+        if not self.floats_failed:
+            section_list += [ArticleElement(type=ArticleElementType.TABLE, content=tbl) for tbl in self.tables]
+            section_list += [ArticleElement(type=ArticleElementType.FIGURE, content=fig) for fig in self.figures]
+
+        if self.section_elements is None or self.sections_failed:
+            article_component_check.sections = False
+        else:
+            section_list += self.section_elements
+
+        article.sections = combine_section_ids(section_list)
+        return article, article_component_check
@@ -5,10 +5,11 @@ from .macro import (
     SUPPORTED_XML_PUBLISHERS,
     DEFAULT_HTML_STYLE,
 )
-from .utils import get_file_paths, map_doi_to_filename, map_filename_to_doi, StrEnum
+from .utils import get_file_paths, map_doi_to_filename, map_filename_to_doi, StrEnum, SlotPickleMixin
 
 __all__ = [
     "StrEnum",
+    "SlotPickleMixin",
     "CHAR_TO_HTML_LBS",
     "HTML_LBS_TO_CHAR",
     "get_file_paths",
@@ -7,7 +7,7 @@ from seqlbtoolkit.text import substring_mapping
 
 from .macro import CHAR_TO_HTML_LBS, HTML_LBS_TO_CHAR
 
-__all__ = ["get_file_paths", "map_doi_to_filename", "map_filename_to_doi", "StrEnum"]
+__all__ = ["get_file_paths", "map_doi_to_filename", "map_filename_to_doi", "StrEnum", "SlotPickleMixin"]
 
 
 def get_file_paths(input_dir: str):
@@ -45,3 +45,25 @@ class StrEnum(str, Enum):
                 except AttributeError:
                     pass
         return opts
+
+
+class SlotPickleMixin:
+    """
+    Pickle the attributes of classes with `__slots__` as a dict,
+    so that objects pickled before their classes have `__slots__` (with `__dict__` states) can still be loaded.
+    """
+
+    __slots__ = ()
+
+    def __getstate__(self):
+        state = dict()
+        for cls in type(self).__mro__:
+            slots = cls.__dict__.get("__slots__", ())
+            for name in [slots] if isinstance(slots, str) else slots:
+                if not name.startswith("__") and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
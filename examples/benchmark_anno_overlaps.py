@@ -0,0 +1,94 @@
+import sys
+import time
+import random
+import logging
+import os.path as osp
+from transformers import HfArgumentParser
+from typing import Optional
+from dataclasses import dataclass, field
+
+from seqlbtoolkit.io import set_logging, logging_args
+
+from chempp.article import Paragraph
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BenchmarkArgs:
+    n_spans: Optional[int] = field(default=10000, metadata={"help": "Number of annotation spans per paragraph."})
+    max_span_len: Optional[int] = field(default=200, metadata={"help": "Maximum length of the annotation spans."})
+    n_labels: Optional[int] = field(default=5, metadata={"help": "Number of entity labels."})
+    n_repeats: Optional[int] = field(default=3, metadata={"help": "Number of random paragraphs."})
+    seed: Optional[int] = field(default=42, metadata={"help": "Random seed."})
+    log_path: Optional[str] = field(
+        default=None, metadata={"help": "the directory of the log file. Logs are only printed if not set."}
+    )
+
+
+def remove_anno_overlaps_sets(anno: dict[tuple[int, int], str]) -> dict[tuple[int, int], str]:
+    """
+    The previous set-based implementation of `remove_anno_overlaps` for a single annotation source
+    """
+    sorted_dict = dict(sorted(anno.items()))
+    lb_span_dict = dict()
+    for span, lb in sorted_dict.items():
+
+        span_set = set(range(span[0], span[1]))
+        if lb not in lb_span_dict:
+            lb_span_dict[lb] = [span_set]
+        elif lb_span_dict[lb][-1] & span_set:
+            if span_set - lb_span_dict[lb][-1]:
+                lb_span_dict[lb][-1] = lb_span_dict[lb][-1] | span_set
+        else:
+            lb_span_dict[lb].append(span_set)
+
+    tmp_dict = dict()
+    for lb, span_sets in lb_span_dict.items():
+        for span_set in span_sets:
+            tmp_dict[min(span_set), max(span_set) + 1] = lb
+
+    return dict(sorted(tmp_dict.items()))
+
+
+def benchmark_anno_overlaps(args: BenchmarkArgs):
+    random.seed(args.seed)
+    labels = [f"LABEL{i}" for i in range(args.n_labels)]
+    text_len = args.n_spans * 10
+
+    for i in range(args.n_repeats):
+        anno = dict()
+        while len(anno) < args.n_spans:
+            s = random.randrange(text_len)
+            anno[(s, s + random.randint(1, args.max_span_len))] = random.choice(labels)
+
+        start = time.perf_counter()
+        expected = remove_anno_overlaps_sets(anno)
+        set_time = time.perf_counter() - start
+
+        # the paragraph is not split into sentences as `remove_anno_overlaps` only uses paragraph annotations
+        para = Paragraph(text="x" * (text_len + args.max_span_len), anno=dict(anno))
+        start = time.perf_counter()
+        para.remove_anno_overlaps()
+        sweep_time = time.perf_counter() - start
+
+        identical = list(para.base_anno.items()) == list(expected.items())
+        logger.info(
+            f"paragraph {i}: {len(anno)} spans -> {len(expected)} spans, "
+            f"set-based {set_time:.4f}s, sort-and-sweep {sweep_time:.4f}s, "
+            f"speedup {set_time / sweep_time:.1f}x, identical output: {identical}"
+        )
+        assert identical, "The sort-and-sweep result differs from the set-based result!"
+
+
+if __name__ == "__main__":
+    parser = HfArgumentParser(BenchmarkArgs)
+    if len(sys.argv) == 2 and sys.argv[1].endswith(".json"):
+        (arguments,) = parser.parse_json_file(json_file=osp.abspath(sys.argv[1]))
+    else:
+        (arguments,) = parser.parse_args_into_dataclasses()
+
+    set_logging(arguments.log_path, level="INFO")
+    logging_args(arguments)
+
+    benchmark_anno_overlaps(args=arguments)
@@ -0,0 +1,73 @@
+import os
+import sys
+import timeit
+import logging
+import tempfile
+import os.path as osp
+from transformers import HfArgumentParser
+from typing import Optional
+from dataclasses import dataclass, field
+
+from seqlbtoolkit.io import set_logging, logging_args
+
+from chempp import parse_many
+from chempp.article import Article
+from chempp.utils import get_file_paths
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BenchmarkArgs:
+    input_dir: str = field(metadata={"help": "The path or dir to the HTML/XML article files."})
+    n_repeats: Optional[int] = field(default=5, metadata={"help": "Number of timed loads per file and format."})
+    log_path: Optional[str] = field(
+        default=None, metadata={"help": "the directory of the log file. Logs are only printed if not set."}
+    )
+
+
+def benchmark_binary(args: BenchmarkArgs):
+    if osp.isfile(args.input_dir):
+        file_list = [args.input_dir]
+    else:
+        file_list = [f for f in get_file_paths(args.input_dir) if f.lower().endswith(("html", "xml"))]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pt_path = osp.join(tmp_dir, "article.pt")
+        bin_path = osp.join(tmp_dir, "article.bin")
+
+        for file_path, article, _, _ in parse_many(file_list, workers=1):
+            if isinstance(article, Exception):
+                logger.warning(f"Failed to parse {file_path}. Error: {article}")
+                continue
+            # store the tokens, as annotation jobs do
+            article.tokenize()
+            article.save_pt(pt_path)
+            article.save_binary(bin_path)
+
+            pt_size = os.path.getsize(pt_path)
+            bin_size = os.path.getsize(bin_path)
+            pt_time = min(timeit.repeat(lambda: Article().load_pt(pt_path), number=1, repeat=args.n_repeats))
+            bin_time = min(timeit.repeat(lambda: Article().load_binary(bin_path), number=1, repeat=args.n_repeats))
+            title_time = min(
+                timeit.repeat(lambda: Article().load_binary(bin_path, parts=["title"]), number=1, repeat=args.n_repeats)
+            )
+
+            logger.info(
+                f"{osp.basename(file_path)}: pickle {pt_size} B in {pt_time * 1e3:.1f}ms, "
+                f"binary {bin_size} B in {bin_time * 1e3:.1f}ms ({pt_size / bin_size:.1f}x smaller, "
+                f"{pt_time / bin_time:.1f}x faster), title only in {title_time * 1e3:.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = HfArgumentParser(BenchmarkArgs)
+    if len(sys.argv) == 2 and sys.argv[1].endswith(".json"):
+        (arguments,) = parser.parse_json_file(json_file=osp.abspath(sys.argv[1]))
+    else:
+        (arguments,) = parser.parse_args_into_dataclasses()
+
+    set_logging(arguments.log_path, level="INFO")
+    logging_args(arguments)
+
+    benchmark_binary(args=arguments)
@@ -0,0 +1,73 @@
+import sys
+import time
+import logging
+import os.path as osp
+from transformers import HfArgumentParser
+from typing import Optional
+from dataclasses import dataclass, field
+
+from seqlbtoolkit.io import set_logging, logging_args
+
+from chempp import parse_html
+from chempp.constr.html_clean import preclean_html
+from chempp.constr.sniffer import sniff_html_publisher
+from chempp.utils import get_file_paths
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BenchmarkArgs:
+    input_dir: str = field(metadata={"help": "The path or dir to the HTML article files."})
+    n_repeats: Optional[int] = field(default=3, metadata={"help": "Number of times each file is parsed."})
+    log_path: Optional[str] = field(
+        default=None, metadata={"help": "the directory of the log file. Logs are only printed if not set."}
+    )
+
+
+def article_to_lists(article):
+    return [article.doi, article.title.text, str(article.abstract)] + [str(sec) for sec in article.sections]
+
+
+def benchmark_html_preclean(args: BenchmarkArgs):
+    if osp.isfile(args.input_dir):
+        file_list = [args.input_dir]
+    else:
+        file_list = [f for f in get_file_paths(args.input_dir) if f.lower().endswith("html")]
+
+    for file_path in file_list:
+        with open(file_path, "r", encoding="utf-8") as f:
+            contents = f.read()
+        publisher = sniff_html_publisher(contents)[0]
+        _, n_removed = preclean_html(contents, publisher)
+
+        timings = dict()
+        articles = dict()
+        for preclean in (False, True):
+            best = float("inf")
+            for _ in range(args.n_repeats):
+                start = time.perf_counter()
+                articles[preclean], _ = parse_html(html_content=contents, preclean=preclean)
+                best = min(best, time.perf_counter() - start)
+            timings[preclean] = best
+
+        identical = article_to_lists(articles[False]) == article_to_lists(articles[True])
+        logger.info(
+            f"{osp.basename(file_path)} [{publisher}]: removed {n_removed} / {len(contents)} characters "
+            f"({n_removed / max(len(contents), 1):.1%}), "
+            f"parse {timings[False]:.4f}s -> {timings[True]:.4f}s, saved {timings[False] - timings[True]:.4f}s, "
+            f"identical output: {identical}"
+        )
+
+
+if __name__ == "__main__":
+    parser = HfArgumentParser(BenchmarkArgs)
+    if len(sys.argv) == 2 and sys.argv[1].endswith(".json"):
+        (arguments,) = parser.parse_json_file(json_file=osp.abspath(sys.argv[1]))
+    else:
+        (arguments,) = parser.parse_args_into_dataclasses()
+
+    set_logging(arguments.log_path, level="INFO")
+    logging_args(arguments)
+
+    benchmark_html_preclean(args=arguments)
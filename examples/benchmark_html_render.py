@@ -0,0 +1,183 @@
+import re
+import itertools
+import sys
+import timeit
+import logging
+import tempfile
+import os.path as osp
+from transformers import HfArgumentParser
+from typing import Optional
+from dataclasses import dataclass, field
+from bs4 import BeautifulSoup, Tag
+
+from seqlbtoolkit.io import set_logging, logging_args
+from seqlbtoolkit.data import sort_tuples_by_element_idx
+
+from chempp import parse_many
+from chempp.article import Article, ArticleElementType, save_html_report
+from chempp.utils import DEFAULT_HTML_STYLE, get_file_paths
+
+logger = logging.getLogger(__name__)
+
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+QUANTITY_PATTERN = re.compile(r"\d+(?:\.\d+)?\s*[A-Za-z]+")
+
+
+@dataclass
+class BenchmarkArgs:
+    input_dir: str = field(metadata={"help": "The path or dir to the HTML/XML article files."})
+    n_repeats: Optional[int] = field(default=5, metadata={"help": "Number of timed renders per file and renderer."})
+    page_size: Optional[int] = field(default=20, metadata={"help": "Number of articles per page of the report."})
+    log_path: Optional[str] = field(
+        default=None, metadata={"help": "the directory of the log file. Logs are only printed if not set."}
+    )
+
+
+def html_mark_spans(
+    text: str,
+    spans: list[tuple[int, int]],
+    ori_text: str = None,
+    mark_class: str = "",
+    mark_id: str = "",
+):
+    """
+    The previous span marker, which re-aligns the spans to the partly marked text for every tag
+
+    Parameters
+    ----------
+    text: input text string
+    spans: input spans
+    ori_text: original text where the span is based
+    mark_class: the class of mark tag
+    mark_id: the id of the mark tag
+
+    Returns
+    -------
+    Marked text
+    """
+    if ori_text:
+        import textspan
+
+        spans = [(s[0][0], s[-1][-1]) for s in textspan.align_spans(spans, ori_text, text)]
+    spans = sort_tuples_by_element_idx(spans)
+
+    merged_spans = list(itertools.chain(*spans))
+    merged_spans = [0] + merged_spans + [len(text)]
+    splitted_str = [text[x:y] for x, y in zip(merged_spans, merged_spans[1:])]
+    i = 1
+    ids = list()
+    while i < len(splitted_str):
+        id_str = f"{mark_id}-{i}"
+        splitted_str[i] = f"<mark class={mark_class.lower()} id={id_str}>{splitted_str[i]}</mark>"
+        i += 2
+        ids.append(id_str)
+    return "".join(splitted_str), ids
+
+
+def save_html_bs4(article: Article, save_path: str, tags_to_highlight: list = None):
+    """
+    The previous implementation of `Article.save_html`, which builds a BeautifulSoup tree and prettifies it.
+    The abstract and the result list are left out.
+    """
+    soup = BeautifulSoup()
+    head = soup.new_tag("head")
+    soup.insert(0, head)
+    title = soup.new_tag("title")
+    head.insert(0, title)
+    title.insert(0, article.title.text)
+    style = soup.new_tag("style")
+    head.insert(len(head), style)
+    style.insert(0, DEFAULT_HTML_STYLE)
+    head.insert(
+        len(head),
+        Tag(builder=soup.builder, name="meta", attrs={"name": "viewport", "content": "width=device-width"}),
+    )
+
+    body = soup.new_tag("body")
+    soup.insert(len(soup), body)
+    sec_div = soup.new_tag("div", id="sections")
+    body.insert(len(body), sec_div)
+    inst_idx = 0
+    for section in article.sections:
+        if section.type == ArticleElementType.SECTION_TITLE:
+            section_title = soup.new_tag("h2")
+            sec_div.insert(len(sec_div), section_title)
+            section_title.insert(0, section.content)
+        elif section.type in [ArticleElementType.PARAGRAPH, ArticleElementType.FIGURE]:
+            paragraph = soup.new_tag("p")
+            sec_div.insert(len(sec_div), paragraph)
+            txt = section.content.text
+            for tag in tags_to_highlight or []:
+                spans = list(section.content.get_anno_by_value(tag).keys())
+                if spans:
+                    txt, _ = html_mark_spans(txt, spans, section.content.text, tag, f"$@${inst_idx}")
+                    inst_idx += 1
+            paragraph.insert(len(paragraph), txt)
+        elif section.type == ArticleElementType.TABLE:
+            section.content.write_html(sec_div)
+
+    soup_str = soup.prettify().replace("&lt;", "<").replace("&gt;", ">")
+    with open(save_path, "w", encoding="utf-8") as outfile:
+        outfile.write(soup_str)
+
+
+def benchmark_html_render(args: BenchmarkArgs):
+    if osp.isfile(args.input_dir):
+        file_list = [args.input_dir]
+    else:
+        file_list = [f for f in get_file_paths(args.input_dir) if f.lower().endswith(("html", "xml"))]
+
+    articles = list()
+    bs4_total = str_total = 0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        html_path = osp.join(tmp_dir, "article.html")
+
+        for file_path, article, _, _ in parse_many(file_list, workers=1):
+            if isinstance(article, Exception):
+                logger.warning(f"Failed to parse {file_path}. Error: {article}")
+                continue
+            # annotate numbers and the quantities overlapping them so that both renderers mark nested spans
+            for para in article.paragraphs:
+                spans = {m.span(): "QUANTITY" for m in QUANTITY_PATTERN.finditer(para.text)}
+                spans.update({m.span(): "NUMBER" for m in NUMBER_PATTERN.finditer(para.text)})
+                if spans:
+                    para.anno = spans
+            articles.append(article)
+            tags = ["NUMBER", "QUANTITY"]
+
+            bs4_time = min(
+                timeit.repeat(lambda: save_html_bs4(article, html_path, tags), number=1, repeat=args.n_repeats)
+            )
+            str_time = min(
+                timeit.repeat(
+                    lambda: article.save_html(html_path, tags_to_highlight=tags), number=1, repeat=args.n_repeats
+                )
+            )
+            bs4_total += bs4_time
+            str_total += str_time
+            logger.info(
+                f"{osp.basename(file_path)}: BeautifulSoup {bs4_time * 1e3:.1f}ms, "
+                f"string builder {str_time * 1e3:.1f}ms ({bs4_time / str_time:.1f}x faster)"
+            )
+
+        if not articles:
+            return
+        logger.info(f"Total: BeautifulSoup {bs4_total:.3f}s, string builder {str_total:.3f}s")
+
+        report_time = timeit.timeit(
+            lambda: save_html_report(articles, osp.join(tmp_dir, "report"), page_size=args.page_size), number=1
+        )
+        logger.info(f"Rendered {len(articles)} articles into a paginated report in {report_time:.3f}s")
+
+
+if __name__ == "__main__":
+    parser = HfArgumentParser(BenchmarkArgs)
+    if len(sys.argv) == 2 and sys.argv[1].endswith(".json"):
+        (arguments,) = parser.parse_json_file(json_file=osp.abspath(sys.argv[1]))
+    else:
+        (arguments,) = parser.parse_args_into_dataclasses()
+
+    set_logging(arguments.log_path, level="INFO")
+    logging_args(arguments)
+
+    benchmark_html_render(args=arguments)
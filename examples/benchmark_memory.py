@@ -0,0 +1,74 @@
+import gc
+import sys
+import logging
+import tracemalloc
+import os.path as osp
+from transformers import HfArgumentParser
+from typing import Optional
+from dataclasses import dataclass, field
+
+from seqlbtoolkit.io import set_logging, logging_args
+
+from chempp import parse_many
+from chempp.article import tokenize_articles
+from chempp.utils import get_file_paths
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BenchmarkArgs:
+    input_dir: str = field(metadata={"help": "The path or dir to the HTML/XML article files."})
+    n_copies: Optional[int] = field(default=10, metadata={"help": "Number of times each file is parsed and kept."})
+    tokenizer: Optional[str] = field(default="nltk", metadata={"help": "The registered tokenizer backend."})
+    text_buffer: Optional[bool] = field(
+        default=False, metadata={"help": "Whether to keep the text of each article in a single buffer."}
+    )
+    log_path: Optional[str] = field(
+        default=None, metadata={"help": "the directory of the log file. Logs are only printed if not set."}
+    )
+
+
+def benchmark_memory(args: BenchmarkArgs):
+    if osp.isfile(args.input_dir):
+        file_list = [args.input_dir]
+    else:
+        file_list = [f for f in get_file_paths(args.input_dir) if f.lower().endswith(("html", "xml"))]
+
+    tracemalloc.start()
+    gc.collect()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    # keep all parsed and tokenized articles in memory, as in annotation jobs
+    articles = list()
+    for file_path, article, _, _ in parse_many(file_list * args.n_copies, workers=1):
+        if isinstance(article, Exception):
+            logger.warning(f"Failed to parse {file_path}. Error: {article}")
+            continue
+        articles.append(article)
+    n_sents = tokenize_articles(articles, tokenizer=args.tokenizer)
+    if args.text_buffer:
+        for article in articles:
+            article.build_text_buffer()
+
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    logger.info(
+        f"{len(articles)} articles, {n_sents} sentences: {retained / 2**20:.2f} MiB retained, "
+        f"{retained / max(n_sents, 1):.1f} bytes per sentence"
+    )
+
+
+if __name__ == "__main__":
+    parser = HfArgumentParser(BenchmarkArgs)
+    if len(sys.argv) == 2 and sys.argv[1].endswith(".json"):
+        (arguments,) = parser.parse_json_file(json_file=osp.abspath(sys.argv[1]))
+    else:
+        (arguments,) = parser.parse_args_into_dataclasses()
+
+    set_logging(arguments.log_path, level="INFO")
+    logging_args(arguments)
+
+    benchmark_memory(args=arguments)
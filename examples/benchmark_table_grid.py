@@ -0,0 +1,115 @@
+import sys
+import copy
+import time
+import random
+import logging
+import os.path as osp
+from transformers import HfArgumentParser
+from typing import Optional
+from dataclasses import dataclass, field
+
+from seqlbtoolkit.io import set_logging, logging_args
+
+from chempp.article import Table, TableCell, TableRow
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BenchmarkArgs:
+    n_rows: Optional[int] = field(default=5000, metadata={"help": "Number of table rows."})
+    n_columns: Optional[int] = field(default=20, metadata={"help": "Number of table columns."})
+    span_prob: Optional[float] = field(default=0.1, metadata={"help": "Probability of a cell spanning more cells."})
+    max_span: Optional[int] = field(default=4, metadata={"help": "Maximum number of rows or columns of a cell."})
+    seed: Optional[int] = field(default=42, metadata={"help": "Random seed."})
+    log_path: Optional[str] = field(
+        default=None, metadata={"help": "the directory of the log file. Logs are only printed if not set."}
+    )
+
+
+def expand_cells_deepcopy(cells: list[TableCell]) -> list[TableCell]:
+    """
+    The previous implementation of `TableRow.expanded_cells`, which deep-copies multi-column cells
+    """
+    expanded_cells = list()
+    for cell in cells:
+        expanded_cells.append(cell)
+        for _ in range(cell.width - 1):
+            cached_cell = copy.deepcopy(cell)
+            cached_cell.width = 1
+            cached_cell.linked_left = True
+            expanded_cells.append(cached_cell)
+    return expanded_cells
+
+
+def body_to_lists_elementwise(table: Table) -> list[list[str]]:
+    """
+    The previous implementation of `Table.body_to_lists`, which expands every row and walks it element by element.
+    Positions missing from ragged rows are filled with empty strings instead of raising `IndexError`.
+    """
+    expanded_rows = [expand_cells_deepcopy(row.cells) for row in table.rows]
+    return [
+        [expanded_rows[i][j].text if j < len(expanded_rows[i]) else "" for j in range(table.width)]
+        for i in range(table.height)
+    ]
+
+
+def random_table(args: BenchmarkArgs) -> Table:
+    """
+    Create a table with random multi-row and multi-column cells, the way the table extractors do
+    """
+    covered = [[False] * args.n_columns for _ in range(args.n_rows)]
+    rows = list()
+    for i in range(args.n_rows):
+        cells = list()
+        j = 0
+        while j < args.n_columns:
+            if covered[i][j]:
+                j += 1
+                continue
+            width, height = 1, 1
+            if random.random() < args.span_prob:
+                width = random.randint(1, min(args.max_span, args.n_columns - j))
+                while width > 1 and any(covered[i][j : j + width]):
+                    width -= 1
+                height = random.randint(1, min(args.max_span, args.n_rows - i))
+            for r in range(i, i + height):
+                covered[r][j : j + width] = [True] * width
+            cells.append(TableCell(f"cell {i}-{j}", width, height))
+            j += width
+        rows.append(TableRow(cells))
+    return Table(rows=rows).format_rows()
+
+
+def benchmark_table_grid(args: BenchmarkArgs):
+    random.seed(args.seed)
+    table = random_table(args)
+
+    start = time.perf_counter()
+    expected = body_to_lists_elementwise(table)
+    elementwise_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    body = table.to_lists()
+    grid_time = time.perf_counter() - start
+
+    identical = body == expected
+    logger.info(
+        f"{table.height}x{table.width} table with {int(table.grid.origins.sum())} cells: "
+        f"element-wise {elementwise_time:.4f}s, grid {grid_time:.4f}s, "
+        f"speedup {elementwise_time / grid_time:.1f}x, identical output: {identical}"
+    )
+    assert identical, "The grid result differs from the element-wise result!"
+
+
+if __name__ == "__main__":
+    parser = HfArgumentParser(BenchmarkArgs)
+    if len(sys.argv) == 2 and sys.argv[1].endswith(".json"):
+        (arguments,) = parser.parse_json_file(json_file=osp.abspath(sys.argv[1]))
+    else:
+        (arguments,) = parser.parse_args_into_dataclasses()
+
+    set_logging(arguments.log_path, level="INFO")
+    logging_args(arguments)
+
+    benchmark_table_grid(args=arguments)
@@ -0,0 +1,65 @@
+import sys
+import time
+import pickle
+import logging
+import os.path as osp
+from transformers import HfArgumentParser
+from typing import Optional
+from dataclasses import dataclass, field
+
+from seqlbtoolkit.io import set_logging, logging_args
+
+from chempp import parse_many
+from chempp.article import tokenize_articles
+from chempp.utils import get_file_paths
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BenchmarkArgs:
+    input_dir: str = field(metadata={"help": "The path or dir to the HTML/XML article files."})
+    tokenizers: Optional[str] = field(
+        default="nltk,regex", metadata={"help": "Comma-separated names of the registered tokenizer backends."}
+    )
+    log_path: Optional[str] = field(
+        default=None, metadata={"help": "the directory of the log file. Logs are only printed if not set."}
+    )
+
+
+def benchmark_tokenizers(args: BenchmarkArgs):
+    if osp.isfile(args.input_dir):
+        file_list = [args.input_dir]
+    else:
+        file_list = [f for f in get_file_paths(args.input_dir) if f.lower().endswith(("html", "xml"))]
+
+    articles = list()
+    for file_path, article, _, _ in parse_many(file_list, workers=1):
+        if isinstance(article, Exception):
+            logger.warning(f"Failed to parse {file_path}. Error: {article}")
+            continue
+        articles.append(article)
+    logger.info(f"{len(articles)} articles parsed")
+
+    # parsed articles are not tokenized yet; each backend tokenizes its own copy
+    serialized = pickle.dumps(articles)
+    for tokenizer in args.tokenizers.split(","):
+        batch_articles = pickle.loads(serialized)
+        start = time.perf_counter()
+        n_sents = tokenize_articles(batch_articles, tokenizer=tokenizer)
+        batch_time = time.perf_counter() - start
+
+        logger.info(f"[{tokenizer}] {n_sents} sentences in {batch_time:.4f}s: {n_sents / batch_time:.1f} sentences/s")
+
+
+if __name__ == "__main__":
+    parser = HfArgumentParser(BenchmarkArgs)
+    if len(sys.argv) == 2 and sys.argv[1].endswith(".json"):
+        (arguments,) = parser.parse_json_file(json_file=osp.abspath(sys.argv[1]))
+    else:
+        (arguments,) = parser.parse_args_into_dataclasses()
+
+    set_logging(arguments.log_path, level="INFO")
+    logging_args(arguments)
+
+    benchmark_tokenizers(args=arguments)
@@ -0,0 +1,65 @@
+import sys
+import time
+import logging
+import os.path as osp
+from transformers import HfArgumentParser
+from typing import Optional
+from dataclasses import dataclass, field
+
+from seqlbtoolkit.io import set_logging, logging_args
+
+from chempp import parse_xml
+from chempp.utils import get_file_paths
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BenchmarkArgs:
+    input_dir: str = field(metadata={"help": "The path or dir to the XML article files."})
+    n_repeats: Optional[int] = field(default=3, metadata={"help": "Number of times each file is parsed."})
+    log_path: Optional[str] = field(
+        default=None, metadata={"help": "the directory of the log file. Logs are only printed if not set."}
+    )
+
+
+def article_to_lists(article):
+    return [article.doi, article.title.text, str(article.abstract)] + [str(sec) for sec in article.sections]
+
+
+def benchmark_xml_backends(args: BenchmarkArgs):
+    if osp.isfile(args.input_dir):
+        file_list = [args.input_dir]
+    else:
+        file_list = [f for f in get_file_paths(args.input_dir) if f.lower().endswith("xml")]
+
+    for file_path in file_list:
+        timings = dict()
+        articles = dict()
+        for backend in ("etree", "lxml"):
+            best = float("inf")
+            for _ in range(args.n_repeats):
+                start = time.perf_counter()
+                articles[backend], _ = parse_xml(file_path, backend=backend)
+                best = min(best, time.perf_counter() - start)
+            timings[backend] = best
+
+        identical = article_to_lists(articles["etree"]) == article_to_lists(articles["lxml"])
+        logger.info(
+            f"{osp.basename(file_path)} [{articles['etree'].publisher}]: "
+            f"etree {timings['etree']:.4f}s, lxml {timings['lxml']:.4f}s, "
+            f"speedup {timings['etree'] / timings['lxml']:.2f}x, identical output: {identical}"
+        )
+
+
+if __name__ == "__main__":
+    parser = HfArgumentParser(BenchmarkArgs)
+    if len(sys.argv) == 2 and sys.argv[1].endswith(".json"):
+        (arguments,) = parser.parse_json_file(json_file=osp.abspath(sys.argv[1]))
+    else:
+        (arguments,) = parser.parse_args_into_dataclasses()
+
+    set_logging(arguments.log_path, level="INFO")
+    logging_args(arguments)
+
+    benchmark_xml_backends(args=arguments)
@@ -10,7 +10,9 @@ from pathlib import Path
 
 from seqlbtoolkit.io import set_logging, logging_args, progress_bar
 
-from chempp import parse_html, parse_xml
+from chempp import parse_many
+from chempp.constr import HtmlParseStats
+from chempp.article import ShardWriter, ArticleJsonlWriter, ArticleColumnarWriter
 from chempp.utils import get_file_paths, map_doi_to_filename
 
 logger = logging.getLogger(__name__)
@@ -24,7 +26,21 @@ class ArticleProcessingArgs:
         metadata={"help": "The output directory where the validation results and relevant information is saved."},
     )
     output_type: Optional[str] = field(
-        default="pt", metadata={"choices": ["pt", "html", "jsonl"], "help": "output type"}
+        default="pt",
+        metadata={
+            "choices": ["pt", "html", "jsonl", "shard", "corpus_jsonl", "columnar"],
+            "help": "output type. 'shard' appends the articles to shard files with a DOI index in `output_dir`; "
+            "'corpus_jsonl' writes the jsonl records of all articles to `corpus_file_name` in `output_dir`; "
+            "'columnar' writes the sentences, annotations and table cells of all articles to columnar files",
+        },
+    )
+    shard_size: Optional[int] = field(default=2**30, metadata={"help": "Maximum size of a shard file in bytes."})
+    corpus_file_name: Optional[str] = field(
+        default="corpus.jsonl",
+        metadata={"help": "The file name of 'corpus_jsonl' outputs. Compressed if it ends with .gz, .bz2 or .xz."},
+    )
+    columnar_format: Optional[str] = field(
+        default="parquet", metadata={"choices": ["parquet", "arrow"], "help": "The file format of 'columnar' outputs."}
     )
     log_path: Optional[str] = field(
         default=None, metadata={"help": "the directory of the log file. Set to 'none' to disable logging"}
@@ -32,6 +48,12 @@ class ArticleProcessingArgs:
     keep_input_file_name: Optional[bool] = field(
         default=False, metadata={"help": "Keep the original file name when saving the output file."}
     )
+    n_workers: Optional[int] = field(
+        default=None, metadata={"help": "Number of parsing processes. Use all CPUs by default; 1 disables the pool."}
+    )
+    chunksize: Optional[int] = field(
+        default=1, metadata={"help": "Number of articles sent to a parsing process at a time."}
+    )
 
 
 def process_articles(args: ArticleProcessingArgs):
@@ -45,25 +67,38 @@ def process_articles(args: ArticleProcessingArgs):
 
     logger.info("Processing articles")
 
+    # writers of the output types that collect all articles in a few large files
+    if args.output_type == "shard":
+        corpus_writer = ShardWriter(args.output_dir, shard_size=args.shard_size)
+    elif args.output_type == "corpus_jsonl":
+        os.makedirs(args.output_dir, exist_ok=True)
+        corpus_writer = ArticleJsonlWriter(osp.join(args.output_dir, args.corpus_file_name))
+    elif args.output_type == "columnar":
+        corpus_writer = ArticleColumnarWriter(args.output_dir, file_format=args.columnar_format)
+    else:
+        corpus_writer = None
+
+    # the statistics are returned with the timings, as the files may be parsed in worker processes
+    parse_stats = HtmlParseStats()
+    results = parse_many(file_list, workers=args.n_workers, chunksize=args.chunksize)
     with progress_bar as pbar:
-        for file_path in pbar.track(file_list):
+        for file_path, article, component_check, timings in pbar.track(results, total=len(file_list)):
 
-            file_path = osp.normpath(file_path)
-            logger.info(f"Processing {file_path}")
+            parse_stats.update(timings)
+            preclean_info = ""
+            if "preclean" in timings:
+                preclean_info = f" (removed {timings['preclean_chars']} characters in {timings['preclean']:.3f}s)"
+            logger.info(f"Processed {file_path} in {timings['parse']:.2f}s{preclean_info}")
 
-            try:
-                if file_path.lower().endswith("html"):
-                    article, component_check = parse_html(file_path)
-                elif file_path.lower().endswith("xml"):
-                    article, component_check = parse_xml(file_path)
-                else:
-                    logger.error(f"Unsupported file type!")
-                    continue
-            except Exception as e:
-                logger.error(f"Failed to parse file. Error: {e}")
+            if isinstance(article, Exception):
+                logger.error(f"Failed to parse file. Error: {article}")
                 continue
 
             try:
+                if corpus_writer is not None:
+                    corpus_writer.write(article)
+                    continue
+
                 # save article to disk with specified file type
                 out_name = Path(file_path).stem if args.keep_input_file_name else map_doi_to_filename(article.doi)
                 save_path = osp.join(args.output_dir, f"{out_name}.{args.output_type}")
@@ -76,6 +111,11 @@ def process_articles(args: ArticleProcessingArgs):
                 logger.exception(f"Failed to save the parsed file. Error: {e}")
                 continue
 
+    if corpus_writer is not None:
+        corpus_writer.close()
+        logger.info(f"{corpus_writer.n_written} articles written to {args.output_dir}")
+
+    logger.info(f"HTML parsing statistics: {parse_stats}")
     logger.info("Program finished.")
 
 
@@ -0,0 +1,104 @@
+import os
+import os.path as osp
+import sys
+import json
+import logging
+from collections import Counter
+from datetime import datetime
+from transformers import HfArgumentParser
+from typing import Optional
+from dataclasses import dataclass, field, asdict
+
+from seqlbtoolkit.io import set_logging, logging_args, progress_bar
+
+from chempp import sniff_article
+from chempp.utils import get_file_paths
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ArticleSniffingArgs:
+    input_dir: str = field(metadata={"help": "The path or dir to the HTML/XML article file."})
+    output_path: Optional[str] = field(
+        default="./output/triage.jsonl",
+        metadata={"help": "The jsonl file where the file type, publisher and DOI of each article are saved."},
+    )
+    max_bytes: Optional[int] = field(
+        default=None, metadata={"help": "Read at most this many bytes per article. Read the entire file by default."}
+    )
+    log_path: Optional[str] = field(
+        default=None, metadata={"help": "the directory of the log file. Set to 'none' to disable logging"}
+    )
+
+
+def sniff_articles(args: ArticleSniffingArgs):
+
+    if osp.isfile(args.input_dir) and not args.input_dir.endswith(".json"):
+        file_list = [args.input_dir]
+    else:
+        logger.info("Getting article paths")
+        file_list = get_file_paths(args.input_dir)
+        logger.info(f"{len(file_list)} articles to be sniffed")
+
+    os.makedirs(osp.dirname(osp.abspath(args.output_path)), exist_ok=True)
+
+    publisher_counter = Counter()
+    doi_counter = Counter()
+    n_unsupported = 0
+    n_missing_doi = 0
+
+    with open(args.output_path, "w", encoding="utf-8") as f, progress_bar as pbar:
+        for file_path in pbar.track(file_list):
+
+            file_path = osp.normpath(file_path)
+            try:
+                sniff = sniff_article(file_path, max_bytes=args.max_bytes)
+            except Exception as e:
+                logger.error(f"Failed to sniff {file_path}. Error: {e}")
+                continue
+
+            publisher_counter[(sniff.file_type, sniff.publisher)] += 1
+            if not sniff.supported:
+                n_unsupported += 1
+            if sniff.doi:
+                doi_counter[sniff.doi] += 1
+            else:
+                n_missing_doi += 1
+
+            record = {"path": file_path, **asdict(sniff), "supported": sniff.supported}
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    logger.info("Triage report:")
+    for (file_type, publisher), count in publisher_counter.most_common():
+        logger.info(f"  [{file_type}] {publisher}: {count}")
+    logger.info(f"  unsupported articles: {n_unsupported}")
+    logger.info(f"  articles without DOI: {n_missing_doi}")
+    logger.info(f"  duplicated DOIs: {sum(1 for v in doi_counter.values() if v > 1)}")
+    logger.info(f"Report saved to {args.output_path}")
+
+    logger.info("Program finished.")
+
+
+if __name__ == "__main__":
+    _time = datetime.now().strftime("%m.%d.%y-%H.%M")
+    _current_file_name = osp.basename(__file__)
+    if _current_file_name.endswith(".py"):
+        _current_file_name = _current_file_name[:-3]
+
+    # --- set up arguments ---
+    parser = HfArgumentParser(ArticleSniffingArgs)
+    if len(sys.argv) == 2 and sys.argv[1].endswith(".json"):
+        # If we pass only one argument to the script and it's the path to a json file,
+        # let's parse it to get our arguments.
+        (arguments,) = parser.parse_json_file(json_file=osp.abspath(sys.argv[1]))
+    else:
+        (arguments,) = parser.parse_args_into_dataclasses()
+
+    if arguments.log_path is None:
+        arguments.log_path = osp.join("logs", f"{_current_file_name}.{_time}.log")
+
+    set_logging(arguments.log_path, level="INFO")
+    logging_args(arguments)
+
+    sniff_articles(args=arguments)
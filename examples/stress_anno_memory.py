@@ -0,0 +1,67 @@
+import gc
+import sys
+import logging
+import tracemalloc
+import os.path as osp
+from transformers import HfArgumentParser
+from typing import Optional
+from dataclasses import dataclass, field
+
+from seqlbtoolkit.io import set_logging, logging_args
+
+from chempp.article import Sentence, Paragraph
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StressArgs:
+    n_sentences: Optional[int] = field(default=1000000, metadata={"help": "Number of annotated sentences to create."})
+    n_checkpoints: Optional[int] = field(default=10, metadata={"help": "Number of memory measurements."})
+    log_path: Optional[str] = field(
+        default=None, metadata={"help": "the directory of the log file. Logs are only printed if not set."}
+    )
+
+
+def stress_anno_memory(args: StressArgs):
+    """
+    Create, annotate and discard sentences and paragraphs while querying their annotations.
+    The traced memory should stay flat as no annotation index outlives its sentence or paragraph.
+    """
+    checkpoint = max(args.n_sentences // args.n_checkpoints, 1)
+
+    tracemalloc.start()
+    gc.collect()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    for i in range(args.n_sentences):
+        sent = Sentence(
+            f"Compound {i} was dissolved in THF.", anno={"dict": {(0, 8): "MAT"}, "model": {(26, 29): "MAT"}}
+        )
+        sent.get_anno_with_value("MAT")
+        sent.anno = {"model": {(0, 12): "MAT"}}
+        sent.get_anno_with_value("MAT")
+
+        if i % 10 == 0:
+            para = Paragraph(sentences=None, text=str(sent), anno={(0, 8): "MAT"})
+            para.get_anno_by_value("MAT")
+
+        if (i + 1) % checkpoint == 0:
+            gc.collect()
+            current = tracemalloc.get_traced_memory()[0] - baseline
+            logger.info(f"{i + 1} sentences: {current / 2**10:.1f} KiB traced")
+
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    parser = HfArgumentParser(StressArgs)
+    if len(sys.argv) == 2 and sys.argv[1].endswith(".json"):
+        (arguments,) = parser.parse_json_file(json_file=osp.abspath(sys.argv[1]))
+    else:
+        (arguments,) = parser.parse_args_into_dataclasses()
+
+    set_logging(arguments.log_path, level="INFO")
+    logging_args(arguments)
+
+    stress_anno_memory(args=arguments)